@@ -0,0 +1,30 @@
+"""Índices para paginación keyset de análisis
+
+Revision ID: 3f9c2b7d41a8
+Revises: 711bc2a586e3
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2b7d41a8'
+down_revision = '711bc2a586e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_news_analyses_created_at_id', 'news_analyses', ['created_at', 'id'], unique=False)
+    op.create_index('ix_news_analyses_label_created_at_id', 'news_analyses', ['label', 'created_at', 'id'], unique=False)
+    op.create_index('ix_news_analyses_source_type_created_at_id', 'news_analyses', ['source_type', 'created_at', 'id'], unique=False)
+    op.create_index('ix_news_analyses_model_version_created_at_id', 'news_analyses', ['model_version', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_news_analyses_model_version_created_at_id', table_name='news_analyses')
+    op.drop_index('ix_news_analyses_source_type_created_at_id', table_name='news_analyses')
+    op.drop_index('ix_news_analyses_label_created_at_id', table_name='news_analyses')
+    op.drop_index('ix_news_analyses_created_at_id', table_name='news_analyses')
@@ -0,0 +1,131 @@
+"""Contenido direccionado por hash y comprimido
+
+Mueve news_analyses.content a analysis_contents (clave SHA-256, zlib),
+deduplicando los textos repetidos.
+
+Revision ID: 8b1e6f0c52d4
+Revises: 3f9c2b7d41a8
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+import hashlib
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b1e6f0c52d4'
+down_revision = '3f9c2b7d41a8'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+news_analyses = sa.table(
+    'news_analyses',
+    sa.column('id', sa.Integer),
+    sa.column('content', sa.Text),
+    sa.column('content_hash', sa.String),
+)
+
+analysis_contents = sa.table(
+    'analysis_contents',
+    sa.column('content_hash', sa.String),
+    sa.column('compression', sa.String),
+    sa.column('data', sa.LargeBinary),
+    sa.column('original_length', sa.Integer),
+)
+
+
+def upgrade() -> None:
+    op.create_table('analysis_contents',
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('compression', sa.String(length=10), nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.Column('original_length', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('content_hash')
+    )
+    op.add_column('news_analyses', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+    # Backfill por lotes, deduplicando por hash
+    bind = op.get_bind()
+    seen = set()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(news_analyses.c.id, news_analyses.c.content)
+            .where(news_analyses.c.id > last_id)
+            .order_by(news_analyses.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        new_contents = []
+        updates = []
+        for row_id, content in rows:
+            content = content or ""
+            content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+            if content_hash not in seen:
+                seen.add(content_hash)
+                new_contents.append({
+                    'content_hash': content_hash,
+                    'compression': 'zlib',
+                    'data': zlib.compress(content.encode('utf-8'), 6),
+                    'original_length': len(content),
+                })
+            updates.append({'row_id': row_id, 'hash': content_hash})
+
+        if new_contents:
+            bind.execute(analysis_contents.insert(), new_contents)
+        bind.execute(
+            news_analyses.update()
+            .where(news_analyses.c.id == sa.bindparam('row_id'))
+            .values(content_hash=sa.bindparam('hash')),
+            updates
+        )
+        last_id = rows[-1][0]
+
+    op.alter_column('news_analyses', 'content_hash', nullable=False)
+    op.create_foreign_key(
+        'fk_news_analyses_content_hash', 'news_analyses', 'analysis_contents',
+        ['content_hash'], ['content_hash']
+    )
+    op.create_index(op.f('ix_news_analyses_content_hash'), 'news_analyses', ['content_hash'], unique=False)
+    op.drop_column('news_analyses', 'content')
+
+
+def downgrade() -> None:
+    op.add_column('news_analyses', sa.Column('content', sa.Text(), nullable=True))
+
+    bind = op.get_bind()
+    last_hash = ''
+    while True:
+        rows = bind.execute(
+            sa.select(analysis_contents.c.content_hash, analysis_contents.c.data)
+            .where(analysis_contents.c.content_hash > last_hash)
+            .order_by(analysis_contents.c.content_hash)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        bind.execute(
+            news_analyses.update()
+            .where(news_analyses.c.content_hash == sa.bindparam('hash'))
+            .values(content=sa.bindparam('text')),
+            [
+                {'hash': content_hash, 'text': zlib.decompress(data).decode('utf-8')}
+                for content_hash, data in rows
+            ]
+        )
+        last_hash = rows[-1][0]
+
+    op.alter_column('news_analyses', 'content', nullable=False)
+    op.drop_index(op.f('ix_news_analyses_content_hash'), table_name='news_analyses')
+    op.drop_constraint('fk_news_analyses_content_hash', 'news_analyses', type_='foreignkey')
+    op.drop_column('news_analyses', 'content_hash')
+    op.drop_table('analysis_contents')
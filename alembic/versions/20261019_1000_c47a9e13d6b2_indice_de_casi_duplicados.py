@@ -0,0 +1,48 @@
+"""Índice de casi duplicados (firmas MinHash y bandas LSH)
+
+Revision ID: c47a9e13d6b2
+Revises: 8b1e6f0c52d4
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47a9e13d6b2'
+down_revision = '8b1e6f0c52d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('news_analyses', sa.Column('near_duplicate_of', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_news_analyses_near_duplicate_of', 'news_analyses', 'news_analyses',
+        ['near_duplicate_of'], ['id']
+    )
+    op.create_table('content_signatures',
+    sa.Column('analysis_id', sa.Integer(), nullable=False),
+    sa.Column('signature', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['analysis_id'], ['news_analyses.id'], ),
+    sa.PrimaryKeyConstraint('analysis_id')
+    )
+    op.create_table('content_lsh_bands',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('analysis_id', sa.Integer(), nullable=False),
+    sa.Column('band_index', sa.Integer(), nullable=False),
+    sa.Column('band_hash', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['analysis_id'], ['news_analyses.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_content_lsh_bands_band', 'content_lsh_bands', ['band_index', 'band_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_content_lsh_bands_band', table_name='content_lsh_bands')
+    op.drop_table('content_lsh_bands')
+    op.drop_table('content_signatures')
+    op.drop_constraint('fk_news_analyses_near_duplicate_of', 'news_analyses', type_='foreignkey')
+    op.drop_column('news_analyses', 'near_duplicate_of')
@@ -0,0 +1,66 @@
+"""Búsqueda full-text sobre contenidos analizados
+
+Agrega analysis_contents.search_vector (tsvector spanish + english) con
+índice GIN y lo calcula para los contenidos existentes.
+
+Revision ID: e2d5a8c9f173
+Revises: c47a9e13d6b2
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2d5a8c9f173'
+down_revision = 'c47a9e13d6b2'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+analysis_contents = sa.table(
+    'analysis_contents',
+    sa.column('content_hash', sa.String),
+    sa.column('data', sa.LargeBinary),
+)
+
+
+def upgrade() -> None:
+    op.add_column('analysis_contents', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    bind = op.get_bind()
+    update = sa.text(
+        "UPDATE analysis_contents "
+        "SET search_vector = to_tsvector('spanish'::regconfig, :body) || to_tsvector('english'::regconfig, :body) "
+        "WHERE content_hash = :hash"
+    )
+    last_hash = ''
+    while True:
+        rows = bind.execute(
+            sa.select(analysis_contents.c.content_hash, analysis_contents.c.data)
+            .where(analysis_contents.c.content_hash > last_hash)
+            .order_by(analysis_contents.c.content_hash)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(update, [
+            {'hash': content_hash, 'body': zlib.decompress(data).decode('utf-8')}
+            for content_hash, data in rows
+        ])
+        last_hash = rows[-1][0]
+
+    op.create_index(
+        'ix_analysis_contents_search_vector', 'analysis_contents', ['search_vector'],
+        unique=False, postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_analysis_contents_search_vector', table_name='analysis_contents')
+    op.drop_column('analysis_contents', 'search_vector')
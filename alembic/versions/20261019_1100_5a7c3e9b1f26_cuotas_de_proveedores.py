@@ -0,0 +1,30 @@
+"""Uso diario de cuotas de las APIs de fact-checking
+
+Revision ID: 5a7c3e9b1f26
+Revises: e2d5a8c9f173
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a7c3e9b1f26'
+down_revision = 'e2d5a8c9f173'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('provider_quota_usage',
+    sa.Column('provider', sa.String(length=50), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('calls', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('provider', 'day')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('provider_quota_usage')
@@ -0,0 +1,35 @@
+"""Reputación de fuentes por dominio (caché de MBFC)
+
+Revision ID: 9d2f6b4a8c31
+Revises: 5a7c3e9b1f26
+Create Date: 2026-10-19 11:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d2f6b4a8c31'
+down_revision = '5a7c3e9b1f26'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('source_domains',
+    sa.Column('domain', sa.String(length=253), nullable=False),
+    sa.Column('found', sa.Boolean(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=True),
+    sa.Column('bias', sa.String(length=50), nullable=True),
+    sa.Column('credibility', sa.String(length=50), nullable=True),
+    sa.Column('factual_reporting', sa.String(length=50), nullable=True),
+    sa.Column('source_info', sa.Text(), nullable=True),
+    sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('domain')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('source_domains')
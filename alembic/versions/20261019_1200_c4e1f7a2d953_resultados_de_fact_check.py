@@ -0,0 +1,34 @@
+"""Resultados de APIs de fact-checking asociados a análisis
+
+Revision ID: c4e1f7a2d953
+Revises: 9d2f6b4a8c31
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e1f7a2d953'
+down_revision = '9d2f6b4a8c31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('fact_check_results',
+    sa.Column('analysis_id', sa.Integer(), nullable=False),
+    sa.Column('provider', sa.String(length=50), nullable=False),
+    sa.Column('success', sa.Boolean(), nullable=False),
+    sa.Column('result', sa.Text(), nullable=False),
+    sa.Column('latency_ms', sa.Integer(), nullable=True),
+    sa.Column('late', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['analysis_id'], ['news_analyses.id'], ),
+    sa.PrimaryKeyConstraint('analysis_id', 'provider')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('fact_check_results')
@@ -0,0 +1,29 @@
+"""Origen de los resultados de fact-checking reutilizados
+
+Revision ID: e8b3d6f0a417
+Revises: c4e1f7a2d953
+Create Date: 2026-10-19 12:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8b3d6f0a417'
+down_revision = 'c4e1f7a2d953'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('fact_check_results', sa.Column('reused_from', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_fact_check_results_reused_from', 'fact_check_results', 'news_analyses',
+        ['reused_from'], ['id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('fk_fact_check_results_reused_from', 'fact_check_results', type_='foreignkey')
+    op.drop_column('fact_check_results', 'reused_from')
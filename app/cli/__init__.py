@@ -0,0 +1,3 @@
+"""
+Comandos de línea de comandos: python -m app.cli <comando>
+"""
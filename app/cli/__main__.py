@@ -0,0 +1,24 @@
+"""
+Punto de entrada: python -m app.cli <comando> [opciones]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+
+from app.cli import domains, score
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Comandos de Fake News Detector API")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    domains.add_parser(subparsers)
+    score.add_parser(subparsers)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+    return asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+preload-domains: carga masiva de la reputación de dominios (tabla source_domains)
+
+    python -m app.cli preload-domains --file mbfc.csv          # calificaciones conocidas, sin API
+    python -m app.cli preload-domains --domains clarin.com bbc.co.uk
+    python -m app.cli preload-domains --from-analyses --limit 500
+
+--file acepta CSV con encabezado o JSON Lines, con la columna/clave 'domain'
+(o 'url') y opcionalmente name, bias, credibility y factual_reporting. Las
+filas solo con dominio, --domains y --from-analyses consultan la API de MBFC
+por los dominios que no están o vencieron (--force para todos).
+"""
+import argparse
+import csv
+import json
+from typing import Any, Dict, List
+
+from sqlalchemy import func, select
+
+from app.database import AsyncSessionLocal
+from app.models.news import NewsAnalysis
+from app.services.domain_reputation import domain_reputation
+from app.utils.domains import registrable_domain
+
+_RATING_FIELDS = ("name", "bias", "credibility", "factual_reporting")
+
+
+def add_parser(subparsers):
+    parser = subparsers.add_parser("preload-domains", help="Precargar la reputación de dominios (MBFC)")
+    parser.add_argument("--file", help="CSV o JSON Lines con calificaciones o dominios")
+    parser.add_argument("--domains", nargs="*", default=[], help="Dominios a consultar en la API")
+    parser.add_argument("--from-analyses", action="store_true", help="Dominios de las URLs ya analizadas")
+    parser.add_argument("--limit", type=int, default=1000, help="Máximo de dominios de --from-analyses")
+    parser.add_argument("--force", action="store_true", help="Consultar la API aunque la calificación siga vigente")
+    parser.set_defaults(handler=run)
+
+
+def _read_file(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as handle:
+        if path.endswith((".jsonl", ".json")):
+            return [json.loads(line) for line in handle if line.strip()]
+        return list(csv.DictReader(handle))
+
+
+async def run(args: argparse.Namespace) -> int:
+    ratings: List[Dict[str, Any]] = []
+    to_fetch: List[str] = list(args.domains)
+
+    if args.file:
+        for item in _read_file(args.file):
+            if any(item.get(field) for field in _RATING_FIELDS):
+                ratings.append(item)
+            else:
+                to_fetch.append(item.get("domain") or item.get("url") or "")
+
+    async with AsyncSessionLocal() as db:
+        if args.from_analyses:
+            result = await db.execute(
+                select(NewsAnalysis.source_url, func.count().label("uses"))
+                .where(NewsAnalysis.source_url.isnot(None))
+                .group_by(NewsAnalysis.source_url)
+                .order_by(func.count().desc())
+                .limit(args.limit * 5)
+            )
+            found = list(dict.fromkeys(filter(None, (registrable_domain(url) for url, _ in result.all()))))
+            to_fetch.extend(found[:args.limit])
+
+        imported = await domain_reputation.import_ratings(db, ratings) if ratings else 0
+        fetched = await domain_reputation.refresh_domains(
+            db, list(dict.fromkeys(filter(None, to_fetch))), force=args.force
+        )
+
+    failed = sorted(domain for domain, ok in fetched.items() if not ok)
+    print(f"Calificaciones importadas: {imported}")
+    print(f"Dominios consultados o vigentes: {len(fetched) - len(failed)} de {len(fetched)}")
+    if failed:
+        print(f"Sin calificación ({len(failed)}): {', '.join(failed[:20])}{' ...' if len(failed) > 20 else ''}")
+    return 0
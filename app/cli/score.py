@@ -0,0 +1,384 @@
+"""
+score: puntaje offline de un corpus, sin servidor web
+
+    python -m app.cli score --input corpus.jsonl --output scores.jsonl
+    python -m app.cli score --input corpus.csv --output scores/ --format parquet --mode ensemble
+    python -m app.cli score --input corpus.jsonl --output scores.jsonl --save-db --resume
+
+La entrada es JSONL o CSV (o un ZIP de ellos / de .txt) con el texto en
+'text', 'content' o 'body' y opcionalmente 'id' y 'url'. La sanitización y
+las características de TextAnalyzer corren en un pool de procesos; el modelo
+se consulta con un lote de textos por llamada (AIAnalyzer.infer_batch) y
+varios lotes en vuelo. La salida conserva el orden de la entrada: JSONL, o un
+directorio de partes Parquet (requiere pyarrow).
+
+Cada --checkpoint-every artículos la salida se sincroniza a disco y se
+guarda el avance en <output>.checkpoint.json; con --resume se retoma desde
+ahí. Con --save-db los análisis se cargan además en news_analyses de a un
+lote por transacción, sin repetir los ya cargados al retomar.
+"""
+import argparse
+import asyncio
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.services.ai_analyzer import ModelSwapError, ai_analyzer, label_for_score
+from app.services.bulk_ingestion import AnalyzedItem, bulk_ingestion
+from app.utils.bulk_readers import BulkItem, BulkReader, detect_format
+from app.utils.near_duplicate import min_hasher
+from app.utils.security import security_utils
+from app.utils.text_analyzer import TextFeatures, text_analyzer
+
+try:
+    import pyarrow
+    import pyarrow.parquet as parquet
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Columnas de la salida (mismo orden en JSONL y Parquet)
+_COLUMNS = (
+    ("ref", "string"), ("id", "string"), ("url", "string"), ("label", "string"),
+    ("score", "float64"), ("ai_score", "float64"), ("feature_score", "float64"),
+    ("confidence", "float64"), ("model_version", "string"), ("mode", "string"),
+    ("language", "string"), ("analysis_time_ms", "int64"), ("content_length", "int64"),
+    ("error", "string"),
+)
+_PROGRESS_INTERVAL = 5.0  # Segundos entre líneas de progreso
+
+
+def add_parser(subparsers):
+    parser = subparsers.add_parser("score", help="Puntuar un corpus JSONL/CSV sin el servidor web")
+    parser.add_argument("--input", required=True, help="JSONL, CSV o ZIP con los artículos")
+    parser.add_argument("--output", required=True, help="Archivo JSONL o directorio Parquet")
+    parser.add_argument("--format", choices=("jsonl", "parquet"), help="Por defecto según --output")
+    parser.add_argument("--mode", choices=("single", "cascade", "ensemble"), default=settings.AI_INFERENCE_MODE)
+    parser.add_argument("--model", help="Modelo para --mode single (por defecto HF_MODEL_NAME)")
+    parser.add_argument("--models", help="Modelos separados por coma para cascade/ensemble")
+    # --model/--models fijan los modelos: desactivan el ruteo por idioma
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Procesos para TextAnalyzer")
+    parser.add_argument("--batch-size", type=int, default=32, help="Textos por llamada al modelo")
+    parser.add_argument("--concurrency", type=int, default=4, help="Lotes en vuelo a la vez")
+    parser.add_argument("--limit", type=int, help="Procesar como mucho N artículos")
+    parser.add_argument("--save-db", action="store_true", help="Cargar también los análisis en news_analyses")
+    parser.add_argument("--checkpoint", help="Archivo de avance (por defecto <output>.checkpoint.json)")
+    parser.add_argument("--checkpoint-every", type=int, default=1000, help="Artículos entre checkpoints")
+    parser.add_argument("--resume", action="store_true", help="Retomar desde el checkpoint")
+    parser.set_defaults(handler=run)
+
+
+def _prepare(texts: List[str], with_signatures: bool) -> List[Tuple[Optional[str], Optional[TextFeatures], Optional[Tuple[int, ...]], Optional[str]]]:
+    """Sanitiza, valida y extrae características de un lote (corre en el pool de procesos)"""
+    prepared = []
+    for text in texts:
+        content = security_utils.sanitize_text(text)
+        if not security_utils.validate_content_length(content):
+            prepared.append((None, None, None, f"Texto muy largo. Máximo {settings.MAX_CONTENT_LENGTH} caracteres."))
+        elif len(content.strip()) < 10:
+            prepared.append((None, None, None, "Contenido insuficiente para análisis"))
+        else:
+            signature = min_hasher.signature(content) if with_signatures else None
+            prepared.append((content, text_analyzer.analyze(content), signature, None))
+    return prepared
+
+
+def _row(item: BulkItem, error: Optional[str] = None, **values: Any) -> Dict[str, Any]:
+    row = {name: None for name, _ in _COLUMNS}
+    row.update(ref=item.ref, id=item.id, url=item.url, error=error, **values)
+    return row
+
+
+class _JsonlOutput:
+    """Salida JSONL; el checkpoint guarda el offset sincronizado a disco"""
+
+    def __init__(self, path: str, state: Optional[Dict[str, Any]]):
+        self.path = path
+        self._file = open(path, "r+b" if state else "wb")
+        if state:
+            # Lo escrito después del último checkpoint se vuelve a generar
+            self._file.truncate(state["offset"])
+            self._file.seek(state["offset"])
+
+    def write(self, rows: List[Dict[str, Any]]):
+        self._file.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows).encode("utf-8"))
+
+    def commit(self) -> Dict[str, Any]:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return {"offset": self._file.tell()}
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetOutput:
+    """Directorio de partes Parquet; cada checkpoint escribe una parte"""
+
+    def __init__(self, path: str, state: Optional[Dict[str, Any]]):
+        self.path = path
+        self.parts = state["parts"] if state else 0
+        self.schema = pyarrow.schema([(name, getattr(pyarrow, kind)()) for name, kind in _COLUMNS])
+        self._rows: List[Dict[str, Any]] = []
+        os.makedirs(path, exist_ok=True)
+        # Partes de una corrida anterior (o posteriores al checkpoint)
+        for part in glob.glob(os.path.join(path, "part-*.parquet")):
+            if int(os.path.basename(part)[5:10]) >= self.parts:
+                os.unlink(part)
+
+    def write(self, rows: List[Dict[str, Any]]):
+        self._rows.extend(rows)
+
+    def commit(self) -> Dict[str, Any]:
+        if self._rows:
+            table = pyarrow.Table.from_pylist(self._rows, schema=self.schema)
+            parquet.write_table(table, os.path.join(self.path, f"part-{self.parts:05d}.parquet"))
+            self.parts += 1
+            self._rows = []
+        return {"parts": self.parts}
+
+    def close(self):
+        pass
+
+
+class _Checkpoint:
+    def __init__(self, path: str, input_path: str):
+        self.path = path
+        self.input = os.path.abspath(input_path)
+        self.input_size = os.path.getsize(input_path)
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, encoding="utf-8") as handle:
+            state = json.load(handle)
+        if state.get("input") != self.input or state.get("input_size") != self.input_size:
+            raise ValueError(f"El checkpoint {self.path} corresponde a otro archivo de entrada")
+        return state
+
+    def save(self, state: Dict[str, Any]):
+        state = {
+            **state, "input": self.input, "input_size": self.input_size,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(state, handle)
+        os.replace(temporary, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class _Scorer:
+    """Lotes en vuelo: características en el pool de procesos e inferencia por lote"""
+
+    def __init__(self, executor: ProcessPoolExecutor, with_signatures: bool):
+        self.executor = executor
+        self.with_signatures = with_signatures
+        self.prepare_seconds = 0.0
+        self.inference_seconds = 0.0
+        self.inference_calls = 0
+
+    async def score(self, items: List[BulkItem]) -> Tuple[List[Dict[str, Any]], List[Tuple[int, AnalyzedItem]]]:
+        """Filas de salida del lote (en orden) y los análisis puntuados con su posición en el lote"""
+        rows: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        valid = []
+        for index, item in enumerate(items):
+            if item.error:
+                rows[index] = _row(item, item.error)
+            else:
+                valid.append(index)
+
+        start = time.perf_counter()
+        prepared = await asyncio.get_running_loop().run_in_executor(
+            self.executor, _prepare, [items[i].text for i in valid], self.with_signatures
+        ) if valid else []
+        self.prepare_seconds += time.perf_counter() - start
+
+        ready = []
+        for index, (content, features, signature, error) in zip(valid, prepared):
+            if error:
+                rows[index] = _row(items[index], error)
+            else:
+                ready.append((index, content, features, signature))
+
+        analyzed = []
+        if ready:
+            start = time.perf_counter()
+            inferences = await ai_analyzer.infer_batch([content for _, content, _, _ in ready])
+            self.inference_seconds += time.perf_counter() - start
+            self.inference_calls += 1
+            for (index, content, features, signature), inference in zip(ready, inferences):
+                combined_score, _ = text_analyzer.get_recommendation(features, inference.score)
+                rows[index] = _row(
+                    items[index],
+                    label=label_for_score(combined_score).value,
+                    score=round(combined_score, 6),
+                    ai_score=round(inference.score, 6),
+                    feature_score=round(features.feature_score, 6),
+                    confidence=round(inference.confidence, 6),
+                    model_version=inference.model_version,
+                    mode=inference.mode,
+                    language=inference.language,
+                    analysis_time_ms=inference.analysis_time_ms,
+                    content_length=len(content),
+                )
+                analyzed.append((index, AnalyzedItem(
+                    item=items[index],
+                    content=content,
+                    combined_score=combined_score,
+                    confidence=inference.confidence,
+                    model_version=inference.model_version,
+                    analysis_time_ms=inference.analysis_time_ms,
+                    signature=signature,
+                )))
+        return rows, analyzed
+
+
+def _batches(items: Iterator[BulkItem], size: int) -> Iterator[List[BulkItem]]:
+    while True:
+        batch = list(islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+
+async def _configure_backend(args: argparse.Namespace):
+    ai_analyzer.mode = args.mode
+    if args.model or args.models:
+        ai_analyzer.language_routing = False
+    if args.models:
+        models = [model.strip() for model in args.models.split(",") if model.strip()]
+        if args.mode == "cascade":
+            ai_analyzer.cascade_models = models
+        elif args.mode == "ensemble":
+            ai_analyzer.ensemble_models = models
+    if args.model and args.model != ai_analyzer.model_name:
+        await ai_analyzer.swap_model(args.model)
+
+
+async def run(args: argparse.Namespace) -> int:
+    input_format = detect_format(args.input)
+    if input_format is None:
+        print(f"Formato de entrada no soportado: {args.input} (usar .jsonl, .csv o .zip)", file=sys.stderr)
+        return 1
+    output_format = args.format or ("parquet" if args.output.endswith((".parquet", "/")) or os.path.isdir(args.output) else "jsonl")
+    if output_format == "parquet" and not PYARROW_AVAILABLE:
+        print("La salida Parquet requiere pyarrow (pip install pyarrow)", file=sys.stderr)
+        return 1
+
+    checkpoint = _Checkpoint(args.checkpoint or f"{args.output.rstrip('/')}.checkpoint.json", args.input)
+    try:
+        state = checkpoint.load() if args.resume else None
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    if state is None:
+        checkpoint.remove()
+        state = {"processed": 0, "saved": 0, "scored": 0, "failed": 0, "output": None}
+    elif state["processed"]:
+        print(f"Retomando desde el artículo {state['processed']}", file=sys.stderr)
+
+    try:
+        await _configure_backend(args)
+    except ModelSwapError as e:
+        print(f"No se pudo usar el modelo {args.model}: {e}", file=sys.stderr)
+        return 1
+
+    output = (_ParquetOutput if output_format == "parquet" else _JsonlOutput)(args.output, state["output"])
+    reader = BulkReader(args.input, input_format, settings.MAX_CONTENT_LENGTH)
+    items: Iterator[BulkItem] = iter(reader)
+    # Lo ya escrito en la corrida anterior se vuelve a leer pero no se puntúa
+    for _ in islice(items, state["processed"]):
+        pass
+    if args.limit is not None:
+        items = islice(items, max(0, args.limit - state["processed"]))
+
+    executor = ProcessPoolExecutor(
+        max_workers=max(1, args.workers),
+        mp_context=multiprocessing.get_context(settings.WORKER_POOL_START_METHOD),
+    )
+    scorer = _Scorer(executor, args.save_db and settings.NEAR_DUPLICATE_ENABLED)
+    in_flight: Deque[Tuple[int, asyncio.Task]] = deque()
+    processed, saved = state["processed"], state["saved"]
+    scored, failed = state["scored"], state["failed"]
+    uncommitted = 0
+    started = time.perf_counter()
+    last_report = started
+    session_processed = 0
+    next_index = processed
+    batches = _batches(items, max(1, args.batch_size))
+
+    try:
+        while True:
+            batch = next(batches, None)
+            if batch is not None:
+                in_flight.append((next_index, asyncio.create_task(scorer.score(batch))))
+                next_index += len(batch)
+            if not in_flight:
+                break
+            if batch is not None and len(in_flight) < max(1, args.concurrency):
+                continue
+
+            first_index, task = in_flight.popleft()
+            rows, analyzed = await task
+            output.write(rows)
+            processed += len(rows)
+            session_processed += len(rows)
+            uncommitted += len(rows)
+            scored += len(analyzed)
+            failed += len(rows) - len(analyzed)
+
+            if args.save_db:
+                # Al retomar no se cargan de nuevo los ya guardados
+                pending = [result for offset, result in analyzed if first_index + offset >= saved]
+                if pending:
+                    async with AsyncSessionLocal() as db:
+                        await bulk_ingestion.save(db, os.path.basename(args.input), pending)
+                saved = max(saved, processed)
+                checkpoint.save({**state, "saved": saved})
+
+            if uncommitted >= args.checkpoint_every:
+                state = {"processed": processed, "saved": saved, "scored": scored, "failed": failed, "output": output.commit()}
+                checkpoint.save(state)
+                uncommitted = 0
+
+            now = time.perf_counter()
+            if now - last_report >= _PROGRESS_INTERVAL:
+                print(
+                    f"  {processed} artículos · {session_processed / (now - started):.1f}/s · fallidos {failed}",
+                    file=sys.stderr
+                )
+                last_report = now
+
+        state = {"processed": processed, "saved": saved, "scored": scored, "failed": failed, "output": output.commit()}
+        checkpoint.save(state)
+    finally:
+        for _, task in in_flight:
+            task.cancel()
+        output.close()
+        executor.shutdown(cancel_futures=True)
+        await ai_analyzer.cleanup()
+
+    elapsed = time.perf_counter() - started
+    print(f"Artículos procesados: {processed} (esta corrida: {session_processed})")
+    print(f"Puntuados: {scored} · fallidos: {failed}" + (f" · cargados en la BD: {saved}" if args.save_db else ""))
+    print(f"Tiempo: {elapsed:.1f}s · {session_processed / elapsed if elapsed else 0:.1f} artículos/s")
+    print(
+        f"Etapas: características {scorer.prepare_seconds:.1f}s, inferencia {scorer.inference_seconds:.1f}s "
+        f"en {scorer.inference_calls} lotes (acumulado de lotes en paralelo)"
+    )
+    print(f"Salida: {args.output} ({output_format}) · checkpoint: {checkpoint.path}")
+    return 0
@@ -13,6 +13,7 @@ class Settings:
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
     SECRET_KEY: str = os.getenv("SECRET_KEY", "fake-news-secret-key-change-in-production")
     MAX_FILE_SIZE_MB: int = int(os.getenv("MAX_FILE_SIZE_MB", "10"))
+    UPLOAD_CHUNK_SIZE_KB: int = int(os.getenv("UPLOAD_CHUNK_SIZE_KB", "64"))  # Lectura de uploads por bloques
     
     # Configuración de CORS más permisiva para producción
     _cors_origins = os.getenv("CORS_ORIGINS", "*")
@@ -36,12 +37,93 @@ class Settings:
     HF_FALLBACK_MODEL: str = "jy46604790/Fake-News-Bert-Detect"  # Modelo de respaldo
     HF_API_TOKEN: str = os.getenv("HF_API_TOKEN", "")  # Token opcional (rate limits más altos)
     
+    # Cambio de modelo en caliente (POST /models/change)
+    MODEL_SWAP_WARMUP_TIMEOUT: float = float(os.getenv("MODEL_SWAP_WARMUP_TIMEOUT", "60"))  # Espera máxima a que el modelo nuevo responda
+    MODEL_SWAP_WARMUP_RETRY_DELAY: float = float(os.getenv("MODEL_SWAP_WARMUP_RETRY_DELAY", "2"))
+    MODEL_SWAP_DRAIN_TIMEOUT: float = float(os.getenv("MODEL_SWAP_DRAIN_TIMEOUT", "30"))  # Espera máxima a las inferencias en curso
+
+    # Modelos fríos en HF (503 "loading")
+    AI_REQUEST_DEADLINE: float = float(os.getenv("AI_REQUEST_DEADLINE", "20"))  # Espera máxima de una inferencia por un modelo que está cargando
+    HF_KEEP_WARM_INTERVAL: float = float(os.getenv("HF_KEEP_WARM_INTERVAL", "300"))  # Ping a los modelos en uso (0 = desactivado)
+    HF_LOADING_MIN_WAIT: float = float(os.getenv("HF_LOADING_MIN_WAIT", "1"))  # Espera mínima entre probes a un modelo cargando
+    HF_LOADING_DEFAULT_WAIT: float = float(os.getenv("HF_LOADING_DEFAULT_WAIT", "10"))  # Si el 503 no trae estimated_time
+    MODEL_METRICS_FLUSH_INTERVAL: int = int(os.getenv("MODEL_METRICS_FLUSH_INTERVAL", "60"))  # Segundos entre volcados a model_registry
+    
+    # Modo de inferencia: 'single' (solo HF_MODEL_NAME), 'cascade' o 'ensemble'
+    AI_INFERENCE_MODE: str = os.getenv("AI_INFERENCE_MODE", "single")
+    # Cascada: del modelo más barato al más pesado, separados por coma
+    AI_CASCADE_MODELS: list = [
+        model.strip() for model in os.getenv(
+            "AI_CASCADE_MODELS",
+            "mrm8488/bert-mini-finetuned-fake-news-detection,"
+            "hamzab/roberta-fake-news-classification,"
+            "elozano/bert-base-cased-fake-news"
+        ).split(",") if model.strip()
+    ]
+    # Se escala al siguiente modelo si el score cae dentro de esta banda
+    AI_CASCADE_BAND_LOW: float = float(os.getenv("AI_CASCADE_BAND_LOW", "0.25"))
+    AI_CASCADE_BAND_HIGH: float = float(os.getenv("AI_CASCADE_BAND_HIGH", "0.75"))
+    # Ensemble: modelos consultados en paralelo (vacío = los de la cascada)
+    AI_ENSEMBLE_MODELS: list = [
+        model.strip() for model in os.getenv("AI_ENSEMBLE_MODELS", "").split(",") if model.strip()
+    ]
+    
+    # Ruteo por idioma: cada texto va al modelo adecuado para su idioma.
+    # Vacío = el modelo actual si soporta el idioma, si no el primero registrado
+    LANGUAGE_ROUTING_ENABLED: bool = os.getenv("LANGUAGE_ROUTING_ENABLED", "true").lower() == "true"
+    LANGUAGE_MIN_CONFIDENCE: float = float(os.getenv("LANGUAGE_MIN_CONFIDENCE", "0.6"))
+    AI_MODEL_ES: str = os.getenv("AI_MODEL_ES", "")
+    AI_MODEL_EN: str = os.getenv("AI_MODEL_EN", "")
+    # Cascada/ensemble por idioma (vacío = la lista general sin modelos de otro idioma)
+    AI_CASCADE_MODELS_ES: list = [
+        model.strip() for model in os.getenv("AI_CASCADE_MODELS_ES", "").split(",") if model.strip()
+    ]
+    AI_CASCADE_MODELS_EN: list = [
+        model.strip() for model in os.getenv("AI_CASCADE_MODELS_EN", "").split(",") if model.strip()
+    ]
+    
     # Content extraction settings
     REQUEST_TIMEOUT: int = int(os.getenv("REQUEST_TIMEOUT", "30"))
     MAX_CONTENT_LENGTH: int = int(os.getenv("MAX_CONTENT_LENGTH", "50000"))
     
+    # Detección de casi duplicados (MinHash + LSH)
+    NEAR_DUPLICATE_ENABLED: bool = os.getenv("NEAR_DUPLICATE_ENABLED", "true").lower() == "true"
+    NEAR_DUPLICATE_THRESHOLD: float = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.85"))  # Similitud Jaccard mínima
+    NEAR_DUPLICATE_MODE: str = os.getenv("NEAR_DUPLICATE_MODE", "reference")  # 'reuse' (reutiliza el veredicto) o 'reference' (solo lo reporta)
+    
+    # Pools de workers para etapas CPU-bound y llamadas bloqueantes
+    WORKER_POOL_MODE: str = os.getenv("WORKER_POOL_MODE", "thread" if os.getenv("VERCEL") == "1" else "process")  # 'process', 'thread' o 'inline'
+    WORKER_POOL_SIZE: int = int(os.getenv("WORKER_POOL_SIZE", "0"))  # 0 = un worker por núcleo
+    WORKER_POOL_START_METHOD: str = os.getenv("WORKER_POOL_START_METHOD", "spawn")
+    WORKER_POOL_MAX_QUEUE: int = int(os.getenv("WORKER_POOL_MAX_QUEUE", "64"))  # Tareas en espera además de las que corren
+    WORKER_POOL_QUEUE_TIMEOUT: float = float(os.getenv("WORKER_POOL_QUEUE_TIMEOUT", "2"))  # Espera máxima por un lugar en la cola
+    WORKER_POOL_TASK_TIMEOUT: float = float(os.getenv("WORKER_POOL_TASK_TIMEOUT", "15"))  # Timeout por tarea
+    BLOCKING_POOL_SIZE: int = int(os.getenv("BLOCKING_POOL_SIZE", "4"))  # Hilos para I/O bloqueante (newspaper3k)
+    # Sandbox de parsers de documentos (PDF, DOCX, RTF): un proceso por archivo
+    DOCUMENT_POOL_SIZE: int = int(os.getenv("DOCUMENT_POOL_SIZE", "2"))  # Documentos procesándose a la vez
+    DOCUMENT_POOL_MAX_QUEUE: int = int(os.getenv("DOCUMENT_POOL_MAX_QUEUE", "8"))
+    DOCUMENT_PARSE_TIMEOUT: float = float(os.getenv("DOCUMENT_PARSE_TIMEOUT", "20"))  # Segundos por archivo
+    DOCUMENT_MAX_MEMORY_MB: int = int(os.getenv("DOCUMENT_MAX_MEMORY_MB", "512"))  # RLIMIT_AS del proceso
+    DOCUMENT_SANDBOX_START_METHOD: str = os.getenv("DOCUMENT_SANDBOX_START_METHOD", "forkserver")
+
+    # Ingesta de lotes (POST /analyze/bulk)
+    BULK_MAX_UPLOAD_MB: int = int(os.getenv("BULK_MAX_UPLOAD_MB", "500"))
+    BULK_CONCURRENCY: int = int(os.getenv("BULK_CONCURRENCY", "4"))  # Artículos analizándose a la vez por lote
+    BULK_BATCH_SIZE: int = int(os.getenv("BULK_BATCH_SIZE", "100"))  # Análisis por commit
+    BULK_MAX_RUNNING_JOBS: int = int(os.getenv("BULK_MAX_RUNNING_JOBS", "2"))
+    BULK_JOBS_RETAINED: int = int(os.getenv("BULK_JOBS_RETAINED", "50"))  # Lotes terminados consultables
+    
+    # Detalle de análisis (GET /analyze/{analysis_id}): LRU en memoria y caché HTTP
+    ANALYSIS_CACHE_SIZE: int = int(os.getenv("ANALYSIS_CACHE_SIZE", "500"))  # Análisis en memoria (0 = sin LRU)
+    ANALYSIS_CACHE_MAX_AGE: int = int(os.getenv("ANALYSIS_CACHE_MAX_AGE", "31536000"))  # Cache-Control max-age de los análisis definitivos
+    
+    # Health checks en background
+    HEALTH_CHECK_INTERVAL: int = int(os.getenv("HEALTH_CHECK_INTERVAL", "60"))  # Segundos entre chequeos
+    HEALTH_CHECK_TIMEOUT: float = float(os.getenv("HEALTH_CHECK_TIMEOUT", "5"))  # Timeout por chequeo
+    
     # API Rate limiting
     REQUESTS_PER_MINUTE: int = int(os.getenv("REQUESTS_PER_MINUTE", "60"))
+    REQUESTS_PER_HOUR: int = int(os.getenv("REQUESTS_PER_HOUR", "500"))
     
     class Config:
         case_sensitive = True
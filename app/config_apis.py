@@ -2,35 +2,83 @@
 Configuración de APIs externas de fact-checking
 """
 import os
-from typing import Optional
+from typing import Dict, Optional
+
+
+def _provider_limits(prefix: str, rate: float, burst: int, concurrency: int, daily: int) -> Dict[str, float]:
+    """Límites de un proveedor, sobreescribibles con <PREFIJO>_RATE_PER_SECOND, etc."""
+    return {
+        "rate_per_second": float(os.getenv(f"{prefix}_RATE_PER_SECOND", str(rate))),
+        "burst": int(os.getenv(f"{prefix}_BURST", str(burst))),
+        "max_concurrency": int(os.getenv(f"{prefix}_MAX_CONCURRENCY", str(concurrency))),
+        "daily_quota": int(os.getenv(f"{prefix}_DAILY_QUOTA", str(daily))),  # 0 = sin límite
+    }
+
 
 class APIConfig:
     """Configuración centralizada para todas las APIs de fact-checking"""
     
     # Google Fact Check Tools API
     GOOGLE_FACT_CHECK_API_KEY: Optional[str] = os.getenv("GOOGLE_FACT_CHECK_API_KEY")
-    GOOGLE_FACT_CHECK_URL = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
+    GOOGLE_FACT_CHECK_URL = os.getenv("GOOGLE_FACT_CHECK_URL", "https://factchecktools.googleapis.com/v1alpha1/claims:search")
     
     # ClaimBuster API
     CLAIMBUSTER_API_KEY: Optional[str] = os.getenv("CLAIMBUSTER_API_KEY")
-    CLAIMBUSTER_URL = "https://idir.uta.edu/claimbuster/api/v2/score/text/"
+    CLAIMBUSTER_URL = os.getenv("CLAIMBUSTER_URL", "https://idir.uta.edu/claimbuster/api/v2/score/text/")
     
     # WordLift Fact-Checking API
     WORDLIFT_API_KEY: Optional[str] = os.getenv("WORDLIFT_API_KEY")
-    WORDLIFT_URL = "https://api.wordlift.io/fact-check/v1"
+    WORDLIFT_URL = os.getenv("WORDLIFT_URL", "https://api.wordlift.io/fact-check/v1")
     
     # Media Bias / Fact Check (MBFC) Data API
     MBFC_API_KEY: Optional[str] = os.getenv("MBFC_API_KEY")
-    MBFC_URL = "https://api.mediabiasfactcheck.com/v1"
+    MBFC_URL = os.getenv("MBFC_URL", "https://api.mediabiasfactcheck.com/v1")
     
     # Fake News Detection (RapidAPI)
     RAPIDAPI_KEY: Optional[str] = os.getenv("RAPIDAPI_KEY")
     RAPIDAPI_HOST = "fake-news-detection1.p.rapidapi.com"
-    RAPIDAPI_URL = f"https://{RAPIDAPI_HOST}/text"
+    RAPIDAPI_URL = os.getenv("RAPIDAPI_URL", f"https://{RAPIDAPI_HOST}/text")
+    
+    # Caché de calificaciones de MBFC por dominio (tabla source_domains)
+    MBFC_TTL_DAYS = float(os.getenv("MBFC_TTL_DAYS", "30"))
+    MBFC_NEGATIVE_TTL_HOURS = float(os.getenv("MBFC_NEGATIVE_TTL_HOURS", "24"))  # Dominios que MBFC no califica
+    MBFC_HOT_SET_SIZE = int(os.getenv("MBFC_HOT_SET_SIZE", "5000"))  # Dominios en memoria
     
     # Timeouts y configuración general
     REQUEST_TIMEOUT = 30
-    MAX_RETRIES = 3
+    MAX_RETRIES = int(os.getenv("FACT_CHECK_MAX_RETRIES", "3"))
+    
+    # Transporte compartido (app/services/provider_transport.py)
+    POOL_SIZE = int(os.getenv("FACT_CHECK_POOL_SIZE", "20"))  # Conexiones por proveedor
+    POOL_KEEPALIVE = float(os.getenv("FACT_CHECK_POOL_KEEPALIVE", "30"))
+    RETRY_BACKOFF_BASE = float(os.getenv("FACT_CHECK_RETRY_BACKOFF_BASE", "0.5"))  # Segundos; se duplica por intento
+    RETRY_BACKOFF_MAX = float(os.getenv("FACT_CHECK_RETRY_BACKOFF_MAX", "8"))
+    RETRY_AFTER_MAX = float(os.getenv("FACT_CHECK_RETRY_AFTER_MAX", "30"))  # Retry-After mayor: no se reintenta
+    
+    # Cuotas por proveedor (app/services/provider_quota.py): token bucket por
+    # segundo, concurrencia máxima y cuota diaria (persistida en la BD)
+    PROVIDER_LIMITS: Dict[str, Dict[str, float]] = {
+        "google_fact_check": _provider_limits("GOOGLE_FACT_CHECK", rate=10, burst=10, concurrency=5, daily=10000),
+        "claimbuster": _provider_limits("CLAIMBUSTER", rate=2, burst=4, concurrency=2, daily=1000),
+        "wordlift": _provider_limits("WORDLIFT", rate=5, burst=5, concurrency=3, daily=0),
+        "mbfc": _provider_limits("MBFC", rate=5, burst=5, concurrency=3, daily=0),
+        # Plan gratuito: 500 requests por mes
+        "rapidapi": _provider_limits("RAPIDAPI", rate=1, burst=1, concurrency=1, daily=16),
+    }
+    RATE_LIMIT_MAX_WAIT = float(os.getenv("FACT_CHECK_RATE_LIMIT_MAX_WAIT", "2"))  # Espera máxima por un token
+    QUOTA_FLUSH_INTERVAL = float(os.getenv("FACT_CHECK_QUOTA_FLUSH_INTERVAL", "30"))
+    
+    # Selección de oraciones verificables antes de consultar Google Fact Check
+    CLAIM_TOP_K = int(os.getenv("CLAIM_TOP_K", "3"))  # Consultas a Google por texto
+    CLAIM_MIN_SCORE = float(os.getenv("CLAIM_MIN_SCORE", "0.3"))  # Puntaje mínimo (heurística local)
+    CLAIMBUSTER_MIN_SCORE = float(os.getenv("CLAIMBUSTER_MIN_SCORE", "0.5"))  # Umbral check-worthy de ClaimBuster
+    
+    # Fact-checking dentro de /analyze (?fact_check=true): lo que llega dentro
+    # del presupuesto va en la respuesta, el resto se guarda en background
+    ENRICHMENT_BUDGET_MS = int(os.getenv("FACT_CHECK_ENRICHMENT_BUDGET_MS", "1500"))
+    ENRICHMENT_LATE_TIMEOUT = float(os.getenv("FACT_CHECK_ENRICHMENT_LATE_TIMEOUT", "60"))  # Espera máxima de los rezagados
+    # Resultados guardados que se reutilizan para el mismo contenido (0: no reutilizar)
+    RESULTS_TTL_HOURS = float(os.getenv("FACT_CHECK_RESULTS_TTL_HOURS", "72"))
     
     @classmethod
     def is_google_configured(cls) -> bool:
@@ -2,5 +2,8 @@
 from app.database import Base
 
 # Importar cada modelo individualmente
-from .news import NewsAnalysis, ModelRegistry, AnalysisMetric, DailyStats
+from .news import (
+    NewsAnalysis, AnalysisContent, ContentSignature, ContentLSHBand,
+    ModelRegistry, SourceDomain, ProviderQuotaUsage, AnalysisMetric, FactCheckResult, DailyStats
+)
 from .user import User
@@ -1,14 +1,35 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Float, Date, DateTime, Text, Boolean, ForeignKey, Index, LargeBinary
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
+class AnalysisContent(Base):
+    """Textos analizados, deduplicados por hash y comprimidos"""
+    __tablename__ = "analysis_contents"
+    
+    content_hash = Column(String(64), primary_key=True)  # SHA-256 del texto
+    compression = Column(String(10), nullable=False, default="zlib")
+    data = Column(LargeBinary, nullable=False)  # Texto comprimido
+    original_length = Column(Integer, nullable=False)  # Longitud sin comprimir
+    
+    # Búsqueda full-text (spanish + english); en SQLite se usa FTS5 y queda vacía
+    search_vector = Column(Text().with_variant(TSVECTOR(), "postgresql"), nullable=True)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index("ix_analysis_contents_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+
 class NewsAnalysis(Base):
     """Tabla para almacenar los análisis de noticias"""
     __tablename__ = "news_analyses"
     
     id = Column(Integer, primary_key=True, index=True)
-    content = Column(Text, nullable=False)  # Contenido analizado
+    # Referencia al contenido analizado (ver AnalysisContent / content_store)
+    content_hash = Column(String(64), ForeignKey("analysis_contents.content_hash"), nullable=False, index=True)
     source_type = Column(String(20), nullable=False)  # 'text', 'url', 'file'
     source_url = Column(String(500), nullable=True)  # URL si aplica
     file_name = Column(String(255), nullable=True)  # Nombre del archivo si aplica
@@ -22,6 +43,7 @@ class NewsAnalysis(Base):
     model_version = Column(String(100), nullable=False)
     analysis_time_ms = Column(Integer, nullable=True)  # Tiempo de procesamiento en ms
     content_length = Column(Integer, nullable=False)  # Longitud del contenido
+    near_duplicate_of = Column(Integer, ForeignKey("news_analyses.id"), nullable=True)  # Análisis casi idéntico previo
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -29,6 +51,41 @@ class NewsAnalysis(Base):
     
     # Relación con métricas
     metrics = relationship("AnalysisMetric", back_populates="analysis")
+    # Resultados de las APIs de fact-checking (modo fact_check de /analyze)
+    fact_check_results = relationship(
+        "FactCheckResult", back_populates="analysis", foreign_keys="FactCheckResult.analysis_id"
+    )
+    
+    # Índices para el listado con paginación keyset sobre (created_at, id)
+    __table_args__ = (
+        Index("ix_news_analyses_created_at_id", "created_at", "id"),
+        Index("ix_news_analyses_label_created_at_id", "label", "created_at", "id"),
+        Index("ix_news_analyses_source_type_created_at_id", "source_type", "created_at", "id"),
+        Index("ix_news_analyses_model_version_created_at_id", "model_version", "created_at", "id"),
+    )
+
+
+class ContentSignature(Base):
+    """Firma MinHash del contenido de cada análisis (detección de casi duplicados)"""
+    __tablename__ = "content_signatures"
+    
+    analysis_id = Column(Integer, ForeignKey("news_analyses.id"), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)  # NUM_PERM uint64 little-endian
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ContentLSHBand(Base):
+    """Buckets LSH: una fila por banda de cada firma"""
+    __tablename__ = "content_lsh_bands"
+    
+    id = Column(Integer, primary_key=True)
+    analysis_id = Column(Integer, ForeignKey("news_analyses.id"), nullable=False)
+    band_index = Column(Integer, nullable=False)
+    band_hash = Column(BigInteger, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_content_lsh_bands_band", "band_index", "band_hash"),
+    )
 
 
 class ModelRegistry(Base):
@@ -50,6 +107,32 @@ class ModelRegistry(Base):
     last_used = Column(DateTime(timezone=True), nullable=True)
 
 
+class SourceDomain(Base):
+    """Calificaciones de MBFC por dominio registrable (caché con TTL)"""
+    __tablename__ = "source_domains"
+    
+    domain = Column(String(253), primary_key=True)  # p. ej. 'clarin.com', 'bbc.co.uk'
+    found = Column(Boolean, nullable=False, default=True)  # False: MBFC no tiene el dominio
+    name = Column(String(200), nullable=True)
+    bias = Column(String(50), nullable=True)
+    credibility = Column(String(50), nullable=True)
+    factual_reporting = Column(String(50), nullable=True)
+    source_info = Column(Text, nullable=True)  # JSON completo de MBFC
+    
+    fetched_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class ProviderQuotaUsage(Base):
+    """Llamadas diarias a cada API externa (cuotas compartidas entre instancias)"""
+    __tablename__ = "provider_quota_usage"
+    
+    provider = Column(String(50), primary_key=True)
+    day = Column(Date, primary_key=True)  # Día UTC
+    calls = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
 class AnalysisMetric(Base):
     """Métricas adicionales por análisis"""
     __tablename__ = "analysis_metrics"
@@ -73,6 +156,24 @@ class AnalysisMetric(Base):
     analysis = relationship("NewsAnalysis", back_populates="metrics")
 
 
+class FactCheckResult(Base):
+    """Respuesta de una API de fact-checking asociada a un análisis"""
+    __tablename__ = "fact_check_results"
+    
+    analysis_id = Column(Integer, ForeignKey("news_analyses.id"), primary_key=True)
+    provider = Column(String(50), primary_key=True)  # 'google', 'claimbuster', 'wordlift', 'mbfc', 'rapidapi'
+    success = Column(Boolean, nullable=False)
+    result = Column(Text, nullable=False)  # JSON de la respuesta
+    latency_ms = Column(Integer, nullable=True)
+    late = Column(Boolean, nullable=False, default=False)  # Llegó después de responder /analyze
+    reused_from = Column(Integer, ForeignKey("news_analyses.id"), nullable=True)  # Análisis del mismo contenido que hizo la consulta
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relación
+    analysis = relationship("NewsAnalysis", back_populates="fact_check_results", foreign_keys=[analysis_id])
+
+
 class DailyStats(Base):
     """Estadísticas diarias agregadas"""
     __tablename__ = "daily_stats"
@@ -1,20 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request, Query
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional, Union
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import load_only
+from datetime import datetime
+from typing import Literal, Optional, Union
+import asyncio
+import base64
 import time
 import logging
+import os
 
 from app.database import get_db
 from app.schemas.news import (
     AnalyzeRequest, AnalysisResult, DetailedAnalysisResult,
+    AnalysisListItem, AnalysisListResponse,
+    AnalysisSearchItem, AnalysisSearchResponse,
     SourceType, AnalysisLabel
 )
 from app.models.news import NewsAnalysis, AnalysisMetric
-from app.services.ai_analyzer import ai_analyzer, FakeNewsLabel
+from app.services.ai_analyzer import ai_analyzer, label_for_score
+from app.services.analysis_details import FIELDS as ANALYSIS_FIELDS, analysis_details
+from app.services.bulk_ingestion import bulk_ingestion, BulkIngestionBusy
+from app.services.content_store import content_store
+from app.services.domain_reputation import domain_reputation
+from app.services.fact_check_enrichment import fact_check_enrichment
+from app.services.near_duplicate_index import near_duplicate_index
+from app.services.search_service import SearchNotSupported, search_service
+from app.config import settings
 from app.utils.content_extractor import content_extractor
 from app.utils.security import security_utils, rate_limiter
-from app.utils.text_analyzer import text_analyzer
+from app.utils.text_analyzer import text_analyzer, analyze_text
+from app.utils.bulk_readers import FORMATS as BULK_FORMATS, detect_format
+from app.utils.document_parsers import UnsupportedDocument
+from app.utils.uploads import (
+    bulk_max_upload_bytes, read_document_upload, read_text_upload, spool_upload, UploadTooLarge
+)
+from app.utils.worker_pool import (
+    worker_pool, WorkerPoolError, WorkerPoolFull, WorkerTaskFailed, WorkerTaskTimeout
+)
+from app.utils.near_duplicate import min_hasher
+from app.utils.responses import FastJSONResponse, etag_matches
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +53,9 @@ async def analyze_content(
     # Parámetros opcionales para diferentes tipos de análisis
     text: Optional[str] = Form(default=None),
     url: Optional[str] = Form(default=None),
-    file: Union[UploadFile, str, None] = File(default=None)
+    file: Union[UploadFile, str, None] = File(default=None),
+    fact_check: bool = Query(default=False, description="Consultar también las APIs de fact-checking configuradas"),
+    fact_check_budget_ms: Optional[int] = Query(default=None, ge=0, le=30000, description="Espera máxima por las APIs (por defecto FACT_CHECK_ENRICHMENT_BUDGET_MS)")
 ):
     """
     Analiza contenido de diferentes fuentes para detectar fake news.
@@ -38,6 +66,12 @@ async def analyze_content(
     - file: Archivo de texto (.txt, .docx, .pdf)
     
     Acepta tanto Form-data como JSON.
+    
+    Con fact_check=true las APIs de fact-checking se consultan en paralelo
+    con el modelo: las que responden dentro de fact_check_budget_ms van en
+    `fact_checks` y las demás (listadas en `fact_checks.pending`) se guardan
+    al terminar y aparecen en GET /analyze/{id}. Si el mismo contenido ya se
+    verificó, los resultados guardados se reutilizan (`fact_checks.reused`).
     """
     
     # Normalizar valores vacíos a None
@@ -78,15 +112,17 @@ async def analyze_content(
             detail="Debe proporcionar exactamente una fuente: text, url, o file"
         )
     
+    fact_check_run = None
     try:
         # Determinar tipo de fuente y extraer contenido
+        source_reputation = None
         if text:
             content, source_type = await _process_text(text)
             source_url = None
             file_name = None
             
         elif url:
-            content, source_type = await _process_url(url)
+            content, source_type, source_reputation = await _process_url(url)
             source_url = url
             file_name = None
             
@@ -102,12 +138,50 @@ async def analyze_content(
                 detail="No se pudo extraer contenido suficiente para análisis"
             )
         
-        # 1. Ejecutar análisis de IA
-        score, label, confidence, analysis_time_ms = await ai_analyzer.analyze_text(content)
+        # Las APIs de fact-checking corren mientras se analiza el texto
+        if fact_check:
+            fact_check_run = await fact_check_enrichment.start(
+                db, content_store.hash_content(content), content, source_url, fact_check_budget_ms
+            )
+        
+        # 1. Buscar un análisis previo casi idéntico (MinHash + LSH)
+        signature = None
+        near_duplicate = None
+        if settings.NEAR_DUPLICATE_ENABLED:
+            signature, near_duplicate = await _find_near_duplicate(db, content)
+        reuse_verdict = near_duplicate is not None and settings.NEAR_DUPLICATE_MODE == "reuse"
         
-        # 2. Análisis de características del texto
-        features = text_analyzer.analyze(content)
-        combined_score, feature_explanation = text_analyzer.get_recommendation(features, score)
+        # 2. Análisis de características del texto (CPU-bound, en el pool de workers)
+        try:
+            features = await worker_pool.run("text_features", analyze_text, content)
+        except WorkerPoolError as e:
+            logger.warning(f"Pool de workers no disponible ({type(e).__name__}): {e}")
+            raise HTTPException(
+                status_code=503,
+                detail="Servidor ocupado. Intenta nuevamente en unos segundos."
+            )
+        
+        if reuse_verdict:
+            # Reutilizar el veredicto del análisis similar sin llamar al modelo
+            matched = near_duplicate["analysis"]
+            inference = None
+            score = None
+            combined_score = matched.score
+            confidence = matched.confidence
+            model_version = matched.model_version
+            analysis_time_ms = near_duplicate["lookup_time_ms"]
+            feature_explanation = (
+                f"Veredicto reutilizado del análisis #{matched.id} "
+                f"(similitud {near_duplicate['similarity']:.2f})."
+            )
+        else:
+            # Ejecutar análisis de IA (modelo único, cascada o ensemble)
+            inference = await ai_analyzer.infer(content)
+            score = inference.score
+            confidence = inference.confidence
+            analysis_time_ms = inference.analysis_time_ms
+            model_version = inference.model_version
+            combined_score, feature_explanation = text_analyzer.get_recommendation(features, score)
         
         # 3. Generar warnings basados en características
         warnings = []
@@ -125,33 +199,35 @@ async def analyze_content(
             warnings.append(f"⚠️ CRÍTICO: Afirmaciones extraordinarias sin fuentes verificables detectadas")
         
         # 4. Ajustar label basado en score combinado
-        if combined_score < 0.35:
-            final_label = FakeNewsLabel.FAKE
-        elif combined_score > 0.65:
-            final_label = FakeNewsLabel.REAL
-        else:
-            final_label = FakeNewsLabel.UNCERTAIN
+        final_label = label_for_score(combined_score)
+        
+        # 5. Fact-checks que llegaron dentro del presupuesto de latencia
+        if fact_check_run is not None:
+            await fact_check_enrichment.collect(fact_check_run)
         
-        # Obtener información del modelo
-        model_info = await ai_analyzer.get_model_info()
+        # Guardar el texto (deduplicado y comprimido) y el análisis
+        content_hash = await content_store.store(db, content)
         
-        # Guardar en base de datos (usando score combinado)
         analysis = NewsAnalysis(
-            content=content,
+            content_hash=content_hash,
             source_type=source_type.value,
             source_url=source_url,
             file_name=file_name,
             score=combined_score,  # Usar score combinado
             label=final_label.value,  # Usar label ajustado
             confidence=confidence,
-            model_version=model_info.get("model_name", "unknown"),
+            model_version=model_version,
             analysis_time_ms=analysis_time_ms,
-            content_length=len(content)
+            content_length=len(content),
+            near_duplicate_of=near_duplicate["analysis"].id if near_duplicate else None
         )
         
         db.add(analysis)
         await db.flush()  # Para obtener el ID
         
+        if signature is not None:
+            await near_duplicate_index.add(db, analysis.id, signature)
+        
         # Crear métricas adicionales
         metrics = AnalysisMetric(
             analysis_id=analysis.id,
@@ -162,16 +238,25 @@ async def analyze_content(
         )
         
         db.add(metrics)
+        if fact_check_run is not None:
+            fact_check_enrichment.add_results(db, analysis.id, fact_check_run)
         await db.commit()
         
-        logger.info(f"Análisis completado - ID: {analysis.id}, Label: {final_label.value}, Combined Score: {combined_score:.3f}, AI Score: {score:.3f}")
+        if fact_check_run is not None:
+            # Las rezagadas se guardan asociadas al análisis cuando terminen
+            fact_check_enrichment.attach_late(analysis.id, fact_check_run)
+        
+        if reuse_verdict:
+            logger.info(f"Análisis completado - ID: {analysis.id}, Label: {final_label.value}, reutilizado de #{near_duplicate['analysis'].id}")
+        else:
+            logger.info(f"Análisis completado - ID: {analysis.id}, Label: {final_label.value}, Combined Score: {combined_score:.3f}, AI Score: {score:.3f}")
         
-        return AnalysisResult(
+        return FastJSONResponse(AnalysisResult(
             id=analysis.id,
             score=combined_score,  # Score combinado
             label=final_label,  # Label ajustado
             confidence=confidence,
-            model_version=model_info.get("model_name", "unknown"),
+            model_version=model_version,
             analysis_time_ms=analysis_time_ms,
             content_length=len(content),
             source_type=source_type,
@@ -188,12 +273,22 @@ async def analyze_content(
                 "has_dates": features.has_dates
             },
             warnings=warnings if warnings else None,
+            near_duplicate={
+                "analysis_id": near_duplicate["analysis"].id,
+                "similarity": round(near_duplicate["similarity"], 3),
+                "verdict_reused": reuse_verdict
+            } if near_duplicate else None,
+            inference=inference.to_dict() if inference else None,
+            source_reputation=_reputation_fields(source_reputation),
+            fact_checks=fact_check_enrichment.summary(fact_check_run) if fact_check_run else None,
             created_at=analysis.created_at
-        )
+        ))
         
     except HTTPException:
+        fact_check_enrichment.cancel(fact_check_run)
         raise
     except Exception as e:
+        fact_check_enrichment.cancel(fact_check_run)
         logger.error(f"Error en análisis: {type(e).__name__}: {str(e)}", exc_info=True)
         await db.rollback()
         
@@ -207,59 +302,252 @@ async def analyze_content(
             detail=error_detail
         )
 
-@router.get("/{analysis_id}", response_model=DetailedAnalysisResult)
-async def get_analysis_details(
-    analysis_id: int,
+@router.post("/bulk", status_code=202)
+async def start_bulk_ingestion(
+    request: Request,
+    file: UploadFile = File(..., description="JSONL, CSV o ZIP de archivos .txt")
+):
+    """
+    Analiza en background un lote de artículos.
+    
+    Formatos:
+    - JSONL: un objeto por línea con `text` (o `content`/`body`) y `url` opcional
+    - CSV: encabezado con una columna `text` (o `content`/`body`) y `url` opcional
+    - ZIP: un .txt por artículo (también acepta .jsonl/.csv dentro)
+    
+    Responde 202 con el id del lote; el progreso se consulta con
+    GET /analyze/bulk/{job_id}. Los análisis se guardan de a BULK_BATCH_SIZE,
+    así que los ya guardados quedan aunque el lote se cancele o falle.
+    """
+    client_ip = request.client.host
+    if not rate_limiter.is_allowed(client_ip):
+        raise HTTPException(
+            status_code=429,
+            detail="Demasiadas solicitudes. Intenta nuevamente más tarde."
+        )
+    
+    if not file.filename or not security_utils.is_safe_filename(file.filename):
+        raise HTTPException(
+            status_code=400,
+            detail="Nombre de archivo no válido"
+        )
+    fmt = detect_format(file.filename)
+    if fmt is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tipo de archivo no permitido. Use: {', '.join(BULK_FORMATS)}"
+        )
+    if bulk_ingestion.running() >= settings.BULK_MAX_RUNNING_JOBS:
+        raise HTTPException(
+            status_code=503,
+            detail="Hay demasiados lotes en curso. Intenta nuevamente más tarde."
+        )
+    
+    try:
+        path = await spool_upload(file, bulk_max_upload_bytes(), f".{fmt}")
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Archivo muy grande. Máximo {settings.BULK_MAX_UPLOAD_MB} MB."
+        )
+    
+    try:
+        job = bulk_ingestion.start(path, file.filename, fmt)
+    except BulkIngestionBusy:
+        os.unlink(path)
+        raise HTTPException(
+            status_code=503,
+            detail="Hay demasiados lotes en curso. Intenta nuevamente más tarde."
+        )
+    
+    logger.info(f"Lote {job.id} iniciado: {file.filename} ({fmt})")
+    return job.to_dict()
+
+@router.get("/bulk/{job_id}")
+async def get_bulk_ingestion(job_id: str):
+    """Progreso de un lote: leídos, analizados, guardados, fallidos y muestra de errores"""
+    job = bulk_ingestion.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=404,
+            detail="Lote no encontrado"
+        )
+    return job.to_dict()
+
+@router.delete("/bulk/{job_id}")
+async def cancel_bulk_ingestion(job_id: str):
+    """
+    Cancela un lote en curso: deja de leer el archivo y termina de guardar lo
+    que ya estaba en análisis. Los análisis guardados se conservan.
+    """
+    job = bulk_ingestion.cancel(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=404,
+            detail="Lote no encontrado"
+        )
+    return job.to_dict()
+
+@router.get("/", response_model=AnalysisListResponse)
+async def list_analyses(
+    label: Optional[AnalysisLabel] = Query(default=None, description="Filtrar por label"),
+    source_type: Optional[SourceType] = Query(default=None, description="Filtrar por tipo de fuente"),
+    model_version: Optional[str] = Query(default=None, description="Filtrar por modelo"),
+    created_from: Optional[datetime] = Query(default=None, description="Fecha mínima (inclusive, ISO 8601)"),
+    created_to: Optional[datetime] = Query(default=None, description="Fecha máxima (exclusiva, ISO 8601)"),
+    cursor: Optional[str] = Query(default=None, description="Cursor devuelto en next_cursor"),
+    limit: int = Query(default=50, ge=1, le=200, description="Cantidad de resultados por página"),
+    include_content: bool = Query(default=False, description="Incluir el texto analizado"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Obtiene los detalles completos de un análisis específico"""
+    """
+    Lista análisis previos, del más reciente al más antiguo.
+    
+    Usa paginación keyset sobre (created_at, id): el costo de cada página es
+    el mismo sin importar la profundidad. Para avanzar, pasar el `next_cursor`
+    de la respuesta anterior en `cursor`.
+    """
+    
+    query = select(NewsAnalysis).options(load_only(*_LIST_COLUMNS))
+    
+    if label:
+        query = query.where(NewsAnalysis.label == label.value)
+    if source_type:
+        query = query.where(NewsAnalysis.source_type == source_type.value)
+    if model_version:
+        query = query.where(NewsAnalysis.model_version == model_version)
+    if created_from:
+        query = query.where(NewsAnalysis.created_at >= created_from)
+    if created_to:
+        query = query.where(NewsAnalysis.created_at < created_to)
+    if cursor:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
+        query = query.where(
+            tuple_(NewsAnalysis.created_at, NewsAnalysis.id) < tuple_(cursor_created_at, cursor_id)
+        )
+    
+    # Pedimos una fila extra para saber si hay otra página
+    query = query.order_by(NewsAnalysis.created_at.desc(), NewsAnalysis.id.desc()).limit(limit + 1)
     
     try:
-        # Buscar análisis con métricas
-        from sqlalchemy.orm import selectinload
-        from sqlalchemy import select
+        result = await db.execute(query)
+        rows = result.scalars().all()
         
-        result = await db.execute(
-            select(NewsAnalysis)
-            .options(selectinload(NewsAnalysis.metrics))
-            .where(NewsAnalysis.id == analysis_id)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        contents = {}
+        if include_content:
+            contents = await content_store.load_many(db, [row.content_hash for row in rows])
+    except Exception as e:
+        logger.error(f"Error listando análisis: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Error interno del servidor"
+        )
+    
+    items = [
+        AnalysisListItem(
+            **_list_item_fields(row),
+            content=contents.get(row.content_hash) if include_content else None
         )
+        for row in rows
+    ]
+    
+    return AnalysisListResponse(
+        items=items,
+        limit=limit,
+        has_more=has_more,
+        next_cursor=_encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+    )
+
+@router.get("/search", response_model=AnalysisSearchResponse)
+async def search_analyses(
+    q: str = Query(..., min_length=2, max_length=200, description="Frase o términos a buscar"),
+    language: Optional[Literal["es", "en"]] = Query(default=None, description="Restringir a un idioma (por defecto español e inglés; sin efecto en SQLite)"),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0, le=1000),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Busca veredictos previos cuyo contenido coincide con una frase o claim.
+    
+    Resultados ordenados por relevancia (ts_rank sobre un índice GIN en
+    PostgreSQL; FTS5 en SQLite, donde `language` no filtra porque el índice
+    no distingue idiomas).
+    """
+    
+    try:
+        ranked = await search_service.search(db, q, limit=limit, offset=offset, language=language)
         
-        analysis = result.scalar_one_or_none()
+        rows = {}
+        if ranked:
+            result = await db.execute(
+                select(NewsAnalysis)
+                .options(load_only(*_LIST_COLUMNS))
+                .where(NewsAnalysis.id.in_([analysis_id for analysis_id, _ in ranked]))
+            )
+            rows = {row.id: row for row in result.scalars().all()}
+    except SearchNotSupported as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error en búsqueda full-text: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Error interno del servidor"
+        )
+    
+    items = [
+        AnalysisSearchItem(**_list_item_fields(rows[analysis_id]), rank=rank)
+        for analysis_id, rank in ranked
+        if analysis_id in rows
+    ]
+    
+    return AnalysisSearchResponse(query=q, items=items, limit=limit, offset=offset)
+
+@router.get("/{analysis_id}", response_model=DetailedAnalysisResult)
+async def get_analysis_details(
+    analysis_id: int,
+    request: Request,
+    include_content: bool = Query(default=True, description="Incluir el texto analizado"),
+    fields: Optional[str] = Query(default=None, description="Campos a devolver, separados por coma (por defecto todos)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Obtiene los detalles completos de un análisis específico.
+    
+    Con include_content=false, o si `fields` no incluye content, no se lee ni
+    descomprime el texto analizado. La respuesta lleva un ETag fuerte y
+    responde 304 a un If-None-Match que coincida; los análisis que ya no
+    pueden recibir fact-checks rezagados se sirven como inmutables.
+    """
+    
+    selected = None
+    if fields is not None:
+        selected = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = selected - ANALYSIS_FIELDS
+        if unknown or not selected:
+            invalid = ", ".join(sorted(unknown)) if unknown else repr(fields)
+            raise HTTPException(
+                status_code=400,
+                detail=f"Campos no válidos: {invalid}. Disponibles: {', '.join(sorted(ANALYSIS_FIELDS))}"
+            )
+    with_content = include_content and (selected is None or "content" in selected)
+    
+    try:
+        detail = await analysis_details.get(db, analysis_id, with_content)
         
-        if not analysis:
+        if detail is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"Análisis con ID {analysis_id} no encontrado"
             )
         
-        # Construir respuesta con métricas
-        metrics_data = None
-        if analysis.metrics:
-            metric = analysis.metrics[0]  # Debería haber solo una métrica por análisis
-            metrics_data = {
-                "word_count": metric.word_count,
-                "sentence_count": metric.sentence_count,
-                "readability_score": metric.readability_score,
-                "extraction_success": metric.extraction_success,
-                "extraction_method": metric.extraction_method
-            }
-        
-        return DetailedAnalysisResult(
-            id=analysis.id,
-            score=analysis.score,
-            label=AnalysisLabel(analysis.label),
-            confidence=analysis.confidence,
-            model_version=analysis.model_version,
-            analysis_time_ms=analysis.analysis_time_ms,
-            content_length=analysis.content_length,
-            source_type=SourceType(analysis.source_type),
-            created_at=analysis.created_at,
-            content=analysis.content,
-            source_url=analysis.source_url,
-            file_name=analysis.file_name,
-            metrics=metrics_data
-        )
+        body, etag = detail.render(selected)
+        headers = {"ETag": etag, "Cache-Control": detail.cache_control}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
         
     except HTTPException:
         raise
@@ -272,6 +560,89 @@ async def get_analysis_details(
 
 # Funciones auxiliares
 
+# Columnas livianas para listados (sin el contenido)
+_LIST_COLUMNS = (
+    NewsAnalysis.id, NewsAnalysis.score, NewsAnalysis.label, NewsAnalysis.confidence,
+    NewsAnalysis.model_version, NewsAnalysis.analysis_time_ms, NewsAnalysis.content_length,
+    NewsAnalysis.source_type, NewsAnalysis.source_url, NewsAnalysis.file_name,
+    NewsAnalysis.created_at, NewsAnalysis.content_hash
+)
+
+def _list_item_fields(row: NewsAnalysis) -> dict:
+    """Campos comunes de AnalysisListItem a partir de una fila liviana"""
+    return {
+        "id": row.id,
+        "score": row.score,
+        "label": AnalysisLabel(row.label),
+        "confidence": row.confidence,
+        "model_version": row.model_version,
+        "analysis_time_ms": row.analysis_time_ms,
+        "content_length": row.content_length,
+        "source_type": SourceType(row.source_type),
+        "source_url": row.source_url,
+        "file_name": row.file_name,
+        "created_at": row.created_at
+    }
+
+async def _find_near_duplicate(db: AsyncSession, content: str) -> tuple[Optional[tuple], Optional[dict]]:
+    """
+    Calcula la firma MinHash del contenido y busca un análisis previo casi idéntico.
+    
+    Returns:
+        (firma, match): firma es None si el texto no tiene palabras; match es
+        None o un dict con el análisis, la similitud estimada y el tiempo de
+        búsqueda.
+    """
+    start = time.time()
+    signature = min_hasher.signature(content)
+    if signature is None:
+        # Sin palabras no hay firma comparable
+        return None, None
+    
+    try:
+        match = await near_duplicate_index.find_similar(db, signature)
+        if not match:
+            return signature, None
+        
+        analysis_id, similarity = match
+        result = await db.execute(
+            select(NewsAnalysis)
+            .options(load_only(
+                NewsAnalysis.id, NewsAnalysis.score, NewsAnalysis.label,
+                NewsAnalysis.confidence, NewsAnalysis.model_version
+            ))
+            .where(NewsAnalysis.id == analysis_id)
+        )
+        matched = result.scalar_one_or_none()
+        if not matched:
+            return signature, None
+        
+        return signature, {
+            "analysis": matched,
+            "similarity": similarity,
+            "lookup_time_ms": int((time.time() - start) * 1000)
+        }
+    except Exception as e:
+        logger.error(f"Error buscando casi duplicados: {e}")
+        return signature, None
+
+def _encode_cursor(created_at: datetime, analysis_id: int) -> str:
+    """Codifica la posición (created_at, id) como cursor opaco"""
+    raw = f"{created_at.isoformat()}|{analysis_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decodifica un cursor generado por _encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, analysis_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(analysis_id)
+    except Exception:
+        raise HTTPException(
+            status_code=400,
+            detail="Cursor de paginación inválido"
+        )
+
 async def _process_text(text: str) -> tuple[str, SourceType]:
     """Procesa y valida texto directo"""
     
@@ -282,13 +653,13 @@ async def _process_text(text: str) -> tuple[str, SourceType]:
     if not security_utils.validate_content_length(clean_text):
         raise HTTPException(
             status_code=400,
-            detail=f"Texto muy largo. Máximo {security_utils.settings.MAX_CONTENT_LENGTH} caracteres."
+            detail=f"Texto muy largo. Máximo {settings.MAX_CONTENT_LENGTH} caracteres."
         )
     
     return clean_text, SourceType.TEXT
 
-async def _process_url(url: str) -> tuple[str, SourceType]:
-    """Procesa y extrae contenido de URL"""
+async def _process_url(url: str) -> tuple[str, SourceType, Optional[dict]]:
+    """Procesa y extrae contenido de URL; también resuelve la reputación del dominio"""
     
     # Validar URL
     if not content_extractor.validate_url(url):
@@ -297,19 +668,40 @@ async def _process_url(url: str) -> tuple[str, SourceType]:
             detail="URL no válida o no permitida"
         )
     
-    # Extraer contenido
-    content, method, success = await content_extractor.extract_from_url(url)
+    # La reputación del dominio (hot set, BD o MBFC) se resuelve mientras se descarga el artículo
+    reputation_task = asyncio.create_task(domain_reputation.lookup(url))
     
-    if not success or not content:
-        raise HTTPException(
-            status_code=400,
-            detail="No se pudo extraer contenido de la URL proporcionada"
-        )
-    
-    # Sanitizar contenido extraído
-    clean_content = security_utils.sanitize_text(content)
+    try:
+        # Extraer contenido
+        content, method, success = await content_extractor.extract_from_url(url)
+        
+        if not success or not content:
+            raise HTTPException(
+                status_code=400,
+                detail="No se pudo extraer contenido de la URL proporcionada"
+            )
+        
+        # Sanitizar contenido extraído (el extractor ya removió los caracteres de control)
+        clean_content = security_utils.sanitize_text(content, control_chars_removed=True)
+    except BaseException:
+        # La request falló o se canceló: no seguir gastando la llamada a MBFC
+        reputation_task.cancel()
+        raise
     
-    return clean_content, SourceType.URL
+    return clean_content, SourceType.URL, await reputation_task
+
+def _reputation_fields(entry: Optional[dict]) -> Optional[dict]:
+    """Resumen de la reputación del dominio para la respuesta de /analyze"""
+    if entry is None:
+        return None
+    return {
+        "domain": entry["domain"],
+        "rated": entry["found"],
+        "bias": entry["bias"],
+        "credibility": entry["credibility"],
+        "factual_reporting": entry["factual_reporting"],
+        "stale": entry.get("stale", False),
+    }
 
 async def _process_file(file: UploadFile) -> tuple[str, SourceType]:
     """Procesa y extrae contenido de archivo"""
@@ -333,29 +725,21 @@ async def _process_file(file: UploadFile) -> tuple[str, SourceType]:
             detail="Tipo de archivo no permitido. Use: .txt, .doc, .docx, .pdf, .rtf"
         )
     
-    # Leer contenido del archivo
+    # .doc (Word 97-2003) es un formato binario sin parser disponible
+    extension = os.path.splitext(file.filename.lower())[1]
+    if extension == '.doc':
+        raise HTTPException(
+            status_code=400,
+            detail="Los archivos .doc no están soportados. Guárdalo como .docx o .pdf"
+        )
+    
+    # Leer el archivo por bloques: el límite de tamaño se aplica mientras se lee.
+    # PDF, DOCX y RTF se parsean en el sandbox de documentos
     try:
-        file_content = await file.read()
-        
-        # Validar tamaño
-        if not security_utils.validate_file_size(len(file_content)):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Archivo muy grande. Máximo {security_utils.settings.MAX_FILE_SIZE_MB} MB."
-            )
-        
-        # Por ahora, solo procesamos archivos de texto plano
-        # En producción, agregarías parsers para DOC, PDF, etc.
-        if file.filename.lower().endswith('.txt'):
-            content = file_content.decode('utf-8', errors='ignore')
+        if extension == '.txt':
+            clean_content = await read_text_upload(file)
         else:
-            raise HTTPException(
-                status_code=400,
-                detail="Por ahora solo se soportan archivos .txt"
-            )
-        
-        # Sanitizar contenido
-        clean_content = security_utils.sanitize_text(content)
+            clean_content = await read_document_upload(file, extension)
         
         if len(clean_content.strip()) < 10:
             raise HTTPException(
@@ -365,11 +749,31 @@ async def _process_file(file: UploadFile) -> tuple[str, SourceType]:
         
         return clean_content, SourceType.FILE
         
-    except UnicodeDecodeError:
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Archivo muy grande. Máximo {settings.MAX_FILE_SIZE_MB} MB."
+        )
+    except UnsupportedDocument as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except WorkerTaskTimeout:
+        raise HTTPException(
+            status_code=400,
+            detail=f"El documento tardó demasiado en procesarse (máximo {settings.DOCUMENT_PARSE_TIMEOUT:g} s)"
+        )
+    except WorkerTaskFailed as e:
+        logger.warning(f"Parser de documentos falló para {file.filename}: {e}")
         raise HTTPException(
             status_code=400,
-            detail="No se pudo leer el archivo. Asegúrese de que esté en formato UTF-8."
+            detail="No se pudo leer el documento. Verifica que no esté dañado o protegido con contraseña."
+        )
+    except WorkerPoolFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Servidor ocupado. Intenta nuevamente en unos segundos."
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error procesando archivo: {e}")
         raise HTTPException(
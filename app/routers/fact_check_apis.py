@@ -1,10 +1,13 @@
 """
 Router para endpoints de APIs externas de fact-checking
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any
 import time
 
+from app.database import get_db
+
 from app.schemas.external_apis import (
     GoogleFactCheckRequest,
     ClaimBusterRequest,
@@ -22,16 +25,30 @@ from app.services.external_apis import (
     rapidapi_service
 )
 from app.config_apis import api_config
+from app.services.claim_selection import claim_selection_service
+from app.services.domain_reputation import domain_reputation
+from app.services.provider_quota import provider_quotas
 
 router = APIRouter(prefix="/fact-check", tags=["External Fact-Checking APIs"])
 
+# Proveedor en PROVIDER_LIMITS -> nombres aceptados en MultiAPIRequest.apis (el primero es la clave en results)
+_PROVIDER_ALIASES = {
+    "google_fact_check": ("google", "google_fact_check"),
+    "claimbuster": ("claimbuster",),
+    "wordlift": ("wordlift",),
+    "mbfc": ("mbfc",),
+    "rapidapi": ("rapidapi",),
+}
+_ALIAS_TO_SHORT = {alias: aliases[0] for aliases in _PROVIDER_ALIASES.values() for alias in aliases}
+
 
 @router.get("/status", response_model=APIStatus)
 async def get_apis_status():
     """
     Obtener estado de configuración de todas las APIs externas
     
-    Retorna qué APIs están configuradas y listas para usar
+    Retorna qué APIs están configuradas y listas para usar, y el presupuesto
+    restante de cada una (cuota diaria, tokens por segundo y concurrencia)
     """
     return {
         "google_fact_check": api_config.is_google_configured(),
@@ -39,7 +56,8 @@ async def get_apis_status():
         "wordlift": api_config.is_wordlift_configured(),
         "mbfc": api_config.is_mbfc_configured(),
         "rapidapi": api_config.is_rapidapi_configured(),
-        "configured_apis": api_config.get_configured_apis()
+        "configured_apis": api_config.get_configured_apis(),
+        "quotas": provider_quotas.status()
     }
 
 
@@ -103,7 +121,7 @@ async def wordlift_fact_check(request: WordLiftRequest) -> Dict[str, Any]:
 
 
 @router.post("/mbfc")
-async def mbfc_check_source(request: MBFCRequest) -> Dict[str, Any]:
+async def mbfc_check_source(request: MBFCRequest, db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
     """
     Verificar sesgo y credibilidad de una fuente con MBFC API
     
@@ -114,9 +132,12 @@ async def mbfc_check_source(request: MBFCRequest) -> Dict[str, Any]:
     - Credibilidad de la fuente
     - Precisión factual
     
-    **Requiere**: Variable de entorno `MBFC_API_KEY`
+    Las calificaciones son por dominio y se guardan (memoria y BD) con un TTL
+    largo: la API solo se consulta si el dominio no está o su calificación venció.
+    
+    **Requiere**: Variable de entorno `MBFC_API_KEY` (salvo dominios precargados)
     """
-    result = await mbfc_service.check_source(url=request.url)
+    result = await _mbfc_from_store(request.url, db)
     
     if not result.get("success", False) and result.get("configured") == False:
         raise HTTPException(status_code=503, detail=result.get("message"))
@@ -148,7 +169,7 @@ async def rapidapi_detect(request: RapidAPIRequest) -> Dict[str, Any]:
 
 
 @router.post("/multi-check")
-async def multi_api_check(request: MultiAPIRequest) -> Dict[str, Any]:
+async def multi_api_check(request: MultiAPIRequest, db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
     """
     Analizar con múltiples APIs simultáneamente
     
@@ -156,29 +177,52 @@ async def multi_api_check(request: MultiAPIRequest) -> Dict[str, Any]:
     - **url**: URL de la fuente (opcional)
     - **title**: Título (opcional)
     - **apis**: Lista de APIs a usar ["google", "claimbuster", "wordlift", "mbfc", "rapidapi"] o ["all"]
-    
-    Ejecuta fact-checking en múltiples APIs y agrega resultados
+    - **max_claims**: Oraciones a consultar en Google (opcional)
+    
+    Ejecuta fact-checking en múltiples APIs y agrega resultados. El texto se
+    divide en oraciones que se puntúan por verificabilidad (una llamada a
+    ClaimBuster o una heurística local) y Google se consulta solo por las más
+    verificables, en paralelo; `claim_selection` muestra las oraciones elegidas
+    y las llamadas ahorradas. Las APIs sin cuota disponible se omiten y se
+    listan en `summary.skipped_apis`.
     """
     results = {}
+    skipped = {}
     apis_to_use = request.apis
     
     # Si se especifica "all", usar todas las APIs configuradas
     if "all" in apis_to_use:
         apis_to_use = api_config.get_configured_apis()
     
-    # Google Fact Check
-    if "google" in apis_to_use or "google_fact_check" in apis_to_use:
-        if api_config.is_google_configured():
-            results["google"] = await google_fact_check_service.check_claim(
-                query=request.text
-            )
-    
-    # ClaimBuster
-    if "claimbuster" in apis_to_use:
-        if api_config.is_claimbuster_configured():
-            results["claimbuster"] = await claimbuster_service.score_text(
-                text=request.text
-            )
+    # Omitir de entrada las APIs con la cuota agotada (MBFC puede responder desde su caché)
+    for name, aliases in _PROVIDER_ALIASES.items():
+        if name != "mbfc" and any(alias in apis_to_use for alias in aliases):
+            reason = provider_quotas.check(name)
+            if reason:
+                skipped[aliases[0]] = reason
+    apis_to_use = [api for api in apis_to_use if _ALIAS_TO_SHORT.get(api, api) not in skipped]
+    
+    use_google = ("google" in apis_to_use or "google_fact_check" in apis_to_use) and api_config.is_google_configured()
+    use_claimbuster = "claimbuster" in apis_to_use and api_config.is_claimbuster_configured()
+    claim_selection = None
+    
+    # Selección de oraciones verificables: ClaimBuster puntúa cada oración en una sola llamada
+    if use_google or use_claimbuster:
+        selection = await claim_selection_service.select(
+            request.text, top_k=request.max_claims, use_claimbuster=use_claimbuster
+        )
+        if selection.claimbuster_result is not None:
+            results["claimbuster"] = selection.claimbuster_result
+        
+        # Google Fact Check: solo las oraciones seleccionadas, en paralelo
+        google_calls = 0
+        if use_google:
+            results["google"] = await claim_selection_service.check_google(selection, request.text)
+            google_calls = len([q for q in results["google"]["queries"] if not q.get("skipped")])
+        
+        claim_selection = claim_selection_service.report(
+            selection, google_calls, include_google=use_google, include_claimbuster=use_claimbuster
+        )
     
     # WordLift
     if "wordlift" in apis_to_use:
@@ -187,12 +231,11 @@ async def multi_api_check(request: MultiAPIRequest) -> Dict[str, Any]:
                 text=request.text
             )
     
-    # MBFC (solo si se proporciona URL)
+    # MBFC (solo si se proporciona URL), desde la caché de dominios
     if ("mbfc" in apis_to_use) and request.url:
-        if api_config.is_mbfc_configured():
-            results["mbfc"] = await mbfc_service.check_source(
-                url=request.url
-            )
+        results["mbfc"] = await _mbfc_from_store(request.url, db)
+        if results["mbfc"].get("configured") == False:
+            del results["mbfc"]
     
     # RapidAPI
     if "rapidapi" in apis_to_use:
@@ -202,12 +245,18 @@ async def multi_api_check(request: MultiAPIRequest) -> Dict[str, Any]:
                 title=request.title or ""
             )
     
+    # Las que se quedaron sin cuota durante la llamada también cuentan como omitidas
+    for name, result in list(results.items()):
+        if result.get("skipped"):
+            skipped[name] = results.pop(name).get("error")
+    
     # Crear resumen
     summary = {
         "total_apis_used": len(results),
         "apis_called": list(results.keys()),
         "successful_calls": len([r for r in results.values() if r.get("success", False)]),
-        "failed_calls": len([r for r in results.values() if not r.get("success", False)])
+        "failed_calls": len([r for r in results.values() if not r.get("success", False)]),
+        "skipped_apis": skipped
     }
     
     return {
@@ -215,5 +264,20 @@ async def multi_api_check(request: MultiAPIRequest) -> Dict[str, Any]:
         "url": request.url,
         "results": results,
         "summary": summary,
+        "claim_selection": claim_selection,
         "timestamp": time.time()
-    }
\ No newline at end of file
+    }
+
+
+async def _mbfc_from_store(url: str, db: AsyncSession) -> Dict[str, Any]:
+    """Calificación MBFC del dominio de la URL, desde la caché o la API"""
+    entry = await domain_reputation.lookup(url, db)
+    if entry is not None:
+        return domain_reputation.as_mbfc_result(entry)
+    if not api_config.is_mbfc_configured():
+        return await mbfc_service.check_source(url=url)
+    return {
+        "success": False,
+        "api": "mbfc",
+        "error": "No se pudo obtener la calificación del dominio"
+    }
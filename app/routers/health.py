@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 import time
@@ -6,7 +7,7 @@ import logging
 
 from app.database import get_db
 from app.schemas.news import HealthResponse
-from app.services.ai_analyzer import ai_analyzer
+from app.services.health_monitor import health_monitor
 from app.utils.content_extractor import content_extractor
 
 logger = logging.getLogger(__name__)
@@ -17,71 +18,74 @@ router = APIRouter(prefix="/health", tags=["health"])
 start_time = time.time()
 
 @router.get("/", response_model=HealthResponse)
-async def health_check(db: AsyncSession = Depends(get_db)):
+async def health_check():
     """
     Verifica el estado de salud del sistema.
     
-    Chequea:
+    Chequea (desde la caché del monitor en background):
     - Conexión a base de datos
     - Estado del modelo de IA
     - Funcionalidad del extractor web
     """
-    
-    status = "healthy"
-    database_ok = False
-    ai_model_ok = False
-    web_extractor_ok = False
-    
-    # Verificar base de datos
-    try:
-        from sqlalchemy import text
-        result = await db.execute(text("SELECT 1"))
-        database_ok = result.scalar() == 1
-    except Exception as e:
-        logger.error(f"Error verificando base de datos: {e}")
-        database_ok = False
-    
-    # Verificar modelo de IA
-    try:
-        model_info = await ai_analyzer.get_model_info()
-        ai_model_ok = model_info.get("is_loaded", False)
-        
-        # Test básico del modelo si está cargado
-        if ai_model_ok:
-            test_result = await ai_analyzer.analyze_text("This is a test message.")
-            ai_model_ok = test_result is not None
-            
-    except Exception as e:
-        logger.error(f"Error verificando modelo de IA: {e}")
-        ai_model_ok = False
-    
-    # Verificar extractor web (test básico)
-    try:
-        # Solo verificar que el extractor esté disponible
-        web_extractor_ok = hasattr(content_extractor, 'extract_from_url')
-    except Exception as e:
-        logger.error(f"Error verificando extractor web: {e}")
-        web_extractor_ok = False
-    
-    # Determinar estado general
-    if database_ok and ai_model_ok and web_extractor_ok:
-        status = "healthy"
-    elif database_ok and (ai_model_ok or web_extractor_ok):
-        status = "degraded"
-    else:
-        status = "unhealthy"
+    results = await health_monitor.get_results()
     
     # Calcular uptime
     uptime_seconds = int(time.time() - start_time)
     
     return HealthResponse(
-        status=status,
-        database=database_ok,
-        ai_model=ai_model_ok,
-        web_extractor=web_extractor_ok,
+        status=health_monitor.overall_status(results),
+        database=results["database"]["ok"],
+        ai_model=results["ai_model"]["ok"],
+        web_extractor=results["web_extractor"]["ok"],
         timestamp=datetime.now(),
         version="1.0.0",
-        uptime_seconds=uptime_seconds
+        uptime_seconds=uptime_seconds,
+        last_checked=health_monitor.last_run,
+        checks=results
+    )
+
+@router.get("/live")
+async def liveness():
+    """
+    Liveness probe: no toca base de datos ni servicios externos.
+    
+    Responde 200 mientras el proceso pueda atender requests.
+    """
+    return {
+        "status": "alive",
+        "uptime_seconds": int(time.time() - start_time),
+        "timestamp": datetime.now()
+    }
+
+@router.get("/ready")
+async def readiness():
+    """
+    Readiness probe servida desde la caché de health checks.
+    
+    Devuelve 503 si la base de datos no está disponible (el servicio no puede
+    guardar análisis); si solo falla la inferencia el análisis sigue funcionando
+    con el fallback heurístico y se reporta como "degraded".
+    """
+    results = await health_monitor.get_results()
+    status = health_monitor.overall_status(results)
+    ready = results["database"]["ok"]
+    
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "ready": ready,
+            "status": status,
+            "last_checked": health_monitor.last_run.isoformat() if health_monitor.last_run else None,
+            "checks": {
+                name: {
+                    "ok": check["ok"],
+                    "checked_at": check["checked_at"].isoformat(),
+                    "duration_ms": check["duration_ms"],
+                    "error": check["error"]
+                }
+                for name, check in results.items()
+            }
+        }
     )
 
 @router.get("/database")
@@ -120,25 +124,20 @@ async def database_health(db: AsyncSession = Depends(get_db)):
 
 @router.get("/ai-model")
 async def ai_model_health():
-    """Verificación específica del modelo de IA"""
+    """Verificación específica del modelo de IA (resultado cacheado del último chequeo)"""
     try:
-        model_info = await ai_analyzer.get_model_info()
-        
-        # Test del modelo
-        test_start = time.time()
-        score, label, confidence, processing_time = await ai_analyzer.analyze_text(
-            "This is a simple test message for health check."
-        )
-        test_duration = time.time() - test_start
+        results = await health_monitor.get_results()
+        check = results["ai_model"]
         
         return {
-            "status": "healthy",
-            "model_loaded": model_info.get("is_loaded", False),
-            "model_name": model_info.get("model_name", "unknown"),
-            "is_mock": model_info.get("is_mock", False),
-            "test_successful": True,
-            "test_duration_ms": int(test_duration * 1000),
-            "test_processing_time_ms": processing_time,
+            "status": "healthy" if check["ok"] else "unhealthy",
+            "model_loaded": check.get("is_loaded", False),
+            "model_name": check.get("model_name", "unknown"),
+            "inference_reachable": check.get("inference_reachable", False),
+            "test_successful": check["ok"],
+            "test_duration_ms": check["duration_ms"],
+            "checked_at": check["checked_at"],
+            "error": check["error"],
             "timestamp": datetime.now()
         }
         
@@ -4,7 +4,11 @@ from typing import Optional
 
 from app.database import get_db
 from app.schemas.news import SummaryMetrics, TimeseriesResponse
+from app.services.analysis_details import analysis_details
 from app.services.metrics_service import metrics_service
+from app.services.provider_transport import provider_transports
+from app.utils.responses import FastJSONResponse
+from app.utils.worker_pool import worker_pool
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
 
@@ -38,7 +42,37 @@ async def get_timeseries_metrics(
     - Promedios de score y confianza
     - Total de análisis por día
     """
-    return await metrics_service.get_timeseries_data(db, days)
+    return FastJSONResponse(await metrics_service.get_timeseries_data(db, days))
+
+@router.get("/workers")
+async def get_worker_pool_metrics():
+    """
+    Utilización de los pools de workers.
+    
+    Para cada pool (cpu y blocking) incluye modo, workers, tareas en curso y
+    en cola, utilización acumulada, y por etapa: enviadas, completadas,
+    fallidas, timeouts, rechazadas y tiempos medios de espera y ejecución.
+    """
+    return worker_pool.stats()
+
+@router.get("/providers")
+async def get_provider_metrics():
+    """
+    Métricas de las APIs externas de fact-checking, por proveedor.
+    
+    Incluye llamadas, intentos, reintentos, fallos (tras agotar reintentos),
+    conteo por código de estado (o connection_error) y latencia media, p50 y
+    p95 de las llamadas completas (incluyendo las esperas entre reintentos).
+    """
+    return provider_transports.stats()
+
+@router.get("/analysis-cache")
+async def get_analysis_cache_metrics():
+    """
+    Estado del LRU de GET /analyze/{analysis_id}: análisis en memoria,
+    capacidad, aciertos y lecturas de la BD.
+    """
+    return analysis_details.status()
 
 @router.post("/refresh-daily")
 async def refresh_daily_stats(
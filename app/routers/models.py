@@ -1,19 +1,26 @@
 """
 Router para gestión de modelos de IA
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict
 from pydantic import BaseModel
+import logging
 
+from app.database import get_db
 from app.utils.model_manager import model_manager, FakeNewsModel
-from app.services.ai_analyzer import ai_analyzer
+from app.services.ai_analyzer import ai_analyzer, ModelSwapError, ModelSwapInProgress
+from app.services.model_performance import model_performance
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/models", tags=["models"])
 
 
 class ModelChangeRequest(BaseModel):
     model_name: str
+    force: bool = False  # Cambiar aunque el modelo no responda al warmup
 
 
 class CurrentModelResponse(BaseModel):
@@ -28,11 +35,18 @@ class ModelsListResponse(BaseModel):
 
 
 @router.get("/", response_model=ModelsListResponse)
-async def list_models():
+async def list_models(db: AsyncSession = Depends(get_db)):
     """
     Lista todos los modelos de fake news disponibles con su información.
+    
+    Cada modelo incluye `performance` con las llamadas, errores, tasa de error
+    y latencias (promedio, máxima, p50/p95) observadas en producción.
     """
-    models_list = model_manager.list_all_models()
+    performance = await model_performance.get_metrics(db)
+    models_list = [
+        {**model, "performance": performance.get(model["model_id"])}
+        for model in model_manager.list_all_models()
+    ]
     
     return ModelsListResponse(
         total_models=len(models_list),
@@ -42,12 +56,13 @@ async def list_models():
 
 
 @router.get("/current", response_model=CurrentModelResponse)
-async def get_current_model():
+async def get_current_model(db: AsyncSession = Depends(get_db)):
     """
     Obtiene el modelo actualmente en uso.
     """
-    current = settings.HF_MODEL_NAME
-    info = model_manager.get_model_info(current)
+    current = ai_analyzer.model_name
+    performance = await model_performance.get_metrics(db)
+    info = {**model_manager.get_model_info(current), "performance": performance.get(current)}
     
     return CurrentModelResponse(
         current_model=current,
@@ -92,11 +107,14 @@ async def get_english_models():
 
 
 @router.post("/change")
-async def change_model(request: ModelChangeRequest):
+async def change_model(request: ModelChangeRequest, db: AsyncSession = Depends(get_db)):
     """
-    Cambia el modelo de IA actual (requiere reinicio en producción).
+    Cambia el modelo de IA actual de forma atómica (solo en este proceso).
     
-    En desarrollo, esto cambiará el modelo inmediatamente.
+    Primero calienta el modelo nuevo; si no responde, el cambio se cancela
+    (503) salvo que se envíe `force: true`. Luego espera a que terminen las
+    inferencias en curso y recién entonces activa el modelo nuevo. Si ya hay
+    un cambio en curso responde 409.
     En producción (Vercel), necesitarás actualizar la variable de entorno HF_MODEL_NAME.
     """
     # Validar que el modelo existe
@@ -109,9 +127,17 @@ async def change_model(request: ModelChangeRequest):
         )
     
     # Actualizar el modelo (solo en runtime, no persiste)
-    settings.HF_MODEL_NAME = request.model_name
-    ai_analyzer.model_name = request.model_name
-    ai_analyzer.api_url = f"{settings.HF_API_URL}{request.model_name}"
+    try:
+        swap = await ai_analyzer.swap_model(request.model_name, force=request.force)
+    except ModelSwapInProgress as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ModelSwapError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    try:
+        await model_performance.mark_active(db, request.model_name)
+    except Exception as e:
+        logger.error(f"Error actualizando model_registry: {e}")
     
     model_info = model_manager.get_model_info(request.model_name)
     
@@ -120,10 +146,22 @@ async def change_model(request: ModelChangeRequest):
         "message": "Modelo cambiado exitosamente (solo en esta sesión)",
         "new_model": request.model_name,
         "model_info": model_info,
+        "swap": swap,
         "note": "En producción, actualiza la variable de entorno HF_MODEL_NAME para persistir el cambio"
     }
 
 
+@router.get("/routing")
+async def get_language_routing():
+    """
+    Ruteo de textos a modelos según su idioma.
+    
+    Incluye los modelos elegidos para cada idioma y cuántos textos de cada
+    idioma se recibieron y a qué modelos se enviaron desde el arranque.
+    """
+    return ai_analyzer.routing_stats()
+
+
 @router.get("/info/{model_name:path}")
 async def get_model_info(model_name: str):
     """
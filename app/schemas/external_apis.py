@@ -41,6 +41,10 @@ class MultiAPIRequest(BaseModel):
         default=["all"],
         description="APIs a usar: google, claimbuster, wordlift, mbfc, rapidapi, o 'all'"
     )
+    max_claims: Optional[int] = Field(
+        None, ge=1, le=10,
+        description="Oraciones verificables a consultar en Google (default: CLAIM_TOP_K)"
+    )
 
 
 class APIStatus(BaseModel):
@@ -51,6 +55,7 @@ class APIStatus(BaseModel):
     mbfc: bool
     rapidapi: bool
     configured_apis: List[str]
+    quotas: Dict[str, Dict[str, Any]] = {}  # Presupuesto restante por proveedor
 
 
 class FactCheckResult(BaseModel):
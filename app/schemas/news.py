@@ -69,6 +69,10 @@ class AnalysisResult(BaseModel):
     feature_analysis: Optional[dict] = Field(default=None, description="Análisis de características del texto")
     combined_score: Optional[float] = Field(default=None, ge=0.0, le=1.0, description="Score combinado (IA + características)")
     warnings: Optional[list] = Field(default=None, description="Advertencias detectadas en el texto")
+    near_duplicate: Optional[dict] = Field(default=None, description="Análisis previo casi idéntico (id, similitud, si se reutilizó su veredicto)")
+    inference: Optional[dict] = Field(default=None, description="Modo de inferencia, modelos invocados y latencia de cada uno")
+    source_reputation: Optional[dict] = Field(default=None, description="Sesgo y credibilidad (MBFC) del dominio de la URL analizada")
+    fact_checks: Optional[dict] = Field(default=None, description="Resultados de las APIs de fact-checking (con fact_check=true)")
     
     class Config:
         from_attributes = True
@@ -84,11 +88,45 @@ class AnalysisMetricsResponse(BaseModel):
         from_attributes = True
 
 class DetailedAnalysisResult(AnalysisResult):
-    content: str
+    content: Optional[str] = None  # None si se pidió include_content=false
     source_url: Optional[str]
     file_name: Optional[str]
+    near_duplicate_of: Optional[int] = None
     metrics: Optional[AnalysisMetricsResponse]
 
+# Schemas para el listado paginado de análisis
+class AnalysisListItem(BaseModel):
+    id: int
+    score: float
+    label: AnalysisLabel
+    confidence: float
+    model_version: str
+    analysis_time_ms: Optional[int]
+    content_length: int
+    source_type: SourceType
+    source_url: Optional[str]
+    file_name: Optional[str]
+    created_at: datetime
+    content: Optional[str] = None  # Solo si se pide include_content=true
+    
+    class Config:
+        from_attributes = True
+
+class AnalysisListResponse(BaseModel):
+    items: list[AnalysisListItem]
+    limit: int
+    has_more: bool
+    next_cursor: Optional[str] = Field(default=None, description="Cursor opaco para pedir la siguiente página")
+
+class AnalysisSearchItem(AnalysisListItem):
+    rank: float = Field(..., description="Relevancia (ts_rank en PostgreSQL, -bm25 en SQLite)")
+
+class AnalysisSearchResponse(BaseModel):
+    query: str
+    items: list[AnalysisSearchItem]
+    limit: int
+    offset: int
+
 # Schemas para métricas y estadísticas
 class SummaryMetrics(BaseModel):
     total_analyses: int
@@ -129,6 +167,8 @@ class HealthResponse(BaseModel):
     timestamp: datetime
     version: str = "1.0.0"
     uptime_seconds: Optional[int]
+    last_checked: Optional[datetime] = None  # Momento del último chequeo en background
+    checks: Optional[dict] = None  # Detalle por chequeo (ok, duración, error)
 
 # Schema para registro de modelos
 class ModelRegistryResponse(BaseModel):
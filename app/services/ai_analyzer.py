@@ -1,67 +1,648 @@
 ﻿import asyncio
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple, Union
 from enum import Enum
 import time # <-- 1. Importar el módulo 'time'
 
 import aiohttp
 from app.config import settings
+from app.services.model_performance import model_performance
+from app.utils.language_detector import language_detector
+from app.utils.model_manager import model_manager
 
 logger = logging.getLogger(__name__)
 
+class ModelSwapError(Exception):
+    """No se pudo cambiar el modelo activo"""
+
+class ModelSwapInProgress(ModelSwapError):
+    """Ya hay un cambio de modelo en curso"""
+
 class FakeNewsLabel(Enum):
     FAKE = "FAKE"
     REAL = "REAL"
     UNCERTAIN = "UNCERTAIN"
 
+def label_for_score(combined_score: float) -> FakeNewsLabel:
+    """Label final a partir del score combinado (modelo + características)"""
+    if combined_score < 0.35:
+        return FakeNewsLabel.FAKE
+    if combined_score > 0.65:
+        return FakeNewsLabel.REAL
+    return FakeNewsLabel.UNCERTAIN
+
+@dataclass
+class ModelInvocation:
+    """Resultado de una llamada a un modelo dentro de la cascada o ensemble"""
+    model: str
+    latency_ms: int
+    status: str  # 'ok' o 'error'
+    score: Optional[float] = None
+    label: Optional[FakeNewsLabel] = None
+    confidence: Optional[float] = None
+
+@dataclass
+class InferenceResult:
+    """Veredicto final del modelo junto con los modelos invocados"""
+    score: float
+    label: FakeNewsLabel
+    confidence: float
+    analysis_time_ms: int
+    model_version: str
+    mode: str
+    invocations: List[ModelInvocation] = field(default_factory=list)
+    language: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "language": self.language,
+            "decided_by": self.model_version,
+            "models": [
+                {
+                    "model": inv.model,
+                    "status": inv.status,
+                    "score": round(inv.score, 4) if inv.score is not None else None,
+                    "confidence": round(inv.confidence, 4) if inv.confidence is not None else None,
+                    "latency_ms": inv.latency_ms,
+                }
+                for inv in self.invocations
+            ],
+        }
+
+@dataclass
+class _LoadingState:
+    """Modelo frío en HF: las requests esperan el mismo evento"""
+    ready_at: float  # time.monotonic() estimado en que el modelo estará cargado
+    event: asyncio.Event = field(default_factory=asyncio.Event)
+    task: Optional[asyncio.Task] = None
+
 class AIAnalyzer:
     def __init__(self):
         self.is_loaded = True  # Siempre disponible
-        self.model_name = settings.HF_MODEL_NAME
-        self.api_url = f"{settings.HF_API_URL}{self.model_name}"
+        
+        # Modelo activo como (nombre, URL): se reemplaza entero en swap_model,
+        # así una request nunca mezcla el nombre de un modelo con la URL de otro
+        self._active: Tuple[str, str] = (settings.HF_MODEL_NAME, f"{settings.HF_API_URL}{settings.HF_MODEL_NAME}")
+        self._in_flight = 0
+        self._admit = asyncio.Event()    # Cerrado mientras se drena para un cambio de modelo
+        self._admit.set()
+        self._drained = asyncio.Event()  # Activo cuando no hay inferencias en curso
+        self._drained.set()
+        self._swap_lock = asyncio.Lock()
+        
+        # Modelos fríos (503 "loading" de HF) y tarea de keep-warm
+        self._loading: Dict[str, _LoadingState] = {}
+        self.loading_counts: Dict[str, int] = defaultdict(int)
+        self._keep_warm_task: Optional[asyncio.Task] = None
+        
+        # Modo de inferencia: 'single', 'cascade' o 'ensemble'
+        self.mode = settings.AI_INFERENCE_MODE
+        self.cascade_models = settings.AI_CASCADE_MODELS
+        self.ensemble_models = settings.AI_ENSEMBLE_MODELS or settings.AI_CASCADE_MODELS
+        self.uncertainty_band = (settings.AI_CASCADE_BAND_LOW, settings.AI_CASCADE_BAND_HIGH)
+        
+        # Ruteo por idioma: modelo (single) y lista (cascade/ensemble) por idioma.
+        # Sin configuración explícita se usan los modelos registrados del idioma
+        self.language_routing = settings.LANGUAGE_ROUTING_ENABLED
+        self.language_models = {"es": settings.AI_MODEL_ES, "en": settings.AI_MODEL_EN}
+        self.language_cascades = {"es": settings.AI_CASCADE_MODELS_ES, "en": settings.AI_CASCADE_MODELS_EN}
+        self.routing_counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
         
         self.headers = {"Content-Type": "application/json"}
         if settings.HF_API_TOKEN:
             self.headers["Authorization"] = f"Bearer {settings.HF_API_TOKEN}"
     
+    @property
+    def model_name(self) -> str:
+        return self._active[0]
+    
+    @property
+    def api_url(self) -> str:
+        return self._active[1]
+    
     async def initialize(self):
-        """Mantenido para compatibilidad, pero ya no necesario"""
+        """Lanza el keep-warm: pinga al arrancar y cada HF_KEEP_WARM_INTERVAL los modelos en uso"""
         self.is_loaded = True
+        if settings.HF_KEEP_WARM_INTERVAL > 0 and (self._keep_warm_task is None or self._keep_warm_task.done()):
+            self._keep_warm_task = asyncio.create_task(self._keep_warm_loop())
     
     async def analyze_text(self, text: str) -> Tuple[float, FakeNewsLabel, float, int]:
+        result = await self.infer(text)
+        return result.score, result.label, result.confidence, result.analysis_time_ms
+    
+    async def infer(self, text: str) -> InferenceResult:
+        """
+        Clasifica el texto según el modo configurado.
+        
+        - single: solo el modelo actual (HF_MODEL_NAME)
+        - cascade: los modelos de AI_CASCADE_MODELS en orden (del más barato
+          al más pesado); se escala al siguiente solo si el score cae dentro
+          de la banda de incertidumbre
+        - ensemble: los modelos de AI_ENSEMBLE_MODELS en paralelo, promediados
+        """
+        # Durante un cambio de modelo las nuevas requests esperan al commit
+        await self._admit.wait()
+        self._in_flight += 1
+        self._drained.clear()
+        try:
+            return await self._infer(text, self.model_name)
+        finally:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._drained.set()
+    
+    async def infer_batch(self, texts: List[str]) -> List[InferenceResult]:
+        """
+        Clasifica varios textos con el modo configurado, enviando a cada
+        modelo todos los textos que le tocan en una sola llamada (`inputs`
+        como lista). Pensado para procesamiento offline: el resultado de cada
+        texto es el mismo que daría infer().
+        """
+        await self._admit.wait()
+        self._in_flight += 1
+        self._drained.clear()
+        try:
+            return await self._infer_batch(texts, self.model_name)
+        finally:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._drained.set()
+    
+    async def _infer(self, text: str, current_model: str) -> InferenceResult:
         start_time = time.time()
+        # Plazo compartido por todos los modelos invocados (incluye esperas por modelos fríos)
+        deadline = time.monotonic() + settings.AI_REQUEST_DEADLINE
+        cleaned_text = text.strip()[:500] if text else "empty"
+        invocations: List[ModelInvocation] = []
+        language = self.detect_language(cleaned_text)
 
         try:
-            cleaned_text = text.strip()[:500] if text else "empty"
-            api_result = await self._call_api(cleaned_text)
-            
-            if api_result:
-                score, label, confidence = self._process_result(api_result)
+            if self.mode == "cascade" and self.cascade_models:
+                invocations = await self._run_cascade(
+                    cleaned_text, self._route_models(language, self.cascade_models), deadline
+                )
+            elif self.mode == "ensemble" and self.ensemble_models:
+                invocations = await self._run_ensemble(
+                    cleaned_text, self._route_models(language, self.ensemble_models), deadline
+                )
             else:
-                score, label, confidence = self._fallback_analysis(cleaned_text)
-                
+                model = self._route_model(language, current_model)
+                invocations = [await self._invoke(model, cleaned_text, deadline)]
         except Exception as e:
+            logger.error(f"Error en inferencia: {e}")
+            return self._result(cleaned_text, None, current_model, language, start_time)
+
+        return self._result(cleaned_text, invocations, current_model, language, start_time)
+    
+    async def _infer_batch(self, texts: List[str], current_model: str) -> List[InferenceResult]:
+        start_time = time.time()
+        deadline = time.monotonic() + settings.AI_REQUEST_DEADLINE
+        cleaned = [text.strip()[:500] if text else "empty" for text in texts]
+        languages = [self.detect_language(text) for text in cleaned]
+        
+        if self.mode == "cascade" and self.cascade_models:
+            plans = [self._route_models(language, self.cascade_models) for language in languages]
+        elif self.mode == "ensemble" and self.ensemble_models:
+            plans = [self._route_models(language, self.ensemble_models) for language in languages]
+        else:
+            plans = [[self._route_model(language, current_model)] for language in languages]
+        invocations: List[List[ModelInvocation]] = [[] for _ in texts]
+        
+        try:
+            if self.mode == "ensemble" and self.ensemble_models:
+                # Todos los modelos del plan de cada texto, en paralelo
+                await self._invoke_groups(cleaned, plans, invocations, None, deadline)
+            else:
+                # Cascada por pasos: en cada paso solo siguen los textos inciertos
+                pending = list(range(len(texts)))
+                step = 0
+                while pending:
+                    await self._invoke_groups(cleaned, plans, invocations, (pending, step), deadline)
+                    step += 1
+                    pending = [
+                        i for i in pending
+                        if step < len(plans[i])
+                        and not (invocations[i][-1].status == "ok" and not self._is_uncertain(invocations[i][-1].score))
+                    ]
+        except Exception as e:
+            logger.error(f"Error en inferencia por lotes: {e}")
+            return [self._result(text, None, current_model, language, start_time) for text, language in zip(cleaned, languages)]
+        
+        return [
+            self._result(text, text_invocations, current_model, language, start_time)
+            for text, text_invocations, language in zip(cleaned, invocations, languages)
+        ]
+    
+    async def _invoke_groups(
+        self, texts: List[str], plans: List[List[str]], invocations: List[List[ModelInvocation]],
+        step: Optional[Tuple[List[int], int]], deadline: float
+    ):
+        """
+        Agrupa los textos por modelo y hace una llamada por grupo. Con step
+        (índices, paso) cada texto usa el modelo de ese paso de su plan; sin
+        step, todos los modelos de su plan.
+        """
+        groups: Dict[str, List[int]] = defaultdict(list)
+        if step is None:
+            for i, plan in enumerate(plans):
+                for model in plan:
+                    groups[model].append(i)
+        else:
+            indices, position = step
+            for i in indices:
+                groups[plans[i][position]].append(i)
+        
+        models = list(groups)
+        results = await asyncio.gather(*(
+            self._invoke_batch(model, [texts[i] for i in groups[model]], deadline) for model in models
+        ))
+        for model, batch in zip(models, results):
+            for i, invocation in zip(groups[model], batch):
+                invocations[i].append(invocation)
+    
+    def _result(
+        self, cleaned_text: str, invocations: Optional[List[ModelInvocation]],
+        current_model: str, language: Optional[str], start_time: float
+    ) -> InferenceResult:
+        """Veredicto final a partir de los modelos invocados (None si la inferencia falló)"""
+        model_version = current_model
+        if invocations is None:
+            invocations = []
             score, label, confidence = (0.5, FakeNewsLabel.UNCERTAIN, 0.5)
+        else:
+            self._count_routing(language, invocations)
+            succeeded = [inv for inv in invocations if inv.status == "ok"]
+            if not succeeded:
+                score, label, confidence = self._fallback_analysis(cleaned_text)
+            elif self.mode == "ensemble" and len(invocations) > 1:
+                score, label, confidence = self._combine(succeeded)
+                short_names = (inv.model.rsplit("/", 1)[-1] for inv in succeeded)
+                model_version = ("ensemble:" + "+".join(short_names))[:100]
+            else:
+                decided = succeeded[-1]
+                score, label, confidence = decided.score, decided.label, decided.confidence
+                model_version = decided.model
 
-        end_time = time.time() # <-- 3. Registrar el tiempo de finalización
-        analysis_time_ms = int((end_time - start_time) * 1000) # Calcular duración en ms
+        analysis_time_ms = int((time.time() - start_time) * 1000)
+        mode = self.mode if self.mode in ("cascade", "ensemble") else "single"
+        return InferenceResult(
+            score, label, confidence, analysis_time_ms, model_version, mode, invocations, language
+        )
+    
+    # --- Ruteo por idioma ---------------------------------------------------
+    
+    def detect_language(self, text: str) -> Optional[str]:
+        """Idioma del texto ('es'/'en') o None si la detección no es confiable"""
+        if not self.language_routing:
+            return None
+        language, confidence = language_detector.detect(text)
+        if confidence < settings.LANGUAGE_MIN_CONFIDENCE:
+            return None
+        return language
+    
+    @staticmethod
+    def _model_language(model: str) -> Optional[str]:
+        """Idioma de un modelo registrado ('es'/'en'), o None si es desconocido"""
+        return {"Spanish": "es", "English": "en"}.get(model_manager.get_model_info(model)["language"])
+    
+    @staticmethod
+    def _registered_models(language: str) -> List[str]:
+        if language == "es":
+            return model_manager.get_spanish_models()
+        if language == "en":
+            return model_manager.get_english_models()
+        return []
+    
+    def _route_model(self, language: Optional[str], current_model: Optional[str] = None) -> str:
+        """Modelo para el modo single: el configurado para el idioma, el actual si lo soporta o el primero registrado"""
+        current_model = current_model or self.model_name
+        if language is None:
+            return current_model
+        configured = self.language_models.get(language)
+        if configured:
+            return configured
+        if self._model_language(current_model) in (language, None):
+            return current_model
+        registered = self._registered_models(language)
+        return registered[0] if registered else current_model
+    
+    def _route_models(self, language: Optional[str], models: List[str]) -> List[str]:
+        """Lista para cascade/ensemble: la del idioma o la general sin los modelos de otro idioma"""
+        if language is None:
+            return models
+        configured = self.language_cascades.get(language)
+        if configured:
+            return configured
+        compatible = [model for model in models if self._model_language(model) in (language, None)]
+        return compatible or self._registered_models(language) or models
+    
+    def _count_routing(self, language: Optional[str], invocations: List[ModelInvocation]):
+        counts = self.routing_counts[language or "unknown"]
+        counts["texts"] += 1
+        for invocation in invocations:
+            counts[invocation.model] += 1
+    
+    def routing_stats(self) -> Dict[str, Any]:
+        """Configuración del ruteo por idioma y decisiones tomadas desde el arranque"""
+        return {
+            "enabled": self.language_routing,
+            "min_confidence": settings.LANGUAGE_MIN_CONFIDENCE,
+            "models": {
+                language: (
+                    self._route_models(language, self.cascade_models if self.mode == "cascade" else self.ensemble_models)
+                    if self.mode in ("cascade", "ensemble") else [self._route_model(language)]
+                )
+                for language in ("es", "en")
+            },
+            "decisions": {
+                language: {
+                    "texts": counts.get("texts", 0),
+                    "models": {model: count for model, count in counts.items() if model != "texts"},
+                }
+                for language, counts in self.routing_counts.items()
+            },
+        }
+    
+    def _is_uncertain(self, score: float) -> bool:
+        low, high = self.uncertainty_band
+        return low <= score <= high
+    
+    async def _invoke(self, model: str, text: str, deadline: Optional[float] = None) -> ModelInvocation:
+        """Llama a un modelo y mide la latencia que agrega"""
+        start = time.time()
+        api_result = await self._call_api(text, model, deadline)
+        latency_ms = int((time.time() - start) * 1000)
+        model_performance.record(model, latency_ms, ok=bool(api_result))
+        if not api_result:
+            return ModelInvocation(model=model, latency_ms=latency_ms, status="error")
+        score, label, confidence = self._process_result(api_result)
+        return ModelInvocation(
+            model=model, latency_ms=latency_ms, status="ok",
+            score=score, label=label, confidence=confidence
+        )
+    
+    async def _invoke_batch(self, model: str, texts: List[str], deadline: Optional[float] = None) -> List[ModelInvocation]:
+        """Una llamada al modelo con varios textos; la latencia es la de la llamada completa"""
+        start = time.time()
+        api_result = await self._call_api(texts, model, deadline)
+        latency_ms = int((time.time() - start) * 1000)
+        # Una respuesta por texto, cada una con la lista de labels
+        ok = bool(api_result) and len(api_result) == len(texts) and all(isinstance(item, list) for item in api_result)
+        model_performance.record(model, latency_ms, ok=ok)
+        if not ok:
+            return [ModelInvocation(model=model, latency_ms=latency_ms, status="error") for _ in texts]
+        invocations = []
+        for item in api_result:
+            score, label, confidence = self._process_result([item])
+            invocations.append(ModelInvocation(
+                model=model, latency_ms=latency_ms, status="ok",
+                score=score, label=label, confidence=confidence
+            ))
+        return invocations
+    
+    async def _run_cascade(self, text: str, models: List[str], deadline: Optional[float] = None) -> List[ModelInvocation]:
+        invocations = []
+        for model in models:
+            invocation = await self._invoke(model, text, deadline)
+            invocations.append(invocation)
+            if invocation.status == "ok" and not self._is_uncertain(invocation.score):
+                break
+        return invocations
+    
+    async def _run_ensemble(self, text: str, models: List[str], deadline: Optional[float] = None) -> List[ModelInvocation]:
+        return list(await asyncio.gather(
+            *(self._invoke(model, text, deadline) for model in models)
+        ))
+    
+    def _combine(self, invocations: List[ModelInvocation]) -> Tuple[float, FakeNewsLabel, float]:
+        """Promedia los scores del ensemble y deriva el label del promedio"""
+        score = sum(inv.score for inv in invocations) / len(invocations)
+        confidence = sum(inv.confidence for inv in invocations) / len(invocations)
+        if self._is_uncertain(score):
+            label = FakeNewsLabel.UNCERTAIN
+        elif score > 0.5:
+            label = FakeNewsLabel.REAL
+        else:
+            label = FakeNewsLabel.FAKE
+        return score, label, confidence
+    
+    async def _call_api(
+        self, text: Union[str, List[str]], model: Optional[str] = None, deadline: Optional[float] = None
+    ) -> Optional[List[Any]]:
+        """
+        Llama al modelo (por defecto el activo). Con una lista de textos HF
+        devuelve una lista de resultados, uno por texto.
         
-        return score, label, confidence, analysis_time_ms # <-- 4. Devolver los 4 valores
+        Si HF responde 503 "loading", el modelo queda marcado como frío y la
+        request espera, junto con las demás, a que un único probe confirme
+        que cargó; solo si eso ocurre antes de `deadline` (time.monotonic())
+        se reintenta. Sin deadline no se espera.
+        """
+        model = model or self.model_name
+        while True:
+            if self._loading.get(model) is not None and not await self._wait_until_loaded(model, deadline):
+                return None
+            status, data = await self._post(model, text)
+            if status == 200 and data is not None:
+                # La API de HF puede devolver un dict en lugar de una lista de dicts
+                return data if isinstance(data, list) else [data]
+            estimated_time = self._loading_estimate(status, data)
+            if estimated_time is None:
+                return None
+            self._mark_loading(model, estimated_time)
+            if deadline is None:
+                return None
     
-    async def _call_api(self, text: str) -> Optional[List[Dict[str, Any]]]:
+    async def _post(self, model: str, text: Union[str, List[str]]) -> Tuple[Optional[int], Any]:
+        """POST a la Inference API; devuelve (status, JSON) o (None, None) si falla la conexión"""
         try:
             payload = {"inputs": text}
             timeout = aiohttp.ClientTimeout(total=30, connect=10)
             # Crear sesión nueva para cada llamada (compatibilidad serverless)
             async with aiohttp.ClientSession(timeout=timeout, headers=self.headers) as session:
-                async with session.post(self.api_url, json=payload) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        # La API de HF puede devolver un dict en lugar de una lista de dicts
-                        return data if isinstance(data, list) else [data]
-                    return None
+                async with session.post(f"{settings.HF_API_URL}{model}", json=payload) as response:
+                    try:
+                        data = await response.json(content_type=None)
+                    except Exception:
+                        data = None
+                    return response.status, data
         except Exception:
+            return None, None
+    
+    # --- Modelos fríos (503 loading) -----------------------------------------
+    
+    @staticmethod
+    def _loading_estimate(status: Optional[int], data: Any) -> Optional[float]:
+        """Segundos estimados de carga si la respuesta es un 503 "loading", si no None"""
+        if status != 503 or not isinstance(data, dict):
+            return None
+        if "estimated_time" not in data and "loading" not in str(data.get("error", "")).lower():
             return None
+        try:
+            return float(data.get("estimated_time", settings.HF_LOADING_DEFAULT_WAIT))
+        except (TypeError, ValueError):
+            return settings.HF_LOADING_DEFAULT_WAIT
+    
+    def _mark_loading(self, model: str, estimated_time: float):
+        """Registra el modelo como frío y lanza el único probe que lo vigila"""
+        ready_at = time.monotonic() + max(estimated_time, settings.HF_LOADING_MIN_WAIT)
+        state = self._loading.get(model)
+        if state is not None:
+            state.ready_at = max(state.ready_at, ready_at)
+            return
+        self.loading_counts["cold_detected"] += 1
+        logger.info(f"Modelo {model} cargando en HF (estimated_time={estimated_time:.0f}s)")
+        state = _LoadingState(ready_at=ready_at)
+        self._loading[model] = state
+        state.task = asyncio.create_task(self._probe_until_loaded(model, state))
+    
+    async def _probe_until_loaded(self, model: str, state: _LoadingState):
+        """Espera el estimated_time y vuelve a probar; despierta a las requests al cargar"""
+        try:
+            while True:
+                await asyncio.sleep(max(0.0, state.ready_at - time.monotonic()))
+                self.loading_counts["probes"] += 1
+                status, data = await self._post(model, "warmup")
+                estimated_time = self._loading_estimate(status, data)
+                if estimated_time is None:
+                    break
+                state.ready_at = time.monotonic() + max(estimated_time, settings.HF_LOADING_MIN_WAIT)
+        finally:
+            self._loading.pop(model, None)
+            state.event.set()
+    
+    async def _wait_until_loaded(self, model: str, deadline: Optional[float]) -> bool:
+        """Espera a que el modelo cargue; False si no cargará antes del deadline"""
+        state = self._loading.get(model)
+        if state is None:
+            return True
+        if deadline is None or state.ready_at > deadline:
+            self.loading_counts["skipped"] += 1
+            return False
+        self.loading_counts["parked"] += 1
+        try:
+            await asyncio.wait_for(state.event.wait(), timeout=max(0.0, deadline - time.monotonic()))
+            return True
+        except asyncio.TimeoutError:
+            self.loading_counts["deadline_exceeded"] += 1
+            return False
+    
+    def models_in_use(self) -> List[str]:
+        """Modelos a los que puede rutearse una request con la configuración actual"""
+        models = {self.model_name}
+        if self.mode in ("cascade", "ensemble"):
+            base = self.cascade_models if self.mode == "cascade" else self.ensemble_models
+            for language in (None, "es", "en"):
+                models.update(self._route_models(language, base))
+        elif self.language_routing:
+            models.update(self._route_model(language) for language in ("es", "en"))
+        return sorted(models)
+    
+    async def keep_warm(self) -> Dict[str, bool]:
+        """Pinga los modelos en uso para que HF los cargue o los mantenga cargados"""
+        models = self.models_in_use()
+        results = await asyncio.gather(*(self._call_api("keep warm", model) for model in models))
+        return {model: result is not None for model, result in zip(models, results)}
+    
+    async def _keep_warm_loop(self):
+        while True:
+            try:
+                warm = await self.keep_warm()
+                cold = [model for model, ok in warm.items() if not ok]
+                if cold:
+                    logger.info(f"Keep-warm: modelos sin respuesta {cold}")
+            except Exception as e:
+                logger.error(f"Error en keep-warm: {e}")
+            await asyncio.sleep(settings.HF_KEEP_WARM_INTERVAL)
+    
+    def loading_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "cold_models": {
+                model: round(max(0.0, state.ready_at - now), 1) for model, state in self._loading.items()
+            },
+            **self.loading_counts,
+        }
+    
+    # --- Cambio de modelo -----------------------------------------------------
+    
+    async def warmup(self, model: str) -> Tuple[bool, int, int]:
+        """
+        Llama al modelo hasta que responda o venza MODEL_SWAP_WARMUP_TIMEOUT.
+        
+        Returns:
+            (respondió, latencia total en ms, intentos)
+        """
+        start = time.monotonic()
+        deadline = start + settings.MODEL_SWAP_WARMUP_TIMEOUT
+        attempts = 0
+        while True:
+            attempts += 1
+            # Si el modelo está frío, _call_api espera su carga dentro del deadline
+            if await self._call_api("warmup", model, deadline):
+                return True, int((time.monotonic() - start) * 1000), attempts
+            if time.monotonic() + settings.MODEL_SWAP_WARMUP_RETRY_DELAY > deadline:
+                return False, int((time.monotonic() - start) * 1000), attempts
+            await asyncio.sleep(settings.MODEL_SWAP_WARMUP_RETRY_DELAY)
+    
+    async def swap_model(self, model: str, force: bool = False) -> Dict[str, Any]:
+        """
+        Cambia el modelo activo de forma atómica.
+        
+        1. Calienta el modelo nuevo (si no responde se aborta, salvo force)
+        2. Deja de admitir inferencias nuevas y espera a que terminen las
+           que están en curso (hasta MODEL_SWAP_DRAIN_TIMEOUT)
+        3. Reemplaza nombre y URL juntos y vuelve a admitir inferencias
+        """
+        if self._swap_lock.locked():
+            raise ModelSwapInProgress("Ya hay un cambio de modelo en curso")
+        
+        async with self._swap_lock:
+            previous = self.model_name
+            
+            warmed, warmup_ms, attempts = await self.warmup(model)
+            if not warmed and not force:
+                raise ModelSwapError(
+                    f"El modelo {model} no respondió al warmup ({attempts} intentos, {warmup_ms} ms)"
+                )
+            
+            self._admit.clear()
+            drain_start = time.time()
+            try:
+                try:
+                    await asyncio.wait_for(self._drained.wait(), timeout=settings.MODEL_SWAP_DRAIN_TIMEOUT)
+                    drained = True
+                except asyncio.TimeoutError:
+                    drained = False
+                    logger.warning(
+                        f"Cambio de modelo: {self._in_flight} inferencias siguen en curso tras el drenado; "
+                        "terminarán con el modelo anterior"
+                    )
+                remaining = self._in_flight
+                self._active = (model, f"{settings.HF_API_URL}{model}")
+                settings.HF_MODEL_NAME = model
+            finally:
+                self._admit.set()
+            
+            logger.info(f"Modelo cambiado: {previous} -> {model}")
+            return {
+                "previous_model": previous,
+                "new_model": model,
+                "warmup": {"ok": warmed, "latency_ms": warmup_ms, "attempts": attempts},
+                "drain": {
+                    "drained": drained,
+                    "waited_ms": int((time.time() - drain_start) * 1000),
+                    "remaining_in_flight": remaining,
+                },
+            }
+    
+    async def ping(self) -> bool:
+        """Verifica que el endpoint de inferencia responda (usado por los health checks)"""
+        result = await self._call_api("health check")
+        return result is not None
     
     def _process_result(self, result: List[Dict[str, Any]]) -> Tuple[float, FakeNewsLabel, float]:
         try:
@@ -107,15 +688,30 @@ class AIAnalyzer:
             return (0.5, FakeNewsLabel.UNCERTAIN, 0.6)
     
     async def get_model_info(self) -> Dict[str, Any]:
-        return {
+        info = {
             "model_name": self.model_name,
             "is_loaded": self.is_loaded,
             "version": "2.0.0",
-            "type": "external_api"
+            "type": "external_api",
+            "mode": self.mode
         }
+        if self.mode == "cascade":
+            info["models"] = self.cascade_models
+            info["uncertainty_band"] = list(self.uncertainty_band)
+        elif self.mode == "ensemble":
+            info["models"] = self.ensemble_models
+        info["language_routing"] = self.language_routing
+        info["loading"] = self.loading_stats()
+        return info
     
     async def cleanup(self):
-        # No hay sesión persistente para limpiar
-        pass
+        # No hay sesión persistente: solo se cancelan el keep-warm y los probes
+        tasks = [self._keep_warm_task] + [state.task for state in self._loading.values()]
+        for task in tasks:
+            if task is not None and not task.done():
+                task.cancel()
+        await asyncio.gather(*(task for task in tasks if task is not None), return_exceptions=True)
+        self._keep_warm_task = None
+        self._loading.clear()
 
 ai_analyzer = AIAnalyzer()
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""
+Detalle de un análisis (GET /analyze/{analysis_id}).
+
+El análisis, sus métricas, sus fact-checks y, si se pide, el texto
+comprimido se leen en una sola consulta con joins.
+
+Un análisis no cambia después de creado, salvo por los fact-checks rezagados
+que fact_check_enrichment guarda hasta ENRICHMENT_LATE_TIMEOUT después. Pasado
+ese plazo el detalle es definitivo: se guarda en un LRU en memoria y se sirve
+con Cache-Control de larga duración. Los análisis más recientes se leen
+siempre de la BD y se sirven con no-cache (el cliente revalida con el ETag).
+"""
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.config import settings
+from app.config_apis import api_config
+from app.models.news import AnalysisContent, FactCheckResult, NewsAnalysis
+from app.schemas.news import AnalysisLabel, DetailedAnalysisResult, SourceType
+from app.services.content_store import content_store
+from app.utils.responses import etag_for
+
+logger = logging.getLogger(__name__)
+
+# Margen sobre ENRICHMENT_LATE_TIMEOUT para que termine de guardarse el último rezagado
+SETTLE_MARGIN_SECONDS = 30
+
+FIELDS = frozenset(DetailedAnalysisResult.model_fields)
+
+
+@dataclass
+class AnalysisDetail:
+    """Detalle armado, con el cuerpo JSON completo y su ETag ya calculados"""
+    result: DetailedAnalysisResult
+    final: bool  # Ya no puede cambiar
+    body: bytes
+    etag: str
+
+    def render(self, fields: Optional[Set[str]] = None) -> Tuple[bytes, str]:
+        """Cuerpo JSON y ETag, con todos los campos o solo los de `fields`"""
+        if fields is None:
+            return self.body, self.etag
+        body = self.result.__pydantic_serializer__.to_json(self.result, include=fields)
+        return body, etag_for(body)
+
+    @property
+    def cache_control(self) -> str:
+        if self.final:
+            return f"public, max-age={settings.ANALYSIS_CACHE_MAX_AGE}, immutable"
+        return "no-cache"
+
+
+class AnalysisDetails:
+    """Lectura del detalle de análisis con un LRU de los más consultados"""
+
+    def __init__(self):
+        self.cache_size = settings.ANALYSIS_CACHE_SIZE
+        # Clave: (analysis_id, con texto)
+        self._hot: "OrderedDict[Tuple[int, bool], AnalysisDetail]" = OrderedDict()
+        self.stats = {"hot_hits": 0, "db_loads": 0}
+
+    async def get(self, db: AsyncSession, analysis_id: int, with_content: bool = True) -> Optional[AnalysisDetail]:
+        """Detalle del análisis (None si no existe); con with_content=False no se lee el texto"""
+        key = (analysis_id, with_content)
+        detail = self._hot.get(key)
+        if detail is not None:
+            self._hot.move_to_end(key)
+            self.stats["hot_hits"] += 1
+            return detail
+
+        detail = await self._load(db, analysis_id, with_content)
+        self.stats["db_loads"] += 1
+        if detail is not None and detail.final and self.cache_size > 0:
+            self._hot[key] = detail
+            while len(self._hot) > self.cache_size:
+                self._hot.popitem(last=False)
+        return detail
+
+    def status(self) -> Dict[str, Any]:
+        return {"cached": len(self._hot), "cache_size": self.cache_size, **self.stats}
+
+    # --- Internos -----------------------------------------------------------
+
+    async def _load(self, db: AsyncSession, analysis_id: int, with_content: bool) -> Optional[AnalysisDetail]:
+        query = (
+            select(NewsAnalysis)
+            .options(joinedload(NewsAnalysis.metrics), joinedload(NewsAnalysis.fact_check_results))
+            .where(NewsAnalysis.id == analysis_id)
+        )
+        if with_content:
+            query = query.add_columns(AnalysisContent.compression, AnalysisContent.data).outerjoin(
+                AnalysisContent, AnalysisContent.content_hash == NewsAnalysis.content_hash
+            )
+
+        row = (await db.execute(query)).unique().first()
+        if row is None:
+            return None
+
+        analysis = row[0]
+        content = None
+        if with_content and row.data is not None:
+            try:
+                content = content_store.decompress(row.data, row.compression)
+            except Exception as e:
+                logger.error(f"Error descomprimiendo contenido {analysis.content_hash}: {e}")
+
+        result = self._build(analysis, content)
+        body = result.__pydantic_serializer__.to_json(result)
+        return AnalysisDetail(result=result, final=self._is_final(analysis.created_at), body=body, etag=etag_for(body))
+
+    @staticmethod
+    def _build(analysis: NewsAnalysis, content: Optional[str]) -> DetailedAnalysisResult:
+        metrics_data = None
+        if analysis.metrics:
+            metric = analysis.metrics[0]  # Debería haber solo una métrica por análisis
+            metrics_data = {
+                "word_count": metric.word_count,
+                "sentence_count": metric.sentence_count,
+                "readability_score": metric.readability_score,
+                "extraction_success": metric.extraction_success,
+                "extraction_method": metric.extraction_method
+            }
+
+        return DetailedAnalysisResult(
+            id=analysis.id,
+            score=analysis.score,
+            label=AnalysisLabel(analysis.label),
+            confidence=analysis.confidence,
+            model_version=analysis.model_version,
+            analysis_time_ms=analysis.analysis_time_ms,
+            content_length=analysis.content_length,
+            source_type=SourceType(analysis.source_type),
+            created_at=analysis.created_at,
+            content=content,
+            source_url=analysis.source_url,
+            file_name=analysis.file_name,
+            near_duplicate_of=analysis.near_duplicate_of,
+            metrics=metrics_data,
+            fact_checks=fact_check_fields(analysis.fact_check_results)
+        )
+
+    @staticmethod
+    def _is_final(created_at: Optional[datetime]) -> bool:
+        """Si ya pasó el plazo en que pueden guardarse fact-checks rezagados"""
+        if created_at is None:
+            return False
+        if created_at.tzinfo is None:
+            # SQLite guarda CURRENT_TIMESTAMP en UTC sin zona
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        settle = timedelta(seconds=api_config.ENRICHMENT_LATE_TIMEOUT + SETTLE_MARGIN_SECONDS)
+        return datetime.now(timezone.utc) - created_at > settle
+
+
+def fact_check_fields(rows: List[FactCheckResult]) -> Optional[dict]:
+    """Resultados guardados de las APIs de fact-checking, por proveedor"""
+    if not rows:
+        return None
+    # Orden fijo: el join no garantiza el de las filas y el ETag depende del cuerpo
+    rows = sorted(rows, key=lambda row: row.provider)
+    return {
+        row.provider: {
+            "success": row.success,
+            "latency_ms": row.latency_ms,
+            "late": row.late,
+            "reused_from": row.reused_from,
+            "result": json.loads(row.result),
+        }
+        for row in rows
+    }
+
+
+# Instancia global
+analysis_details = AnalysisDetails()
@@ -0,0 +1,353 @@
+"""
+Ingesta de lotes de artículos (POST /analyze/bulk).
+
+El archivo subido (JSONL, CSV o ZIP de textos) se copia a disco y se recorre
+en background con BulkReader. Los artículos pasan por el mismo análisis que
+/analyze (características en el pool de workers + modelo) con concurrencia
+acotada, y los resultados se guardan de a BULK_BATCH_SIZE por commit. Las
+colas entre lectura, análisis y escritura son acotadas: si el modelo o la
+base de datos van lentos la lectura se detiene, así la memoria no depende del
+tamaño del archivo. El progreso se consulta con GET /analyze/bulk/{id}.
+"""
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.news import AnalysisMetric, NewsAnalysis
+from app.schemas.news import SourceType
+from app.services.ai_analyzer import ai_analyzer, label_for_score
+from app.services.content_store import content_store
+from app.services.near_duplicate_index import near_duplicate_index
+from app.utils.bulk_readers import BulkItem, BulkReader
+from app.utils.near_duplicate import min_hasher
+from app.utils.security import security_utils
+from app.utils.text_analyzer import analyze_text, text_analyzer
+from app.utils.worker_pool import WorkerPoolError, worker_pool
+
+logger = logging.getLogger(__name__)
+
+# Ítems leídos por llamada al pool de I/O bloqueante
+_READ_CHUNK = 64
+# Errores de ítems que se guardan como muestra en el estado del lote
+_ERROR_SAMPLE = 20
+
+
+class BulkIngestionBusy(Exception):
+    """Ya hay BULK_MAX_RUNNING_JOBS lotes en curso"""
+
+
+@dataclass
+class AnalyzedItem:
+    """Artículo analizado, pendiente de guardar"""
+    item: BulkItem
+    content: str
+    combined_score: float
+    confidence: float
+    model_version: str
+    analysis_time_ms: int
+    signature: Optional[Tuple[int, ...]]
+
+
+@dataclass
+class BulkJob:
+    """Estado y progreso de un lote"""
+    id: str
+    filename: str
+    format: str
+    path: str
+    reader: Optional[BulkReader] = None
+    status: str = "queued"  # queued, running, completed, failed, cancelled
+    cancel_requested: bool = False
+    read: int = 0
+    analyzed: int = 0
+    stored: int = 0
+    failed: int = 0
+    batches: int = 0
+    first_analysis_id: Optional[int] = None
+    last_analysis_id: Optional[int] = None
+    error: Optional[str] = None
+    errors: Deque[Dict[str, str]] = field(default_factory=lambda: deque(maxlen=_ERROR_SAMPLE))
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    task: Optional[asyncio.Task] = None
+
+    def fail_item(self, ref: str, error: str):
+        self.failed += 1
+        self.errors.append({"ref": ref, "error": error})
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = 0.0
+        if self.started is not None:
+            elapsed = (self.finished or time.monotonic()) - self.started
+        progress = None
+        if self.reader is not None and self.reader.size:
+            progress = round(min(1.0, self.reader.position / self.reader.size), 4)
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "format": self.format,
+            "status": self.status,
+            "progress": 1.0 if self.status == "completed" else progress,
+            "read": self.read,
+            "analyzed": self.analyzed,
+            "stored": self.stored,
+            "failed": self.failed,
+            "in_flight": max(0, self.read - self.stored - self.failed),
+            "batches": self.batches,
+            "items_per_second": round(self.stored / elapsed, 2) if elapsed else 0.0,
+            "elapsed_seconds": round(elapsed, 2),
+            "first_analysis_id": self.first_analysis_id,
+            "last_analysis_id": self.last_analysis_id,
+            "error": self.error,
+            "errors": list(self.errors),
+            "created_at": self.created_at.isoformat(),
+        }
+
+
+def _next_chunk(items: Iterator[BulkItem], size: int) -> List[BulkItem]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            break
+    return chunk
+
+
+class BulkIngestion:
+    """Lotes en curso y recientes, con su pipeline lectura -> análisis -> escritura"""
+
+    def __init__(self):
+        self._jobs: "OrderedDict[str, BulkJob]" = OrderedDict()
+
+    def running(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.status in ("queued", "running"))
+
+    def start(self, path: str, filename: str, fmt: str) -> BulkJob:
+        """
+        Lanza en background el procesamiento del archivo ya copiado en path.
+        El archivo se borra al terminar.
+
+        Raises:
+            BulkIngestionBusy: si ya hay BULK_MAX_RUNNING_JOBS lotes en curso
+        """
+        if self.running() >= settings.BULK_MAX_RUNNING_JOBS:
+            raise BulkIngestionBusy(f"Hay {settings.BULK_MAX_RUNNING_JOBS} lotes en curso")
+
+        job = BulkJob(id=uuid.uuid4().hex, filename=filename, format=fmt, path=path)
+        self._jobs[job.id] = job
+        self._prune()
+        job.task = asyncio.create_task(self._run(job))
+        return job
+
+    def get(self, job_id: str) -> Optional[BulkJob]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[BulkJob]:
+        """
+        Deja de leer el archivo; los artículos ya leídos se terminan de
+        analizar y guardar, y lo ya guardado queda en la base de datos.
+        """
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.cancel_requested = True
+        return job
+
+    async def stop(self):
+        """Al apagar: los lotes en curso quedan cancelados"""
+        tasks = [job.task for job in self._jobs.values() if job.task is not None and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self.running(),
+            "max_running": settings.BULK_MAX_RUNNING_JOBS,
+            "jobs": [job.to_dict() for job in reversed(self._jobs.values())],
+        }
+
+    # --- Internos -----------------------------------------------------------
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.status not in ("queued", "running")]
+        for job_id in finished[:max(0, len(finished) - settings.BULK_JOBS_RETAINED)]:
+            del self._jobs[job_id]
+
+    async def _run(self, job: BulkJob):
+        concurrency = max(1, settings.BULK_CONCURRENCY)
+        batch_size = max(1, settings.BULK_BATCH_SIZE)
+        # Colas acotadas: la lectura espera si el análisis o la escritura se atrasan
+        items: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        analyzed: asyncio.Queue = asyncio.Queue(maxsize=batch_size)
+
+        job.status = "running"
+        job.started = time.monotonic()
+        workers = [asyncio.create_task(self._analyze_items(job, items, analyzed)) for _ in range(concurrency)]
+
+        async def close_analyzed():
+            await asyncio.gather(*workers)
+            await analyzed.put(None)
+
+        stages = [
+            asyncio.create_task(self._read(job, items, concurrency)),
+            asyncio.create_task(close_analyzed()),
+            asyncio.create_task(self._write(job, analyzed, batch_size)),
+        ]
+        try:
+            await asyncio.gather(*stages)
+            job.status = "cancelled" if job.cancel_requested else "completed"
+            logger.info(
+                f"Lote {job.id} ({job.filename}) {job.status}: {job.stored} guardados, "
+                f"{job.failed} fallidos en {time.monotonic() - job.started:.1f}s"
+            )
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = f"{type(e).__name__}: {e}"
+            logger.error(f"Lote {job.id} ({job.filename}) falló: {job.error}")
+        finally:
+            for task in stages + workers:
+                task.cancel()
+            await asyncio.gather(*stages, *workers, return_exceptions=True)
+            job.finished = time.monotonic()
+            try:
+                os.unlink(job.path)
+            except OSError:
+                pass
+
+    async def _read(self, job: BulkJob, items: asyncio.Queue, workers: int):
+        job.reader = BulkReader(job.path, job.format, settings.MAX_CONTENT_LENGTH)
+        iterator = iter(job.reader)
+        while not job.cancel_requested:
+            chunk = await worker_pool.run_blocking("bulk_read", _next_chunk, iterator, _READ_CHUNK)
+            if not chunk:
+                break
+            for item in chunk:
+                if job.cancel_requested:
+                    break
+                job.read += 1
+                if item.error:
+                    job.fail_item(item.ref, item.error)
+                else:
+                    await items.put(item)
+        for _ in range(workers):
+            await items.put(None)
+
+    async def _analyze_items(self, job: BulkJob, items: asyncio.Queue, analyzed: asyncio.Queue):
+        while True:
+            item = await items.get()
+            if item is None:
+                return
+            try:
+                result = await self._analyze(item)
+            except WorkerPoolError as e:
+                job.fail_item(item.ref, f"Pool de workers: {e}")
+                continue
+            except ValueError as e:
+                job.fail_item(item.ref, str(e))
+                continue
+            except Exception as e:
+                logger.error(f"Error analizando {item.ref} del lote {job.id}: {type(e).__name__}: {e}")
+                job.fail_item(item.ref, f"{type(e).__name__}: {e}")
+                continue
+            job.analyzed += 1
+            await analyzed.put(result)
+
+    async def _analyze(self, item: BulkItem) -> AnalyzedItem:
+        """Mismo análisis que /analyze, sin búsqueda de casi duplicados ni fact-checking"""
+        content = security_utils.sanitize_text(item.text)
+        if not security_utils.validate_content_length(content):
+            raise ValueError(f"Texto muy largo. Máximo {settings.MAX_CONTENT_LENGTH} caracteres.")
+        if len(content.strip()) < 10:
+            raise ValueError("Contenido insuficiente para análisis")
+
+        features = await worker_pool.run("text_features", analyze_text, content)
+        inference = await ai_analyzer.infer(content)
+        combined_score, _ = text_analyzer.get_recommendation(features, inference.score)
+        signature = min_hasher.signature(content) if settings.NEAR_DUPLICATE_ENABLED else None
+        return AnalyzedItem(
+            item=item,
+            content=content,
+            combined_score=combined_score,
+            confidence=inference.confidence,
+            model_version=inference.model_version,
+            analysis_time_ms=inference.analysis_time_ms,
+            signature=signature,
+        )
+
+    async def _write(self, job: BulkJob, analyzed: asyncio.Queue, batch_size: int):
+        batch: List[AnalyzedItem] = []
+        while True:
+            result = await analyzed.get()
+            if result is not None:
+                batch.append(result)
+            if batch and (result is None or len(batch) >= batch_size):
+                await self._commit(job, batch)
+                batch = []
+            if result is None:
+                return
+
+    async def save(self, db: AsyncSession, filename: str, batch: List[AnalyzedItem]) -> List[NewsAnalysis]:
+        """
+        Guarda un lote de análisis (contenido, análisis, métricas y firmas) en
+        una transacción y devuelve las filas creadas.
+        """
+        analyses = []
+        for result in batch:
+            content_hash = await content_store.store(db, result.content)
+            analysis = NewsAnalysis(
+                content_hash=content_hash,
+                source_type=SourceType.FILE.value,
+                source_url=result.item.url[:500] if result.item.url else None,
+                file_name=f"{filename}#{result.item.ref}"[:255],
+                score=result.combined_score,
+                label=label_for_score(result.combined_score).value,
+                confidence=result.confidence,
+                model_version=result.model_version,
+                analysis_time_ms=result.analysis_time_ms,
+                content_length=len(result.content),
+            )
+            db.add(analysis)
+            analyses.append(analysis)
+        await db.flush()  # Para obtener los IDs
+
+        for analysis, result in zip(analyses, batch):
+            content = result.content
+            db.add(AnalysisMetric(
+                analysis_id=analysis.id,
+                word_count=len(content.split()),
+                sentence_count=content.count('.') + content.count('!') + content.count('?'),
+                extraction_success=True,
+                extraction_method="bulk",
+            ))
+            if result.signature is not None:
+                await near_duplicate_index.add(db, analysis.id, result.signature)
+        await db.commit()
+        return analyses
+
+    async def _commit(self, job: BulkJob, batch: List[AnalyzedItem]):
+        """Guarda el lote de análisis en una transacción; un error de BD detiene el lote"""
+        async with AsyncSessionLocal() as db:
+            analyses = await self.save(db, job.filename, batch)
+        job.stored += len(batch)
+        job.batches += 1
+        if job.first_analysis_id is None:
+            job.first_analysis_id = analyses[0].id
+        job.last_analysis_id = analyses[-1].id
+
+
+# Instancia global
+bulk_ingestion = BulkIngestion()
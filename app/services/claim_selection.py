@@ -0,0 +1,139 @@
+"""
+Selección de afirmaciones verificables antes de consultar Google Fact Check.
+
+En lugar de mandar el artículo completo como una sola consulta, se divide en
+oraciones, se puntúan (con una única llamada a ClaimBuster o con la heurística
+local si no está disponible) y solo las top-k se consultan en Google, en
+paralelo.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from app.config_apis import api_config
+from app.services.external_apis import claimbuster_service, google_fact_check_service
+from app.services.provider_quota import provider_quotas
+from app.utils.claim_selector import ScoredSentence, claim_selector
+from app.utils.language_detector import language_detector
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ClaimSelection:
+    """Oraciones puntuadas y las elegidas para verificar"""
+    scorer: str  # 'claimbuster' o 'heuristic'
+    sentences: List[ScoredSentence]
+    selected: List[ScoredSentence]
+    claimbuster_result: Optional[Dict[str, Any]] = None
+    claimbuster_calls: int = 0
+
+
+class ClaimSelectionService:
+    """Elige las oraciones a verificar y consulta Google solo por ellas"""
+
+    async def select(self, text: str, top_k: Optional[int] = None, use_claimbuster: bool = True) -> ClaimSelection:
+        """
+        Puntúa las oraciones del texto y devuelve las top_k más verificables.
+
+        Con use_claimbuster se hace una sola llamada a ClaimBuster con el texto
+        completo (puntúa cada oración); si falla o no tiene cuota se usa la
+        heurística local.
+        """
+        top_k = top_k or api_config.CLAIM_TOP_K
+        claimbuster_result = None
+        claimbuster_calls = 0
+
+        if use_claimbuster and api_config.is_claimbuster_configured() and provider_quotas.check("claimbuster") is None:
+            claimbuster_result = await claimbuster_service.score_text(text)
+            claimbuster_calls = 0 if claimbuster_result.get("skipped") else 1
+            scored = [
+                ScoredSentence(index=index, text=item["text"], score=float(item["score"]))
+                for index, item in enumerate(claimbuster_result.get("sentences", []))
+                if item.get("text")
+            ]
+            if claimbuster_result.get("success") and scored:
+                # Los fragmentos cortos de la división de ClaimBuster no sirven como consulta
+                candidates = [s for s in scored if len(s.text.split()) >= claim_selector.MIN_WORDS]
+                selected = claim_selector.top_k(candidates, top_k, api_config.CLAIMBUSTER_MIN_SCORE)
+                return ClaimSelection("claimbuster", scored, selected, claimbuster_result, claimbuster_calls)
+
+        scored = claim_selector.score(claim_selector.split_sentences(text))
+        selected = claim_selector.top_k(scored, top_k, api_config.CLAIM_MIN_SCORE)
+        return ClaimSelection("heuristic", scored, selected, claimbuster_result, claimbuster_calls)
+
+    async def check_google(self, selection: ClaimSelection, text: str) -> Dict[str, Any]:
+        """
+        Consulta Google Fact Check por cada oración seleccionada, en paralelo.
+
+        Si ninguna oración supera el umbral se consulta el texto completo (una
+        sola llamada, como antes de la selección).
+        """
+        language, _ = language_detector.detect(text)
+        language_code = language or "en"
+        queries = [sentence.text for sentence in selection.selected] or [text]
+        responses = await asyncio.gather(*(
+            google_fact_check_service.check_claim(query[:claim_selector.MAX_CHARS], language_code)
+            for query in queries
+        ))
+
+        claims = []
+        seen = set()
+        for response in responses:
+            for claim in response.get("claims", []):
+                reviews = claim.get("claimReview") or [{}]
+                key = (claim.get("text"), reviews[0].get("url"))
+                if key not in seen:
+                    seen.add(key)
+                    claims.append(claim)
+
+        result = {
+            "success": any(response.get("success", False) for response in responses),
+            "api": "google_fact_check",
+            "claims": claims,
+            "total_results": len(claims),
+            "queries": [
+                {
+                    "query": query,
+                    "success": response.get("success", False),
+                    "total_results": response.get("total_results", 0),
+                    **({"error": response["error"]} if response.get("error") else {}),
+                    **({"skipped": True} if response.get("skipped") else {}),
+                }
+                for query, response in zip(queries, responses)
+            ],
+        }
+        if all(response.get("skipped") for response in responses):
+            result["skipped"] = True
+            result["error"] = responses[0].get("error")
+        return result
+
+    @staticmethod
+    def report(
+        selection: ClaimSelection, google_calls: int, include_google: bool, include_claimbuster: bool
+    ) -> Dict[str, Any]:
+        """
+        Resumen de la selección con las llamadas ahorradas frente a consultar
+        cada oración en Google (y en ClaimBuster, si se pidió).
+        """
+        total = len(selection.sentences)
+        every_sentence = total * (int(include_google) + int(include_claimbuster))
+        made = google_calls + selection.claimbuster_calls
+        return {
+            "scorer": selection.scorer,
+            "total_sentences": total,
+            "selected": [
+                {"index": sentence.index, "text": sentence.text, "score": sentence.score}
+                for sentence in selection.selected
+            ],
+            "api_calls": {
+                "made": made,
+                "every_sentence": every_sentence,
+                "saved": max(0, every_sentence - made),
+            },
+        }
+
+
+# Instancia global
+claim_selection_service = ClaimSelectionService()
@@ -0,0 +1,107 @@
+"""
+Almacenamiento direccionado por contenido para los textos analizados.
+
+Cada texto se guarda una sola vez en `analysis_contents`, comprimido con zlib y
+con el SHA-256 del texto como clave; `news_analyses` solo guarda la referencia.
+"""
+import hashlib
+import logging
+import zlib
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.news import AnalysisContent
+from app.services.search_service import search_service
+
+logger = logging.getLogger(__name__)
+
+
+class ContentStore:
+    """Guarda y recupera textos comprimidos por hash"""
+
+    COMPRESSION = "zlib"
+    COMPRESSION_LEVEL = 6
+
+    @staticmethod
+    def hash_content(content: str) -> str:
+        """SHA-256 hexadecimal del texto (clave de la tabla)"""
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def compress(self, content: str) -> bytes:
+        return zlib.compress(content.encode("utf-8"), self.COMPRESSION_LEVEL)
+
+    @staticmethod
+    def decompress(data: bytes, compression: str = "zlib") -> str:
+        if compression != "zlib":
+            raise ValueError(f"Compresión no soportada: {compression}")
+        return zlib.decompress(data).decode("utf-8")
+
+    async def store(self, db: AsyncSession, content: str) -> str:
+        """
+        Guarda el texto si todavía no existe y devuelve su hash.
+
+        No hace commit: la fila queda en la misma transacción que el análisis.
+        Los contenidos nuevos se indexan para la búsqueda full-text.
+        """
+        content_hash = self.hash_content(content)
+        values = {
+            "content_hash": content_hash,
+            "compression": self.COMPRESSION,
+            "data": self.compress(content),
+            "original_length": len(content),
+        }
+
+        dialect = db.bind.dialect.name if db.bind is not None else ""
+        if dialect == "postgresql":
+            stmt = pg_insert(AnalysisContent).values(
+                **values, search_vector=search_service.tsvector_expression(content)
+            ).on_conflict_do_nothing(index_elements=["content_hash"])
+            await db.execute(stmt)
+        elif dialect == "sqlite":
+            # Antes del insert: si la tabla FTS5 se crea ahora, no debe indexar este texto dos veces
+            await search_service.ensure_sqlite_index(db)
+            stmt = sqlite_insert(AnalysisContent).values(**values).on_conflict_do_nothing(
+                index_elements=["content_hash"]
+            )
+            result = await db.execute(stmt)
+            if result.rowcount == 1:
+                await search_service.index_sqlite(db, content_hash, content)
+        else:
+            existing = await db.get(AnalysisContent, content_hash)
+            if existing is None:
+                db.add(AnalysisContent(**values))
+                await db.flush()
+
+        return content_hash
+
+    async def load(self, db: AsyncSession, content_hash: str) -> Optional[str]:
+        """Recupera y descomprime un texto por su hash"""
+        contents = await self.load_many(db, [content_hash])
+        return contents.get(content_hash)
+
+    async def load_many(self, db: AsyncSession, content_hashes: Iterable[str]) -> Dict[str, str]:
+        """Recupera varios textos en una sola consulta"""
+        hashes = {h for h in content_hashes if h}
+        if not hashes:
+            return {}
+
+        result = await db.execute(
+            select(AnalysisContent.content_hash, AnalysisContent.compression, AnalysisContent.data)
+            .where(AnalysisContent.content_hash.in_(hashes))
+        )
+
+        contents = {}
+        for content_hash, compression, data in result.all():
+            try:
+                contents[content_hash] = self.decompress(data, compression)
+            except Exception as e:
+                logger.error(f"Error descomprimiendo contenido {content_hash}: {e}")
+        return contents
+
+
+# Instancia global
+content_store = ContentStore()
@@ -0,0 +1,267 @@
+"""
+Reputación de fuentes por dominio (sesgo y credibilidad de MBFC).
+
+Las calificaciones de MBFC son por dominio y cambian poco, así que se guardan
+en `source_domains` con un TTL largo y los dominios consultados se mantienen
+en un hot set en memoria (LRU). La API solo se llama cuando un dominio no está
+o su calificación venció; si la API falla se devuelve la calificación vencida.
+"""
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config_apis import api_config
+from app.database import AsyncSessionLocal
+from app.models.news import SourceDomain
+from app.services.external_apis import mbfc_service
+from app.services.provider_quota import provider_quotas
+from app.utils.domains import registrable_domain
+
+logger = logging.getLogger(__name__)
+
+
+class DomainReputationStore:
+    """Caché en dos niveles (memoria y BD) de las calificaciones de MBFC"""
+
+    def __init__(self):
+        self.hot_set_size = api_config.MBFC_HOT_SET_SIZE
+        self._hot: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.stats = {"hot_hits": 0, "db_hits": 0, "api_fetches": 0, "stale_served": 0}
+
+    # --- Consulta -----------------------------------------------------------
+
+    async def lookup(self, url: str, db: Optional[AsyncSession] = None, refresh: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Calificación del dominio de `url` (o de un dominio suelto).
+
+        Orden: hot set, BD y, si no hay o venció, la API de MBFC (una sola
+        llamada por dominio aunque lleguen varias requests a la vez). Con
+        refresh=False nunca se llama a la API. Sin `db` se usa una sesión propia.
+        """
+        domain = registrable_domain(url)
+        if domain is None:
+            return None
+
+        entry = self._hot.get(domain)
+        if entry is not None and not self._expired(entry):
+            self._hot.move_to_end(domain)
+            self.stats["hot_hits"] += 1
+            return entry
+
+        pending = self._in_flight.get(domain)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[domain] = future
+        try:
+            result = await self._resolve(domain, db, refresh)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            logger.error(f"Error resolviendo reputación de {domain}: {e}")
+            future.set_result(None)
+            return None
+        finally:
+            if not future.done():
+                # Cancelada: las requests que esperaban este dominio no quedan colgadas
+                future.set_result(None)
+            self._in_flight.pop(domain, None)
+
+    async def _resolve(self, domain: str, db: Optional[AsyncSession], refresh: bool) -> Optional[Dict[str, Any]]:
+        if db is None:
+            async with AsyncSessionLocal() as session:
+                return await self._resolve(domain, session, refresh)
+
+        row = await db.get(SourceDomain, domain)
+        stored = self._to_entry(row) if row is not None else None
+        if stored is not None and not self._expired(stored):
+            self.stats["db_hits"] += 1
+            self._remember(stored)
+            return stored
+
+        fetched = await self._fetch(db, domain) if refresh else None
+        if fetched is not None:
+            self._remember(fetched)
+            return fetched
+        if stored is not None:
+            # La API no respondió: mejor una calificación vencida que ninguna
+            self.stats["stale_served"] += 1
+            return {**stored, "stale": True}
+        return None
+
+    async def _fetch(self, db: AsyncSession, domain: str) -> Optional[Dict[str, Any]]:
+        """Consulta MBFC y guarda el resultado; None si la API no está disponible o falla"""
+        if not api_config.is_mbfc_configured() or provider_quotas.check("mbfc") is not None:
+            return None
+
+        self.stats["api_fetches"] += 1
+        result = await mbfc_service.check_source(f"https://{domain}")
+        now = datetime.now(timezone.utc)
+        if result.get("success"):
+            info = result.get("source_info") or {}
+            values = {
+                "found": True,
+                "name": (info.get("name") or None),
+                "bias": result.get("bias"),
+                "credibility": result.get("credibility"),
+                "factual_reporting": result.get("factual_reporting"),
+                "source_info": json.dumps(info, ensure_ascii=False),
+                "expires_at": now + timedelta(days=api_config.MBFC_TTL_DAYS),
+            }
+        elif result.get("status") == 404:
+            # MBFC no califica el dominio: también se guarda, con TTL corto
+            values = {
+                "found": False, "name": None, "bias": None, "credibility": None,
+                "factual_reporting": None, "source_info": None,
+                "expires_at": now + timedelta(hours=api_config.MBFC_NEGATIVE_TTL_HOURS),
+            }
+        else:
+            return None
+
+        row = await self._upsert(db, domain, fetched_at=now, **values)
+        await db.commit()
+        return self._to_entry(row)
+
+    # --- Carga masiva -------------------------------------------------------
+
+    async def import_ratings(self, db: AsyncSession, ratings: Iterable[Dict[str, Any]]) -> int:
+        """
+        Guarda calificaciones conocidas (p. ej. un volcado de MBFC) sin llamar a la API.
+
+        Cada item necesita 'domain' (o 'url') y opcionalmente name, bias,
+        credibility y factual_reporting.
+        """
+        now = datetime.now(timezone.utc)
+        count = 0
+        for item in ratings:
+            domain = registrable_domain(item.get("domain") or item.get("url") or "")
+            if domain is None:
+                continue
+            await self._upsert(
+                db, domain,
+                found=True,
+                name=item.get("name") or None,
+                bias=item.get("bias") or None,
+                credibility=item.get("credibility") or None,
+                factual_reporting=item.get("factual_reporting") or None,
+                source_info=json.dumps(item, ensure_ascii=False),
+                fetched_at=now,
+                expires_at=now + timedelta(days=api_config.MBFC_TTL_DAYS),
+            )
+            count += 1
+        await db.commit()
+        self._hot.clear()
+        return count
+
+    async def refresh_domains(self, db: AsyncSession, domains: Iterable[str], force: bool = False) -> Dict[str, bool]:
+        """Consulta la API por los dominios dados (solo los vencidos, salvo force)"""
+        results = {}
+        for value in domains:
+            domain = registrable_domain(value)
+            if domain is None:
+                continue
+            row = await db.get(SourceDomain, domain)
+            if row is not None and not force and not self._expired(self._to_entry(row)):
+                results[domain] = True
+                continue
+            results[domain] = await self._fetch(db, domain) is not None
+        return results
+
+    async def warm(self, db: Optional[AsyncSession] = None, limit: Optional[int] = None) -> int:
+        """Carga en memoria las calificaciones vigentes más recientes (al arrancar)"""
+        if db is None:
+            try:
+                async with AsyncSessionLocal() as session:
+                    return await self.warm(session, limit)
+            except Exception as e:
+                logger.error(f"No se pudo precargar la reputación de dominios: {e}")
+                return 0
+        result = await db.execute(
+            select(SourceDomain)
+            .where(SourceDomain.expires_at > datetime.now(timezone.utc))
+            .order_by(SourceDomain.fetched_at.desc())
+            .limit(limit or self.hot_set_size)
+        )
+        rows = result.scalars().all()
+        for row in reversed(rows):
+            self._remember(self._to_entry(row))
+        return len(rows)
+
+    # --- Internos -----------------------------------------------------------
+
+    async def _upsert(self, db: AsyncSession, domain: str, **values) -> SourceDomain:
+        row = await db.get(SourceDomain, domain)
+        if row is None:
+            row = SourceDomain(domain=domain, **values)
+            db.add(row)
+        else:
+            for key, value in values.items():
+                setattr(row, key, value)
+        await db.flush()
+        return row
+
+    def _remember(self, entry: Dict[str, Any]):
+        self._hot[entry["domain"]] = entry
+        self._hot.move_to_end(entry["domain"])
+        while len(self._hot) > self.hot_set_size:
+            self._hot.popitem(last=False)
+
+    @staticmethod
+    def _expired(entry: Dict[str, Any]) -> bool:
+        return entry["expires_at"] <= datetime.now(timezone.utc)
+
+    @staticmethod
+    def _to_entry(row: SourceDomain) -> Dict[str, Any]:
+        expires_at = row.expires_at
+        if expires_at.tzinfo is None:
+            # SQLite no guarda la zona horaria
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        fetched_at = row.fetched_at
+        if fetched_at.tzinfo is None:
+            fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+        return {
+            "domain": row.domain,
+            "found": row.found,
+            "name": row.name,
+            "bias": row.bias,
+            "credibility": row.credibility,
+            "factual_reporting": row.factual_reporting,
+            "source_info": json.loads(row.source_info) if row.source_info else None,
+            "fetched_at": fetched_at,
+            "expires_at": expires_at,
+        }
+
+    @staticmethod
+    def as_mbfc_result(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Entrada del store con la forma de respuesta de MBFCService.check_source"""
+        common = {
+            "api": "mbfc",
+            "domain": entry["domain"],
+            "fetched_at": entry["fetched_at"].isoformat(),
+            "stale": entry.get("stale", False),
+        }
+        if not entry["found"]:
+            return {"success": False, "error": "Dominio no calificado por MBFC", **common}
+        return {
+            "success": True,
+            "bias": entry["bias"],
+            "credibility": entry["credibility"],
+            "factual_reporting": entry["factual_reporting"],
+            "source_info": entry["source_info"],
+            **common,
+        }
+
+    def status(self) -> Dict[str, Any]:
+        return {"hot_set": len(self._hot), "hot_set_size": self.hot_set_size, **self.stats}
+
+
+# Instancia global
+domain_reputation = DomainReputationStore()
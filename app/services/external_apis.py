@@ -1,26 +1,67 @@
 """
 Servicios para integración con APIs externas de fact-checking
+
+Todas las llamadas pasan por el transporte compartido de su proveedor
+(pool de conexiones, reintentos con backoff y métricas).
 """
-import aiohttp
 import logging
 from typing import Dict, Any, Optional, List
 from app.config_apis import api_config
+from app.services.provider_transport import ProviderResponse, provider_transports
 
 logger = logging.getLogger(__name__)
 
 
+def _error_result(api_name: str, response: ProviderResponse) -> Dict[str, Any]:
+    """Resultado de error común a todos los servicios"""
+    if response.skipped:
+        logger.warning(f"{api_name} omitida: {response.error}")
+        return {
+            "success": False,
+            "skipped": True,
+            "error": response.error
+        }
+    if response.status is None:
+        logger.error(f"Error calling {api_name}: {response.error}")
+        return {
+            "success": False,
+            "error": response.error,
+            "attempts": response.attempts
+        }
+    logger.error(f"{api_name} error: {response.status} - {response.text}")
+    return {
+        "success": False,
+        "status": response.status,
+        "error": response.error,
+        "details": response.text,
+        "attempts": response.attempts
+    }
+
+
+def _invalid_json_result(api_name: str, response: ProviderResponse) -> Dict[str, Any]:
+    logger.error(f"{api_name}: respuesta no es JSON válido")
+    return {
+        "success": False,
+        "error": "Respuesta inválida de la API",
+        "details": response.text[:500],
+        "attempts": response.attempts
+    }
+
+
 class GoogleFactCheckService:
     """Servicio para Google Fact Check Tools API"""
-    
-    @staticmethod
-    async def check_claim(query: str, language_code: str = "en") -> Dict[str, Any]:
+
+    transport = provider_transports.get("google_fact_check")
+
+    @classmethod
+    async def check_claim(cls, query: str, language_code: str = "en") -> Dict[str, Any]:
         """
         Verificar un claim usando Google Fact Check Tools API
-        
+
         Args:
             query: Texto del claim a verificar
             language_code: Código de idioma (default: en)
-            
+
         Returns:
             Dict con resultados del fact-check
         """
@@ -30,56 +71,41 @@ class GoogleFactCheckService:
                 "configured": False,
                 "message": "Por favor configure GOOGLE_FACT_CHECK_API_KEY"
             }
-        
-        try:
-            params = {
-                "query": query,
-                "languageCode": language_code,
-                "key": api_config.GOOGLE_FACT_CHECK_API_KEY
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    api_config.GOOGLE_FACT_CHECK_URL,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=api_config.REQUEST_TIMEOUT)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return {
-                            "success": True,
-                            "api": "google_fact_check",
-                            "claims": data.get("claims", []),
-                            "total_results": len(data.get("claims", []))
-                        }
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Google Fact Check API error: {response.status} - {error_text}")
-                        return {
-                            "success": False,
-                            "error": f"API error: {response.status}",
-                            "details": error_text
-                        }
-                        
-        except Exception as e:
-            logger.error(f"Error calling Google Fact Check API: {str(e)}")
-            return {
-                "success": False,
-                "error": str(e)
-            }
+
+        params = {
+            "query": query,
+            "languageCode": language_code,
+            "key": api_config.GOOGLE_FACT_CHECK_API_KEY
+        }
+
+        response = await cls.transport.request("GET", api_config.GOOGLE_FACT_CHECK_URL, params=params)
+        if not response.ok:
+            return _error_result("Google Fact Check API", response)
+        if not isinstance(response.data, dict):
+            return _invalid_json_result("Google Fact Check API", response)
+
+        claims = response.data.get("claims", [])
+        return {
+            "success": True,
+            "api": "google_fact_check",
+            "claims": claims,
+            "total_results": len(claims)
+        }
 
 
 class ClaimBusterService:
     """Servicio para ClaimBuster API"""
-    
-    @staticmethod
-    async def score_text(text: str) -> Dict[str, Any]:
+
+    transport = provider_transports.get("claimbuster")
+
+    @classmethod
+    async def score_text(cls, text: str) -> Dict[str, Any]:
         """
         Obtener score de verificabilidad de ClaimBuster
-        
+
         Args:
             text: Texto a analizar
-            
+
         Returns:
             Dict con score de verificabilidad
         """
@@ -89,60 +115,50 @@ class ClaimBusterService:
                 "configured": False,
                 "message": "Por favor configure CLAIMBUSTER_API_KEY"
             }
-        
-        try:
-            headers = {
-                "x-api-key": api_config.CLAIMBUSTER_API_KEY
-            }
-            
-            payload = {
-                "input_text": text
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    api_config.CLAIMBUSTER_URL,
-                    json=payload,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=api_config.REQUEST_TIMEOUT)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return {
-                            "success": True,
-                            "api": "claimbuster",
-                            "score": data.get("score", 0),
-                            "text": text,
-                            "interpretation": "check-worthy" if data.get("score", 0) > 0.5 else "not check-worthy"
-                        }
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"ClaimBuster API error: {response.status} - {error_text}")
-                        return {
-                            "success": False,
-                            "error": f"API error: {response.status}",
-                            "details": error_text
-                        }
-                        
-        except Exception as e:
-            logger.error(f"Error calling ClaimBuster API: {str(e)}")
-            return {
-                "success": False,
-                "error": str(e)
-            }
+
+        headers = {
+            "x-api-key": api_config.CLAIMBUSTER_API_KEY
+        }
+
+        payload = {
+            "input_text": text
+        }
+
+        response = await cls.transport.request("POST", api_config.CLAIMBUSTER_URL, json=payload, headers=headers)
+        if not response.ok:
+            return _error_result("ClaimBuster API", response)
+        if not isinstance(response.data, dict):
+            return _invalid_json_result("ClaimBuster API", response)
+
+        score = response.data.get("score", 0)
+        return {
+            "success": True,
+            "api": "claimbuster",
+            "score": score,
+            "text": text,
+            "interpretation": "check-worthy" if score > 0.5 else "not check-worthy",
+            # ClaimBuster divide el texto en oraciones y puntúa cada una
+            "sentences": [
+                {"text": result.get("text", ""), "score": result.get("score", 0)}
+                for result in response.data.get("results", [])
+                if isinstance(result, dict)
+            ]
+        }
 
 
 class WordLiftService:
     """Servicio para WordLift Fact-Checking API"""
-    
-    @staticmethod
-    async def fact_check(text: str) -> Dict[str, Any]:
+
+    transport = provider_transports.get("wordlift")
+
+    @classmethod
+    async def fact_check(cls, text: str) -> Dict[str, Any]:
         """
         Verificar hechos usando WordLift API
-        
+
         Args:
             text: Texto a verificar
-            
+
         Returns:
             Dict con resultados de fact-checking
         """
@@ -152,59 +168,42 @@ class WordLiftService:
                 "configured": False,
                 "message": "Por favor configure WORDLIFT_API_KEY"
             }
-        
-        try:
-            headers = {
-                "Authorization": f"Key {api_config.WORDLIFT_API_KEY}",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "text": text
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    api_config.WORDLIFT_URL,
-                    json=payload,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=api_config.REQUEST_TIMEOUT)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return {
-                            "success": True,
-                            "api": "wordlift",
-                            "results": data
-                        }
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"WordLift API error: {response.status} - {error_text}")
-                        return {
-                            "success": False,
-                            "error": f"API error: {response.status}",
-                            "details": error_text
-                        }
-                        
-        except Exception as e:
-            logger.error(f"Error calling WordLift API: {str(e)}")
-            return {
-                "success": False,
-                "error": str(e)
-            }
+
+        headers = {
+            "Authorization": f"Key {api_config.WORDLIFT_API_KEY}",
+            "Content-Type": "application/json"
+        }
+
+        payload = {
+            "text": text
+        }
+
+        response = await cls.transport.request("POST", api_config.WORDLIFT_URL, json=payload, headers=headers)
+        if not response.ok:
+            return _error_result("WordLift API", response)
+        if response.data is None:
+            return _invalid_json_result("WordLift API", response)
+
+        return {
+            "success": True,
+            "api": "wordlift",
+            "results": response.data
+        }
 
 
 class MBFCService:
     """Servicio para Media Bias / Fact Check API"""
-    
-    @staticmethod
-    async def check_source(url: str) -> Dict[str, Any]:
+
+    transport = provider_transports.get("mbfc")
+
+    @classmethod
+    async def check_source(cls, url: str) -> Dict[str, Any]:
         """
         Verificar sesgo y credibilidad de una fuente
-        
+
         Args:
             url: URL de la fuente a verificar
-            
+
         Returns:
             Dict con información de sesgo y credibilidad
         """
@@ -214,62 +213,46 @@ class MBFCService:
                 "configured": False,
                 "message": "Por favor configure MBFC_API_KEY"
             }
-        
-        try:
-            headers = {
-                "Authorization": f"Bearer {api_config.MBFC_API_KEY}"
-            }
-            
-            params = {
-                "url": url
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{api_config.MBFC_URL}/source",
-                    params=params,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=api_config.REQUEST_TIMEOUT)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return {
-                            "success": True,
-                            "api": "mbfc",
-                            "bias": data.get("bias"),
-                            "credibility": data.get("credibility"),
-                            "factual_reporting": data.get("factual_reporting"),
-                            "source_info": data
-                        }
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"MBFC API error: {response.status} - {error_text}")
-                        return {
-                            "success": False,
-                            "error": f"API error: {response.status}",
-                            "details": error_text
-                        }
-                        
-        except Exception as e:
-            logger.error(f"Error calling MBFC API: {str(e)}")
-            return {
-                "success": False,
-                "error": str(e)
-            }
+
+        headers = {
+            "Authorization": f"Bearer {api_config.MBFC_API_KEY}"
+        }
+
+        params = {
+            "url": url
+        }
+
+        response = await cls.transport.request("GET", f"{api_config.MBFC_URL}/source", params=params, headers=headers)
+        if not response.ok:
+            return _error_result("MBFC API", response)
+        if not isinstance(response.data, dict):
+            return _invalid_json_result("MBFC API", response)
+
+        data = response.data
+        return {
+            "success": True,
+            "api": "mbfc",
+            "bias": data.get("bias"),
+            "credibility": data.get("credibility"),
+            "factual_reporting": data.get("factual_reporting"),
+            "source_info": data
+        }
 
 
 class RapidAPIFakeNewsService:
     """Servicio para Fake News Detection en RapidAPI"""
-    
-    @staticmethod
-    async def detect_fake_news(text: str, title: str = "") -> Dict[str, Any]:
+
+    transport = provider_transports.get("rapidapi")
+
+    @classmethod
+    async def detect_fake_news(cls, text: str, title: str = "") -> Dict[str, Any]:
         """
         Detectar fake news usando RapidAPI
-        
+
         Args:
             text: Contenido del artículo
             title: Título del artículo (opcional)
-            
+
         Returns:
             Dict con resultado de detección
         """
@@ -279,49 +262,30 @@ class RapidAPIFakeNewsService:
                 "configured": False,
                 "message": "Por favor configure RAPIDAPI_KEY"
             }
-        
-        try:
-            headers = {
-                "x-rapidapi-key": api_config.RAPIDAPI_KEY,
-                "x-rapidapi-host": api_config.RAPIDAPI_HOST,
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "key1": "value",
-                "key2": "value"
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    api_config.RAPIDAPI_URL,
-                    json=payload,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=api_config.REQUEST_TIMEOUT)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return {
-                            "success": True,
-                            "api": "rapidapi_fake_news",
-                            "result": data,
-                            "text": text
-                        }
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"RapidAPI error: {response.status} - {error_text}")
-                        return {
-                            "success": False,
-                            "error": f"API error: {response.status}",
-                            "details": error_text
-                        }
-                        
-        except Exception as e:
-            logger.error(f"Error calling RapidAPI: {str(e)}")
-            return {
-                "success": False,
-                "error": str(e)
-            }
+
+        headers = {
+            "x-rapidapi-key": api_config.RAPIDAPI_KEY,
+            "x-rapidapi-host": api_config.RAPIDAPI_HOST,
+            "Content-Type": "application/json"
+        }
+
+        payload = {
+            "key1": "value",
+            "key2": "value"
+        }
+
+        response = await cls.transport.request("POST", api_config.RAPIDAPI_URL, json=payload, headers=headers)
+        if not response.ok:
+            return _error_result("RapidAPI", response)
+        if response.data is None:
+            return _invalid_json_result("RapidAPI", response)
+
+        return {
+            "success": True,
+            "api": "rapidapi_fake_news",
+            "result": response.data,
+            "text": text
+        }
 
 
 # Instancias de servicios
@@ -329,4 +293,4 @@ google_fact_check_service = GoogleFactCheckService()
 claimbuster_service = ClaimBusterService()
 wordlift_service = WordLiftService()
 mbfc_service = MBFCService()
-rapidapi_service = RapidAPIFakeNewsService()
\ No newline at end of file
+rapidapi_service = RapidAPIFakeNewsService()
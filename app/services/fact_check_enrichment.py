@@ -0,0 +1,333 @@
+"""
+Fact-checking dentro de /analyze, concurrente con la inferencia.
+
+Con ?fact_check=true las APIs configuradas se lanzan apenas se extrae el
+texto, mientras corre el modelo. Lo que responde dentro del presupuesto de
+latencia va en la respuesta; las rezagadas siguen en background y su resultado
+se guarda en `fact_check_results` asociado al análisis, visible luego en
+GET /analyze/{id}.
+
+Los resultados se guardan normalizados (misma forma por proveedor, sin el
+texto analizado) y, si el mismo contenido ya se verificó hace menos de
+FACT_CHECK_RESULTS_TTL_HOURS, se reutilizan en lugar de volver a llamar a la API.
+"""
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config_apis import api_config
+from app.database import AsyncSessionLocal
+from app.models.news import FactCheckResult, NewsAnalysis
+from app.services.claim_selection import claim_selection_service
+from app.services.domain_reputation import domain_reputation
+from app.services.external_apis import claimbuster_service, rapidapi_service, wordlift_service
+from app.services.provider_quota import provider_quotas
+
+logger = logging.getLogger(__name__)
+
+# Nombre en los resultados -> proveedor en PROVIDER_LIMITS
+_QUOTA_NAMES = {
+    "google": "google_fact_check",
+    "claimbuster": "claimbuster",
+    "wordlift": "wordlift",
+    "mbfc": "mbfc",
+    "rapidapi": "rapidapi",
+}
+
+# MBFC se califica por dominio (caché propia), no por contenido
+_REUSABLE = ("google", "claimbuster", "wordlift", "rapidapi")
+
+
+@dataclass
+class FactCheckRun:
+    """Consultas lanzadas para un análisis"""
+    tasks: Dict[str, asyncio.Task]
+    started: float
+    budget_ms: int
+    skipped: Dict[str, str] = field(default_factory=dict)
+    results: Dict[str, Tuple[Dict[str, Any], int]] = field(default_factory=dict)  # (resultado normalizado, latencia ms)
+    reused: Dict[str, int] = field(default_factory=dict)  # Proveedor -> análisis que hizo la consulta
+    pending: List[str] = field(default_factory=list)
+    handed_off: bool = False
+
+
+class FactCheckEnrichment:
+    """Lanza las APIs de fact-checking, junta las que llegan a tiempo y guarda las rezagadas"""
+
+    def __init__(self):
+        self._background: Set[asyncio.Task] = set()
+        self.stats = {"runs": 0, "on_time": 0, "reused": 0, "late_saved": 0, "late_lost": 0}
+
+    async def start(
+        self, db: AsyncSession, content_hash: str, text: str,
+        url: Optional[str] = None, budget_ms: Optional[int] = None
+    ) -> FactCheckRun:
+        """
+        Lanza (sin esperar) las APIs configuradas con cuota disponible, salvo
+        las que ya tienen un resultado vigente guardado para el mismo contenido.
+        """
+        started = time.monotonic()
+        stored = await self.stored_results(db, content_hash)
+        coroutines: Dict[str, Awaitable[Optional[Dict[str, Any]]]] = {}
+        if api_config.is_google_configured():
+            coroutines["google"] = self._google(text)
+        if api_config.is_claimbuster_configured():
+            coroutines["claimbuster"] = claimbuster_service.score_text(text)
+        if api_config.is_wordlift_configured():
+            coroutines["wordlift"] = wordlift_service.fact_check(text=text)
+        if url:
+            coroutines["mbfc"] = self._mbfc(url)
+        if api_config.is_rapidapi_configured():
+            coroutines["rapidapi"] = rapidapi_service.detect_fake_news(text=text, title="")
+
+        skipped = {}
+        tasks = {}
+        results = {}
+        reused = {}
+        for name, coroutine in coroutines.items():
+            row = stored.get(name)
+            if row is not None:
+                coroutine.close()
+                results[name] = (json.loads(row.result), row.latency_ms)
+                reused[name] = row.analysis_id
+                continue
+            # MBFC puede responder desde la caché de dominios aunque no tenga cuota
+            reason = provider_quotas.check(_QUOTA_NAMES[name]) if name != "mbfc" else None
+            if reason:
+                coroutine.close()
+                skipped[name] = reason
+                continue
+            tasks[name] = asyncio.create_task(self._timed(coroutine))
+
+        self.stats["runs"] += 1
+        self.stats["reused"] += len(reused)
+        return FactCheckRun(
+            tasks=tasks,
+            started=started,
+            budget_ms=api_config.ENRICHMENT_BUDGET_MS if budget_ms is None else budget_ms,
+            skipped=skipped,
+            results=results,
+            reused=reused,
+        )
+
+    async def stored_results(self, db: AsyncSession, content_hash: str) -> Dict[str, FactCheckResult]:
+        """
+        Último resultado exitoso y vigente de cada proveedor para un contenido.
+
+        Solo cuentan las consultas originales: una copia reutilizada lleva la
+        fecha del análisis que la copió, así que con ella el TTL se renovaría
+        en cada reutilización sin volver a llamar a la API.
+        """
+        if api_config.RESULTS_TTL_HOURS <= 0:
+            return {}
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=api_config.RESULTS_TTL_HOURS)
+        result = await db.execute(
+            select(FactCheckResult)
+            .join(NewsAnalysis, NewsAnalysis.id == FactCheckResult.analysis_id)
+            .where(
+                NewsAnalysis.content_hash == content_hash,
+                FactCheckResult.provider.in_(_REUSABLE),
+                FactCheckResult.success.is_(True),
+                FactCheckResult.reused_from.is_(None),
+                FactCheckResult.created_at >= cutoff,
+            )
+            .order_by(FactCheckResult.created_at.desc())
+        )
+        stored: Dict[str, FactCheckResult] = {}
+        for row in result.scalars():
+            stored.setdefault(row.provider, row)
+        return stored
+
+    async def collect(self, run: FactCheckRun) -> FactCheckRun:
+        """
+        Espera a las APIs hasta agotar el presupuesto (contado desde start, así
+        que el tiempo de la inferencia ya cuenta) y separa las que no llegaron.
+        """
+        remaining = run.budget_ms / 1000 - (time.monotonic() - run.started)
+        if run.tasks:
+            await asyncio.wait(run.tasks.values(), timeout=max(0.0, remaining))
+
+        for name, task in run.tasks.items():
+            if not task.done():
+                run.pending.append(name)
+                continue
+            self._record(run, name, task.result())
+        self.stats["on_time"] += len(run.results) - len(run.reused)
+        return run
+
+    def summary(self, run: FactCheckRun) -> Dict[str, Any]:
+        """Bloque `fact_checks` de la respuesta de /analyze"""
+        return {
+            "budget_ms": run.budget_ms,
+            "elapsed_ms": int((time.monotonic() - run.started) * 1000),
+            "results": {name: result for name, (result, _) in run.results.items()},
+            "latency_ms": {name: latency_ms for name, (_, latency_ms) in run.results.items()},
+            "reused": run.reused,
+            "pending": run.pending,
+            "skipped": run.skipped,
+        }
+
+    def add_results(self, db: AsyncSession, analysis_id: int, run: FactCheckRun):
+        """Agrega a la sesión las respuestas que llegaron a tiempo y las reutilizadas (sin commit)"""
+        for name, (result, latency_ms) in run.results.items():
+            db.add(self._row(analysis_id, name, result, latency_ms, late=False, reused_from=run.reused.get(name)))
+
+    def attach_late(self, analysis_id: int, run: FactCheckRun):
+        """Deja a las rezagadas terminando en background; se guardan al llegar"""
+        run.handed_off = True
+        if not run.pending:
+            return
+        task = asyncio.create_task(self._attach_late(analysis_id, run))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def cancel(self, run: Optional[FactCheckRun]):
+        """Cancela las consultas de un análisis que falló antes de guardarse"""
+        if run is None or run.handed_off:
+            return
+        for task in run.tasks.values():
+            task.cancel()
+
+    async def stop(self):
+        """Al apagar: las rezagadas que no llegaron se pierden"""
+        for task in list(self._background):
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        self._background.clear()
+
+    def status(self) -> Dict[str, Any]:
+        return {"in_background": len(self._background), **self.stats}
+
+    # --- Internos -----------------------------------------------------------
+
+    async def _attach_late(self, analysis_id: int, run: FactCheckRun):
+        tasks = [run.tasks[name] for name in run.pending]
+
+        async def named(name: str, task: asyncio.Task):
+            return name, await task
+
+        try:
+            waiting = [named(name, task) for name, task in zip(run.pending, tasks)]
+            for finished in asyncio.as_completed(waiting, timeout=api_config.ENRICHMENT_LATE_TIMEOUT):
+                name, (result, latency_ms) = await finished
+                if result is None or result.get("skipped"):
+                    continue
+                result = self.normalize(name, result)
+                try:
+                    async with AsyncSessionLocal() as db:
+                        db.add(self._row(analysis_id, name, result, latency_ms, late=True))
+                        await db.commit()
+                    self.stats["late_saved"] += 1
+                except Exception as e:
+                    self.stats["late_lost"] += 1
+                    logger.error(f"No se pudo guardar el fact-check de {name} del análisis {analysis_id}: {e}")
+        except asyncio.TimeoutError:
+            lost = [name for name, task in zip(run.pending, tasks) if not task.done()]
+            self.stats["late_lost"] += len(lost)
+            logger.warning(f"Fact-checks sin respuesta para el análisis {analysis_id}: {', '.join(lost)}")
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _record(self, run: FactCheckRun, name: str, outcome: Tuple[Optional[Dict[str, Any]], int]):
+        result, latency_ms = outcome
+        if result is None:
+            return
+        if result.get("skipped"):
+            # Se quedó sin cuota durante la llamada
+            run.skipped[name] = result.get("error")
+            return
+        run.results[name] = (self.normalize(name, result), latency_ms)
+
+    @staticmethod
+    async def _timed(coroutine: Awaitable[Optional[Dict[str, Any]]]) -> Tuple[Optional[Dict[str, Any]], int]:
+        start = time.monotonic()
+        try:
+            result = await coroutine
+        except Exception as e:
+            logger.error(f"Error en fact-check: {type(e).__name__}: {e}")
+            result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+        return result, int((time.monotonic() - start) * 1000)
+
+    @staticmethod
+    async def _google(text: str) -> Dict[str, Any]:
+        # Selección con la heurística local: no se espera a ClaimBuster para consultar Google
+        selection = await claim_selection_service.select(text, use_claimbuster=False)
+        return await claim_selection_service.check_google(selection, text)
+
+    @staticmethod
+    async def _mbfc(url: str) -> Optional[Dict[str, Any]]:
+        entry = await domain_reputation.lookup(url)
+        return domain_reputation.as_mbfc_result(entry) if entry is not None else None
+
+    @staticmethod
+    def normalize(name: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Forma común de los resultados: success, error y los campos útiles de
+        cada proveedor (sin el texto analizado ni los detalles de transporte).
+        """
+        normalized: Dict[str, Any] = {"provider": name, "success": bool(result.get("success", False))}
+        if not normalized["success"]:
+            normalized["error"] = result.get("error")
+            if result.get("status") is not None:
+                normalized["status"] = result["status"]
+            return normalized
+
+        if name == "google":
+            normalized["claims"] = [
+                {
+                    "text": claim.get("text"),
+                    "claimant": claim.get("claimant"),
+                    "claim_date": claim.get("claimDate"),
+                    "reviews": [
+                        {
+                            "publisher": (review.get("publisher") or {}).get("name"),
+                            "url": review.get("url"),
+                            "rating": review.get("textualRating"),
+                            "review_date": review.get("reviewDate"),
+                            "language": review.get("languageCode"),
+                        }
+                        for review in claim.get("claimReview") or []
+                    ],
+                }
+                for claim in result.get("claims", [])
+            ]
+            normalized["queries"] = [query["query"] for query in result.get("queries", [])]
+        elif name == "claimbuster":
+            normalized["score"] = result.get("score")
+            normalized["interpretation"] = result.get("interpretation")
+            normalized["sentences"] = result.get("sentences", [])
+        elif name == "mbfc":
+            for key in ("domain", "bias", "credibility", "factual_reporting", "stale"):
+                normalized[key] = result.get(key)
+            normalized["name"] = (result.get("source_info") or {}).get("name")
+        else:
+            # WordLift y RapidAPI: respuesta sin esquema fijo
+            normalized["data"] = result.get("results", result.get("result"))
+        return normalized
+
+    @staticmethod
+    def _row(
+        analysis_id: int, name: str, result: Dict[str, Any], latency_ms: int,
+        late: bool, reused_from: Optional[int] = None
+    ) -> FactCheckResult:
+        return FactCheckResult(
+            analysis_id=analysis_id,
+            provider=name,
+            success=result["success"],
+            result=json.dumps(result, ensure_ascii=False, default=str),
+            latency_ms=latency_ms,
+            late=late,
+            reused_from=reused_from,
+        )
+
+
+# Instancia global
+fact_check_enrichment = FactCheckEnrichment()
@@ -0,0 +1,175 @@
+"""
+Monitor de salud en segundo plano.
+
+Ejecuta periódicamente los chequeos de base de datos, modelo de IA y extractor
+web, de forma concurrente y con timeout individual, y guarda el último
+resultado en memoria para que los endpoints de /health no disparen una
+inferencia real en cada request.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.services.ai_analyzer import ai_analyzer
+from app.utils.content_extractor import content_extractor
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """Ejecuta los chequeos de salud en background y cachea los resultados"""
+
+    def __init__(self):
+        self.interval = settings.HEALTH_CHECK_INTERVAL
+        self.timeout = settings.HEALTH_CHECK_TIMEOUT
+
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._last_run: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None  # Refresco lanzado por get_results
+        self._refresh_lock = asyncio.Lock()
+
+    async def start(self):
+        """Lanza el loop de chequeos periódicos (idempotente)"""
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self):
+        """Detiene el loop de chequeos y el refresco en curso"""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run_forever(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Error en ciclo de health checks: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def refresh(self) -> Dict[str, Dict[str, Any]]:
+        """Ejecuta todos los chequeos concurrentemente y actualiza la caché"""
+        async with self._refresh_lock:
+            probes = {
+                "database": self._check_database,
+                "ai_model": self._check_ai_model,
+                "web_extractor": self._check_web_extractor,
+            }
+            results = await asyncio.gather(
+                *(self._run_probe(name, probe) for name, probe in probes.items())
+            )
+            self._results = dict(zip(probes.keys(), results))
+            self._last_run = datetime.now()
+            return self._results
+
+    async def _run_probe(self, name: str, probe: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Ejecuta un chequeo con timeout y mide su duración"""
+        start = time.time()
+        try:
+            details = await asyncio.wait_for(probe(), timeout=self.timeout)
+            ok = bool(details.pop("ok", False))
+            error = None
+        except asyncio.TimeoutError:
+            ok, details, error = False, {}, f"Timeout tras {self.timeout}s"
+        except Exception as e:
+            ok, details, error = False, {}, str(e)
+
+        if error:
+            logger.warning(f"Health check '{name}' falló: {error}")
+
+        return {
+            "ok": ok,
+            "duration_ms": int((time.time() - start) * 1000),
+            "checked_at": datetime.now(),
+            "error": error,
+            **details,
+        }
+
+    async def _check_database(self) -> Dict[str, Any]:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(text("SELECT 1"))
+            return {"ok": result.scalar() == 1}
+
+    async def _check_ai_model(self) -> Dict[str, Any]:
+        model_info = await ai_analyzer.get_model_info()
+        reachable = await ai_analyzer.ping()
+        return {
+            "ok": model_info.get("is_loaded", False) and reachable,
+            "model_name": model_info.get("model_name", "unknown"),
+            "is_loaded": model_info.get("is_loaded", False),
+            "inference_reachable": reachable,
+        }
+
+    async def _check_web_extractor(self) -> Dict[str, Any]:
+        return {
+            "ok": hasattr(content_extractor, "extract_from_url")
+            and content_extractor.validate_url("https://example.com"),
+        }
+
+    def is_stale(self) -> bool:
+        """Indica si la caché es más vieja que dos intervalos (o no existe)"""
+        if self._last_run is None:
+            return True
+        age = (datetime.now() - self._last_run).total_seconds()
+        return age > self.interval * 2
+
+    async def get_results(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Devuelve los resultados cacheados.
+
+        Si todavía no hay resultados se ejecutan los chequeos una vez. Si la
+        caché quedó vieja (p.ej. en serverless, donde el loop no sobrevive
+        entre invocaciones) se relanza un refresco sin bloquear el request.
+        """
+        if not self._results:
+            return await self.refresh()
+        refreshing = self._refresh_task is not None and not self._refresh_task.done()
+        if self.is_stale() and not refreshing and not self._refresh_lock.locked():
+            self._refresh_task = asyncio.create_task(self.refresh())
+            self._refresh_task.add_done_callback(self._log_refresh_error)
+        return self._results
+
+    @staticmethod
+    def _log_refresh_error(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Error en refresco de health checks: {task.exception()}")
+
+    @property
+    def last_run(self) -> Optional[datetime]:
+        return self._last_run
+
+    @staticmethod
+    def overall_status(results: Dict[str, Dict[str, Any]]) -> str:
+        """Calcula el estado general a partir de los chequeos individuales"""
+        database_ok = results.get("database", {}).get("ok", False)
+        ai_model_ok = results.get("ai_model", {}).get("ok", False)
+        web_extractor_ok = results.get("web_extractor", {}).get("ok", False)
+
+        if database_ok and ai_model_ok and web_extractor_ok:
+            return "healthy"
+        elif database_ok and (ai_model_ok or web_extractor_ok):
+            return "degraded"
+        return "unhealthy"
+
+
+# Instancia global del monitor
+health_monitor = HealthMonitor()
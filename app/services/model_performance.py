@@ -0,0 +1,209 @@
+"""
+Métricas de rendimiento por modelo.
+
+Cada llamada a un modelo registra su latencia y si falló. Los contadores se
+acumulan en memoria y se vuelcan periódicamente a
+`model_registry.performance_metrics` (JSON), sumándose a lo ya persistido.
+"""
+import asyncio
+import json
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.news import ModelRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class _ModelCounters:
+    """Contadores de un modelo desde el último volcado a la BD"""
+
+    WINDOW = 500  # Latencias recientes para los percentiles
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_latency_ms = 0
+        self.max_latency_ms = 0
+        self.recent: Deque[int] = deque(maxlen=self.WINDOW)
+        self.last_used: Optional[datetime] = None
+
+    def percentile(self, fraction: float) -> Optional[int]:
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ModelPerformanceTracker:
+    """Registra latencia y errores por modelo y los persiste en ModelRegistry"""
+
+    def __init__(self):
+        self.interval = settings.MODEL_METRICS_FLUSH_INTERVAL
+        self._pending: Dict[str, _ModelCounters] = {}
+        self._recent: Dict[str, _ModelCounters] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+    def record(self, model: str, latency_ms: int, ok: bool):
+        """Registra una llamada (no bloquea: solo actualiza memoria)"""
+        now = datetime.now(timezone.utc)
+        for counters in (
+            self._pending.setdefault(model, _ModelCounters()),
+            self._recent.setdefault(model, _ModelCounters()),
+        ):
+            counters.calls += 1
+            counters.errors += 0 if ok else 1
+            counters.total_latency_ms += latency_ms
+            counters.max_latency_ms = max(counters.max_latency_ms, latency_ms)
+            counters.recent.append(latency_ms)
+            counters.last_used = now
+
+    # --- Volcado periódico --------------------------------------------------
+
+    async def start(self):
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run_forever(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    async def flush(self, db: Optional[AsyncSession] = None):
+        """Suma los contadores pendientes a performance_metrics de cada modelo"""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            try:
+                if db is not None:
+                    await self._persist(db, pending)
+                else:
+                    async with AsyncSessionLocal() as session:
+                        await self._persist(session, pending)
+            except Exception as e:
+                logger.error(f"Error guardando métricas de modelos: {e}")
+                # Reintentar en el próximo volcado
+                for model, counters in pending.items():
+                    self._merge_back(model, counters)
+
+    def _merge_back(self, model: str, counters: _ModelCounters):
+        current = self._pending.setdefault(model, _ModelCounters())
+        current.calls += counters.calls
+        current.errors += counters.errors
+        current.total_latency_ms += counters.total_latency_ms
+        current.max_latency_ms = max(current.max_latency_ms, counters.max_latency_ms)
+        current.recent.extend(counters.recent)
+        current.last_used = max(filter(None, (current.last_used, counters.last_used)), default=None)
+
+    async def _persist(self, db: AsyncSession, pending: Dict[str, _ModelCounters]):
+        result = await db.execute(
+            select(ModelRegistry).where(ModelRegistry.model_name.in_(list(pending)))
+        )
+        rows = {row.model_name: row for row in result.scalars().all()}
+
+        for model, counters in pending.items():
+            row = rows.get(model)
+            if row is None:
+                row = ModelRegistry(
+                    model_name=model,
+                    model_version="2.0.0",
+                    model_type="huggingface",
+                    is_active=model == settings.HF_MODEL_NAME,
+                )
+                db.add(row)
+            stored = self._load_metrics(row.performance_metrics)
+            row.performance_metrics = json.dumps(self._merge(stored, counters))
+            row.last_used = counters.last_used
+        await db.commit()
+
+    async def mark_active(self, db: AsyncSession, model: str):
+        """Marca el modelo como activo en model_registry (y al resto como inactivo)"""
+        result = await db.execute(select(ModelRegistry))
+        rows = result.scalars().all()
+        for row in rows:
+            row.is_active = row.model_name == model
+        if not any(row.model_name == model for row in rows):
+            db.add(ModelRegistry(
+                model_name=model, model_version="2.0.0", model_type="huggingface", is_active=True
+            ))
+        await db.commit()
+
+    # --- Lectura ------------------------------------------------------------
+
+    @staticmethod
+    def _load_metrics(raw: Optional[str]) -> Dict[str, Any]:
+        if not raw:
+            return {}
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return {}
+
+    @staticmethod
+    def _merge(stored: Dict[str, Any], counters: _ModelCounters) -> Dict[str, Any]:
+        calls = stored.get("calls", 0) + counters.calls
+        errors = stored.get("errors", 0) + counters.errors
+        total_latency_ms = stored.get("total_latency_ms", 0) + counters.total_latency_ms
+        metrics = {
+            "calls": calls,
+            "errors": errors,
+            "error_rate": round(errors / calls, 4) if calls else 0.0,
+            "total_latency_ms": total_latency_ms,
+            "avg_latency_ms": round(total_latency_ms / calls, 1) if calls else None,
+            "max_latency_ms": max(stored.get("max_latency_ms", 0), counters.max_latency_ms),
+            "p50_latency_ms": counters.percentile(0.5) or stored.get("p50_latency_ms"),
+            "p95_latency_ms": counters.percentile(0.95) or stored.get("p95_latency_ms"),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        return metrics
+
+    async def get_metrics(self, db: Optional[AsyncSession] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Métricas por modelo: lo persistido más lo que aún no se volcó.
+
+        Los percentiles son los de las llamadas recientes de este proceso.
+        """
+        stored: Dict[str, Dict[str, Any]] = {}
+        if db is not None:
+            try:
+                result = await db.execute(
+                    select(ModelRegistry.model_name, ModelRegistry.performance_metrics)
+                )
+                stored = {name: self._load_metrics(raw) for name, raw in result.all()}
+            except Exception as e:
+                logger.error(f"Error leyendo métricas de modelos: {e}")
+
+        metrics = {name: data for name, data in stored.items() if data}
+        for model, counters in self._pending.items():
+            metrics[model] = self._merge(metrics.get(model, {}), counters)
+        for model, counters in self._recent.items():
+            if model in metrics:
+                metrics[model]["p50_latency_ms"] = counters.percentile(0.5)
+                metrics[model]["p95_latency_ms"] = counters.percentile(0.95)
+            else:
+                metrics[model] = self._merge({}, counters)
+        return metrics
+
+
+# Instancia global
+model_performance = ModelPerformanceTracker()
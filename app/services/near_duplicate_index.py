@@ -0,0 +1,69 @@
+"""
+Índice LSH de casi duplicados sobre el contenido analizado.
+
+Las firmas y sus bandas se persisten en `content_signatures` y
+`content_lsh_bands`. Cada búsqueda consulta los buckets en la base de datos
+(índice sobre band_index, band_hash), así que ve las firmas que guardaron
+todos los workers e instancias sin mantener una copia en memoria.
+"""
+import logging
+from typing import Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.news import ContentLSHBand, ContentSignature
+from app.utils.near_duplicate import min_hasher
+
+logger = logging.getLogger(__name__)
+
+
+class NearDuplicateIndex:
+    """Búsqueda de análisis previos con contenido casi idéntico"""
+
+    def __init__(self):
+        self.threshold = settings.NEAR_DUPLICATE_THRESHOLD
+
+    async def _candidates(self, db: AsyncSession, band_keys: Sequence[Tuple[int, int]]) -> Dict[int, Tuple[int, ...]]:
+        """Análisis que comparten al menos una banda con la firma buscada"""
+        result = await db.execute(
+            select(ContentSignature.analysis_id, ContentSignature.signature)
+            .where(
+                ContentSignature.analysis_id.in_(
+                    select(ContentLSHBand.analysis_id).where(
+                        tuple_(ContentLSHBand.band_index, ContentLSHBand.band_hash).in_(band_keys)
+                    )
+                )
+            )
+        )
+        return {analysis_id: min_hasher.from_bytes(data) for analysis_id, data in result.all()}
+
+    async def find_similar(
+        self, db: AsyncSession, signature: Tuple[int, ...]
+    ) -> Optional[Tuple[int, float]]:
+        """
+        Devuelve (analysis_id, similitud) del análisis más parecido que supere
+        el umbral configurado, o None.
+        """
+        band_keys = list(enumerate(min_hasher.band_hashes(signature)))
+        candidates = await self._candidates(db, band_keys)
+
+        best = None
+        for analysis_id, candidate in candidates.items():
+            similarity = min_hasher.similarity(signature, candidate)
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (analysis_id, similarity)
+        return best
+
+    async def add(self, db: AsyncSession, analysis_id: int, signature: Tuple[int, ...]):
+        """Persiste la firma y sus bandas en la transacción actual"""
+        db.add(ContentSignature(analysis_id=analysis_id, signature=min_hasher.to_bytes(signature)))
+        db.add_all([
+            ContentLSHBand(analysis_id=analysis_id, band_index=band_index, band_hash=band_hash)
+            for band_index, band_hash in enumerate(min_hasher.band_hashes(signature))
+        ])
+
+
+# Instancia global
+near_duplicate_index = NearDuplicateIndex()
@@ -0,0 +1,253 @@
+"""
+Cuotas por proveedor para las APIs de fact-checking.
+
+Cada proveedor tiene un token bucket (requests por segundo con ráfaga), un
+semáforo de concurrencia y una cuota diaria, configurados en
+APIConfig.PROVIDER_LIMITS. El uso diario se acumula en memoria y se suma
+periódicamente a `provider_quota_usage`, de donde se relee el total (que
+incluye a las demás instancias). Un proveedor sin cuota o sin tokens dentro de
+RATE_LIMIT_MAX_WAIT se omite en lugar de esperar o arriesgar un bloqueo.
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config_apis import api_config
+from app.database import AsyncSessionLocal
+from app.models.news import ProviderQuotaUsage
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderQuotaExceeded(Exception):
+    """El proveedor no tiene cuota o tokens disponibles"""
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+class _TokenBucket:
+    """Token bucket con reservas: un token puede tomarse por adelantado si la espera es acotada"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """Reserva un token y devuelve cuánto esperar, o None si la espera supera max_wait"""
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        wait = max(0.0, (1 - self.tokens) / self.rate)
+        if wait > max_wait:
+            return None
+        self.tokens -= 1
+        return wait
+
+    def available(self) -> float:
+        if self.rate <= 0:
+            return float("inf")
+        self._refill()
+        return max(0.0, self.tokens)
+
+
+class _ProviderQuota:
+    """Estado de cuota de un proveedor"""
+
+    def __init__(self, name: str, limits: Dict[str, float]):
+        self.name = name
+        self.daily_quota = int(limits.get("daily_quota", 0))
+        self.max_concurrency = max(1, int(limits.get("max_concurrency", 1)))
+        self.bucket = _TokenBucket(float(limits.get("rate_per_second", 0)), int(limits.get("burst", 1)))
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.in_flight = 0
+        self.day = _today()
+        self.persisted_calls = 0  # Total del día según la BD (todas las instancias)
+        self.skipped: Dict[str, int] = defaultdict(int)
+
+    def used_today(self, pending: int) -> int:
+        return self.persisted_calls + pending
+
+    def roll_day(self):
+        today = _today()
+        if today != self.day:
+            self.day = today
+            self.persisted_calls = 0
+
+
+class ProviderQuotaManager:
+    """Aplica y contabiliza las cuotas de todos los proveedores"""
+
+    def __init__(self):
+        self._quotas: Dict[str, _ProviderQuota] = {}
+        self._pending: Dict[Tuple[str, date], int] = defaultdict(int)
+        self._flushing: Dict[Tuple[str, date], int] = {}  # Uso que se está escribiendo en la BD
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+    def get(self, provider: str) -> _ProviderQuota:
+        quota = self._quotas.get(provider)
+        if quota is None:
+            limits = api_config.PROVIDER_LIMITS.get(provider, {})
+            quota = self._quotas[provider] = _ProviderQuota(provider, limits)
+        return quota
+
+    def _used_today(self, quota: _ProviderQuota) -> int:
+        quota.roll_day()
+        key = (quota.name, quota.day)
+        return quota.used_today(self._pending.get(key, 0) + self._flushing.get(key, 0))
+
+    def check(self, provider: str) -> Optional[str]:
+        """Motivo por el que el proveedor no puede usarse ahora (None si puede)"""
+        quota = self.get(provider)
+        if quota.daily_quota and self._used_today(quota) >= quota.daily_quota:
+            return "Cuota diaria agotada"
+        available = quota.bucket.available()
+        if available < 1 and (1 - available) / quota.bucket.rate > api_config.RATE_LIMIT_MAX_WAIT:
+            return "Límite de requests por segundo"
+        return None
+
+    async def acquire(self, provider: str):
+        """
+        Toma un lugar para una llamada: cuota diaria, token y concurrencia.
+
+        Lanza ProviderQuotaExceeded si el proveedor está agotado; si no, hay que
+        llamar a release() al terminar la llamada.
+        """
+        quota = self.get(provider)
+        if quota.daily_quota and self._used_today(quota) >= quota.daily_quota:
+            quota.skipped["daily_quota"] += 1
+            raise ProviderQuotaExceeded(f"{provider}: cuota diaria agotada ({quota.daily_quota})")
+
+        wait = quota.bucket.reserve(api_config.RATE_LIMIT_MAX_WAIT)
+        if wait is None:
+            quota.skipped["rate_limit"] += 1
+            raise ProviderQuotaExceeded(f"{provider}: límite de requests por segundo")
+        if wait:
+            await asyncio.sleep(wait)
+
+        await quota.semaphore.acquire()
+        quota.in_flight += 1
+        # Cada intento consume cuota del proveedor, aunque falle
+        self._pending[(provider, quota.day)] += 1
+
+    def release(self, provider: str):
+        quota = self.get(provider)
+        quota.in_flight -= 1
+        quota.semaphore.release()
+
+    # --- Persistencia -------------------------------------------------------
+
+    async def start(self):
+        if self._task and not self._task.done():
+            return
+        # Carga el uso del día (otras instancias o reinicios)
+        await self.flush()
+        self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run_forever(self):
+        while True:
+            await asyncio.sleep(api_config.QUOTA_FLUSH_INTERVAL)
+            await self.flush()
+
+    async def flush(self, db: Optional[AsyncSession] = None):
+        """Suma el uso pendiente a la BD y relee los totales del día"""
+        async with self._flush_lock:
+            pending, self._pending = self._pending, defaultdict(int)
+            self._flushing = pending
+            try:
+                if db is not None:
+                    await self._persist(db, pending)
+                else:
+                    async with AsyncSessionLocal() as session:
+                        await self._persist(session, pending)
+            except Exception as e:
+                logger.error(f"Error guardando uso de cuotas: {e}")
+                # Reintentar en el próximo volcado
+                for key, calls in pending.items():
+                    self._pending[key] += calls
+            finally:
+                self._flushing = {}
+
+    async def _persist(self, db: AsyncSession, pending: Dict[Tuple[str, date], int]):
+        for (provider, day), calls in pending.items():
+            if not calls:
+                continue
+            result = await db.execute(
+                update(ProviderQuotaUsage)
+                .where(ProviderQuotaUsage.provider == provider, ProviderQuotaUsage.day == day)
+                .values(calls=ProviderQuotaUsage.calls + calls)
+            )
+            if result.rowcount == 0:
+                try:
+                    async with db.begin_nested():
+                        db.add(ProviderQuotaUsage(provider=provider, day=day, calls=calls))
+                except IntegrityError:
+                    # Otra instancia creó la fila en el medio
+                    await db.execute(
+                        update(ProviderQuotaUsage)
+                        .where(ProviderQuotaUsage.provider == provider, ProviderQuotaUsage.day == day)
+                        .values(calls=ProviderQuotaUsage.calls + calls)
+                    )
+        await db.commit()
+
+        today = _today()
+        result = await db.execute(
+            select(ProviderQuotaUsage.provider, ProviderQuotaUsage.calls)
+            .where(ProviderQuotaUsage.day == today)
+        )
+        for provider, calls in result.all():
+            quota = self.get(provider)
+            quota.roll_day()
+            quota.persisted_calls = calls
+
+    # --- Lectura ------------------------------------------------------------
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Presupuesto restante por proveedor configurado en PROVIDER_LIMITS"""
+        status = {}
+        for provider in api_config.PROVIDER_LIMITS:
+            quota = self.get(provider)
+            used = self._used_today(quota)
+            available = quota.bucket.available()
+            status[provider] = {
+                "daily_quota": quota.daily_quota or None,
+                "used_today": used,
+                "remaining_today": max(0, quota.daily_quota - used) if quota.daily_quota else None,
+                "rate_per_second": quota.bucket.rate,
+                "tokens_available": None if available == float("inf") else round(available, 2),
+                "max_concurrency": quota.max_concurrency,
+                "in_flight": quota.in_flight,
+                "skipped": dict(quota.skipped),
+                "available": self.check(provider) is None,
+            }
+        return status
+
+
+# Instancia global
+provider_quotas = ProviderQuotaManager()
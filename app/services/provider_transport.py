@@ -0,0 +1,252 @@
+"""
+Transporte HTTP común para los proveedores de fact-checking.
+
+Cada proveedor tiene una sesión aiohttp de larga vida con su propio pool de
+conexiones (keep-alive), reintentos con backoff exponencial y jitter ante
+errores de conexión y estados reintentables (429, 5xx), respeto del header
+Retry-After, y métricas uniformes de latencia y estados.
+"""
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Deque, Dict, Mapping, Optional
+
+import aiohttp
+
+from app.config_apis import api_config
+from app.services.provider_quota import ProviderQuotaExceeded, provider_quotas
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProviderResponse:
+    """Respuesta final de un proveedor (tras los reintentos)"""
+    status: Optional[int]  # None si no hubo respuesta (error de conexión o timeout)
+    data: Any = None       # JSON decodificado, si la respuesta lo era
+    text: str = ""
+    attempts: int = 1
+    latency_ms: int = 0
+    error: Optional[str] = None
+    skipped: bool = False  # No se llamó por falta de cuota
+
+    @property
+    def ok(self) -> bool:
+        return self.status is not None and 200 <= self.status < 300
+
+
+class _ProviderStats:
+    """Contadores de un proveedor"""
+
+    WINDOW = 500  # Latencias recientes para los percentiles
+
+    def __init__(self):
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.failures = 0
+        self.statuses: Dict[str, int] = defaultdict(int)
+        self.total_latency_ms = 0
+        self.recent: Deque[int] = deque(maxlen=self.WINDOW)
+
+    def percentile(self, fraction: float) -> Optional[int]:
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "failures": self.failures,
+            "statuses": dict(self.statuses),
+            "avg_latency_ms": round(self.total_latency_ms / self.calls, 1) if self.calls else None,
+            "p50_latency_ms": self.percentile(0.5),
+            "p95_latency_ms": self.percentile(0.95),
+        }
+
+
+class ProviderTransport:
+    """Sesión, reintentos y métricas de un proveedor"""
+
+    RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(self, name: str):
+        self.name = name
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stats = _ProviderStats()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # La sesión está atada a un event loop: se recrea si cambió (serverless, tests)
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=api_config.POOL_SIZE,
+                limit_per_host=api_config.POOL_SIZE,
+                keepalive_timeout=api_config.POOL_KEEPALIVE,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=api_config.REQUEST_TIMEOUT),
+            )
+            self._loop = loop
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Any = None,
+        headers: Optional[Mapping[str, str]] = None,
+        max_retries: Optional[int] = None,
+    ) -> ProviderResponse:
+        """
+        Hace la request reintentando errores de conexión y estados reintentables.
+
+        Nunca lanza excepciones de red: el resultado final (éxito o el último
+        error) se devuelve como ProviderResponse. Solo es skipped si no hubo
+        cuota para el primer intento; si se agota entre reintentos se devuelve
+        el error real del intento anterior.
+        """
+        retries = api_config.MAX_RETRIES if max_retries is None else max_retries
+        start = time.monotonic()
+        attempt = 0
+        last_failure: Optional[ProviderResponse] = None
+        while True:
+            try:
+                await provider_quotas.acquire(self.name)
+            except ProviderQuotaExceeded as e:
+                if last_failure is not None:
+                    logger.warning(f"{self.name}: sin cuota para reintentar ({e})")
+                    return self._finish(last_failure, start)
+                self._stats.statuses["quota_skipped"] += 1
+                return self._finish(ProviderResponse(
+                    status=None, attempts=attempt, error=str(e), skipped=True
+                ), start)
+            attempt += 1
+            self._stats.attempts += 1
+            retry_after = None
+            try:
+                async with self._get_session().request(
+                    method, url, params=params, json=json, headers=headers
+                ) as response:
+                    text = await response.text()
+                    status = response.status
+                    self._stats.statuses[str(status)] += 1
+                    if status not in self.RETRYABLE_STATUSES or attempt > retries:
+                        return self._finish(ProviderResponse(
+                            status=status,
+                            data=self._decode(text),
+                            text=text,
+                            attempts=attempt,
+                            error=None if 200 <= status < 300 else f"API error: {status}",
+                        ), start)
+                    retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+                    reason = f"HTTP {status}"
+                    last_failure = ProviderResponse(
+                        status=status, data=self._decode(text), text=text, attempts=attempt, error=f"API error: {status}"
+                    )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self._stats.statuses["connection_error"] += 1
+                reason = str(e) or type(e).__name__
+                last_failure = ProviderResponse(status=None, attempts=attempt, error=reason)
+                if attempt > retries:
+                    return self._finish(last_failure, start)
+            finally:
+                provider_quotas.release(self.name)
+
+            delay = self._backoff(attempt, retry_after)
+            if delay is None:
+                # El proveedor pidió esperar más de lo que tolera una request
+                return self._finish(ProviderResponse(
+                    status=status, attempts=attempt, error=f"Retry-After excede el máximo ({retry_after:.0f}s)"
+                ), start)
+            self._stats.retries += 1
+            logger.warning(f"{self.name}: {reason}; reintento {attempt}/{retries} en {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _decode(text: str) -> Any:
+        try:
+            return json.loads(text) if text else None
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: Optional[float]) -> Optional[float]:
+        """Espera antes del reintento: Retry-After si vino, si no backoff exponencial con jitter"""
+        if retry_after is not None:
+            if retry_after > api_config.RETRY_AFTER_MAX:
+                return None
+            return retry_after
+        ceiling = min(api_config.RETRY_BACKOFF_MAX, api_config.RETRY_BACKOFF_BASE * 2 ** (attempt - 1))
+        # "Full jitter": evita que los clientes reintenten todos a la vez
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Retry-After en segundos o como fecha HTTP"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+    def _finish(self, result: ProviderResponse, start: float) -> ProviderResponse:
+        result.latency_ms = int((time.monotonic() - start) * 1000)
+        self._stats.calls += 1
+        self._stats.failures += 0 if result.ok else 1
+        self._stats.total_latency_ms += result.latency_ms
+        self._stats.recent.append(result.latency_ms)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return self._stats.to_dict()
+
+
+class ProviderTransports:
+    """Registro de transportes, uno por proveedor"""
+
+    def __init__(self):
+        self._transports: Dict[str, ProviderTransport] = {}
+
+    def get(self, name: str) -> ProviderTransport:
+        transport = self._transports.get(name)
+        if transport is None:
+            transport = self._transports[name] = ProviderTransport(name)
+        return transport
+
+    async def close(self):
+        await asyncio.gather(*(transport.close() for transport in self._transports.values()))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: transport.stats() for name, transport in self._transports.items()}
+
+
+# Instancia global
+provider_transports = ProviderTransports()
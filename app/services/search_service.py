@@ -0,0 +1,193 @@
+"""
+Búsqueda de texto completo sobre los análisis históricos.
+
+En PostgreSQL usa la columna `analysis_contents.search_vector` (tsvector con
+las configuraciones spanish + english, índice GIN) y ordena con ts_rank.
+En SQLite usa una tabla virtual FTS5 como fallback (tests y desarrollo local);
+FTS5 no distingue idiomas, así que ahí `language` no filtra. La tabla FTS5 se
+crea con la primera escritura o búsqueda de cada base, e indexa entonces los
+contenidos que ya estaban guardados.
+"""
+import logging
+import re
+import weakref
+from typing import List, Optional, Tuple
+
+from sqlalchemy import cast, func, literal, select, text
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.news import AnalysisContent, NewsAnalysis
+
+logger = logging.getLogger(__name__)
+
+
+class SearchNotSupported(Exception):
+    """La base de datos no tiene búsqueda full-text"""
+
+
+class SearchService:
+    """Indexación y búsqueda full-text de contenidos analizados"""
+
+    # Configuraciones de PostgreSQL por idioma soportado
+    LANGUAGE_CONFIGS = {"es": "spanish", "en": "english"}
+
+    SQLITE_FTS_TABLE = "analysis_contents_fts"
+
+    _FTS_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+    # Contenidos por lote al indexar los que existían antes de la tabla FTS5
+    BACKFILL_BATCH = 500
+
+    def __init__(self):
+        # Engines cuya tabla FTS5 ya existe y está completa
+        self._sqlite_ready: "weakref.WeakSet" = weakref.WeakSet()
+
+    @staticmethod
+    def _dialect(db: AsyncSession) -> str:
+        return db.bind.dialect.name if db.bind is not None else ""
+
+    # --- Indexación -------------------------------------------------------
+
+    def tsvector_expression(self, content: str):
+        """Expresión SQL del tsvector (spanish || english) para un texto"""
+        vectors = [
+            func.to_tsvector(cast(literal(config), REGCONFIG), content)
+            for config in self.LANGUAGE_CONFIGS.values()
+        ]
+        expression = vectors[0]
+        for vector in vectors[1:]:
+            expression = expression.op("||")(vector)
+        return expression
+
+    async def ensure_sqlite_index(self, db: AsyncSession):
+        """
+        Crea la tabla FTS5 si no existe e indexa los contenidos que falten (solo SQLite).
+
+        Se hace una vez por engine; después index_sqlite mantiene el índice al día.
+        """
+        engine = db.bind.sync_engine if db.bind is not None else None
+        if engine is not None and engine in self._sqlite_ready:
+            return
+        await db.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.SQLITE_FTS_TABLE} "
+            "USING fts5(content_hash UNINDEXED, body, tokenize='unicode61 remove_diacritics 2')"
+        ))
+        await self._backfill_sqlite(db)
+        if engine is not None:
+            self._sqlite_ready.add(engine)
+
+    async def _backfill_sqlite(self, db: AsyncSession):
+        """Indexa los contenidos guardados antes de que existiera la tabla FTS5"""
+        # Import local: content_store importa este módulo
+        from app.services.content_store import ContentStore
+
+        result = await db.execute(
+            select(AnalysisContent.content_hash, AnalysisContent.compression, AnalysisContent.data)
+            .where(AnalysisContent.content_hash.not_in(
+                select(text("content_hash")).select_from(text(self.SQLITE_FTS_TABLE))
+            ))
+        )
+        indexed = 0
+        while True:
+            rows = result.fetchmany(self.BACKFILL_BATCH)
+            if not rows:
+                break
+            await db.execute(
+                text(f"INSERT INTO {self.SQLITE_FTS_TABLE} (content_hash, body) VALUES (:hash, :body)"),
+                [
+                    {"hash": content_hash, "body": ContentStore.decompress(data, compression)}
+                    for content_hash, compression, data in rows
+                ]
+            )
+            indexed += len(rows)
+        if indexed:
+            logger.info(f"Índice FTS5: {indexed} contenidos existentes indexados")
+
+    async def index_sqlite(self, db: AsyncSession, content_hash: str, content: str):
+        """Agrega un contenido nuevo al índice FTS5"""
+        await self.ensure_sqlite_index(db)
+        await db.execute(
+            text(f"INSERT INTO {self.SQLITE_FTS_TABLE} (content_hash, body) VALUES (:hash, :body)"),
+            {"hash": content_hash, "body": content}
+        )
+
+    # --- Búsqueda ---------------------------------------------------------
+
+    def fts5_query(self, query: str) -> Optional[str]:
+        """Convierte texto libre en una consulta FTS5 segura (AND de términos)"""
+        tokens = self._FTS_TOKEN_RE.findall(query)
+        if not tokens:
+            return None
+        return " ".join(f'"{token}"' for token in tokens)
+
+    def _pg_tsquery(self, query: str, language: Optional[str]):
+        configs = (
+            [self.LANGUAGE_CONFIGS[language]] if language else list(self.LANGUAGE_CONFIGS.values())
+        )
+        tsqueries = [
+            func.websearch_to_tsquery(cast(literal(config), REGCONFIG), query)
+            for config in configs
+        ]
+        tsquery = tsqueries[0]
+        for other in tsqueries[1:]:
+            tsquery = tsquery.op("||")(other)
+        return tsquery
+
+    async def search(
+        self,
+        db: AsyncSession,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        language: Optional[str] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Busca análisis cuyo contenido coincide con la consulta.
+
+        `language` restringe la consulta a la configuración de ese idioma en
+        PostgreSQL; en SQLite (FTS5) se ignora. Lanza SearchNotSupported con
+        otras bases de datos.
+
+        Returns:
+            Lista de (analysis_id, rank) ordenada por relevancia descendente.
+        """
+        dialect = self._dialect(db)
+
+        if dialect == "postgresql":
+            tsquery = self._pg_tsquery(query, language)
+            rank = func.ts_rank(AnalysisContent.search_vector, tsquery).label("rank")
+            result = await db.execute(
+                select(NewsAnalysis.id, rank)
+                .join(AnalysisContent, NewsAnalysis.content_hash == AnalysisContent.content_hash)
+                .where(AnalysisContent.search_vector.op("@@")(tsquery))
+                .order_by(rank.desc(), NewsAnalysis.created_at.desc(), NewsAnalysis.id.desc())
+                .limit(limit)
+                .offset(offset)
+            )
+            return [(row.id, float(row.rank)) for row in result.all()]
+
+        if dialect == "sqlite":
+            fts_query = self.fts5_query(query)
+            if not fts_query:
+                return []
+            await self.ensure_sqlite_index(db)
+            # bm25() devuelve valores negativos: más negativo = más relevante
+            result = await db.execute(
+                text(
+                    f"SELECT n.id AS id, -bm25({self.SQLITE_FTS_TABLE}) AS rank "
+                    f"FROM {self.SQLITE_FTS_TABLE} "
+                    f"JOIN news_analyses n ON n.content_hash = {self.SQLITE_FTS_TABLE}.content_hash "
+                    f"WHERE {self.SQLITE_FTS_TABLE} MATCH :query "
+                    "ORDER BY rank DESC, n.created_at DESC, n.id DESC "
+                    "LIMIT :limit OFFSET :offset"
+                ),
+                {"query": fts_query, "limit": limit, "offset": offset}
+            )
+            return [(row.id, float(row.rank)) for row in result.all()]
+
+        raise SearchNotSupported(f"Búsqueda full-text no soportada para {dialect or 'esta base de datos'}")
+
+
+# Instancia global
+search_service = SearchService()
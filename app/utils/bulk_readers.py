@@ -0,0 +1,160 @@
+"""
+Lectura en streaming de lotes de artículos (JSONL, CSV o ZIP de textos).
+
+BulkReader recorre el archivo de a un ítem, sin cargarlo entero: las líneas
+JSONL y los campos CSV se leen con un tope de tamaño, y los miembros de un
+ZIP se descomprimen de a uno (un .txt por artículo, o .jsonl/.csv anidados).
+Los ítems inválidos no cortan la lectura: se entregan con `error`.
+"""
+import csv
+import io
+import json
+import os
+import zipfile
+from dataclasses import dataclass
+from typing import IO, Any, Dict, Iterator, Optional
+
+FORMATS = {
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".csv": "csv",
+    ".zip": "zip",
+}
+
+# Campos aceptados para el texto y la URL de cada artículo, en orden de preferencia
+TEXT_FIELDS = ("text", "content", "body")
+URL_FIELDS = ("url", "source_url")
+
+# Margen para escapes JSON y campos extra sobre el largo máximo del texto
+_LINE_OVERHEAD = 4
+
+
+@dataclass
+class BulkItem:
+    """Artículo leído del lote; ref identifica su posición (línea, fila o miembro)"""
+    ref: str
+    text: Optional[str] = None
+    url: Optional[str] = None
+    error: Optional[str] = None
+    id: Optional[str] = None  # Campo 'id' del registro, si lo trae
+
+
+def detect_format(filename: str) -> Optional[str]:
+    return FORMATS.get(os.path.splitext(filename.lower())[1])
+
+
+class BulkReader:
+    """
+    Itera los artículos de un archivo de lote.
+
+    `position` y `size` (bytes del archivo) permiten informar el progreso
+    mientras se recorre.
+    """
+
+    def __init__(self, path: str, fmt: str, max_chars: int):
+        if fmt not in FORMATS.values():
+            raise ValueError(f"Formato de lote no soportado: {fmt}")
+        self.path = path
+        self.format = fmt
+        self.max_chars = max_chars
+        self.size = os.path.getsize(path)
+        self.position = 0
+
+    def __iter__(self) -> Iterator[BulkItem]:
+        if self.format == "zip":
+            yield from self._iter_zip()
+            return
+        with open(self.path, "rb") as raw:
+            stream = io.TextIOWrapper(raw, encoding="utf-8", errors="replace", newline="")
+            for item in self._iter_stream(stream, self.format, ""):
+                self.position = raw.tell()
+                yield item
+        self.position = self.size
+
+    def _iter_stream(self, stream: IO[str], fmt: str, prefix: str) -> Iterator[BulkItem]:
+        if fmt == "jsonl":
+            return self._iter_jsonl(stream, prefix)
+        return self._iter_csv(stream, prefix)
+
+    def _iter_jsonl(self, stream: IO[str], prefix: str) -> Iterator[BulkItem]:
+        limit = self.max_chars * _LINE_OVERHEAD
+        number = 0
+        while True:
+            line = stream.readline(limit)
+            if not line:
+                return
+            number += 1
+            ref = f"{prefix}{number}"
+            if len(line) >= limit and not line.endswith("\n"):
+                # Descartar el resto de la línea sin acumularla
+                while True:
+                    rest = stream.readline(limit)
+                    if not rest or rest.endswith("\n"):
+                        break
+                yield BulkItem(ref, error="Línea demasiado larga")
+                continue
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield BulkItem(ref, error=f"JSON inválido: {e}")
+                continue
+            if not isinstance(record, dict):
+                yield BulkItem(ref, error="Cada línea debe ser un objeto JSON")
+                continue
+            yield self._item(ref, record)
+
+    def _iter_csv(self, stream: IO[str], prefix: str) -> Iterator[BulkItem]:
+        # El límite del módulo csv es global; solo se amplía
+        csv.field_size_limit(max(csv.field_size_limit(), self.max_chars * _LINE_OVERHEAD))
+        reader = csv.DictReader(stream)
+        row = 1  # La fila 1 es el encabezado
+        while True:
+            row += 1
+            try:
+                record = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                yield BulkItem(f"{prefix}{row}", error=f"CSV inválido: {e}")
+                continue
+            yield self._item(f"{prefix}{row}", record)
+
+    def _iter_zip(self) -> Iterator[BulkItem]:
+        with zipfile.ZipFile(self.path) as archive:
+            for info in archive.infolist():
+                name = info.filename
+                basename = os.path.basename(name)
+                if info.is_dir() or not basename or basename.startswith(".") or name.startswith("__MACOSX/"):
+                    continue
+                extension = os.path.splitext(basename.lower())[1]
+                if extension == ".txt":
+                    yield self._zip_text(archive, info)
+                elif FORMATS.get(extension) in ("jsonl", "csv"):
+                    with archive.open(info) as member:
+                        stream = io.TextIOWrapper(member, encoding="utf-8", errors="replace", newline="")
+                        yield from self._iter_stream(stream, FORMATS[extension], f"{name}:")
+                else:
+                    yield BulkItem(name, error=f"Tipo de archivo no soportado en el ZIP: {extension or name}")
+                self.position += info.compress_size
+        self.position = self.size
+
+    def _zip_text(self, archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> BulkItem:
+        # UTF-8 usa hasta 4 bytes por carácter; se lee uno más para detectar el exceso
+        limit = self.max_chars * 4
+        with archive.open(info) as member:
+            data = member.read(limit + 1)
+        if len(data) > limit:
+            return BulkItem(info.filename, error="Texto muy largo")
+        return BulkItem(info.filename, text=data.decode("utf-8", errors="ignore"))
+
+    def _item(self, ref: str, record: Dict[str, Any]) -> BulkItem:
+        text = next((record[f] for f in TEXT_FIELDS if isinstance(record.get(f), str) and record[f].strip()), None)
+        url = next((record[f] for f in URL_FIELDS if isinstance(record.get(f), str) and record[f].strip()), None)
+        record_id = str(record["id"]) if record.get("id") not in (None, "") else None
+        if text is None:
+            return BulkItem(ref, url=url, id=record_id, error=f"Sin texto (campos: {', '.join(TEXT_FIELDS)})")
+        if len(text) > self.max_chars:
+            return BulkItem(ref, url=url, id=record_id, error="Texto muy largo")
+        return BulkItem(ref, text=text, url=url, id=record_id)
@@ -0,0 +1,143 @@
+"""
+Selección de oraciones verificables (check-worthy) de un artículo
+"""
+import re
+from dataclasses import dataclass
+from typing import Iterable, List
+
+
+@dataclass
+class ScoredSentence:
+    """Oración del artículo con su puntaje de verificabilidad (0-1)"""
+    index: int
+    text: str
+    score: float
+
+
+class ClaimSelector:
+    """
+    Divide un artículo en oraciones y puntúa cuáles contienen afirmaciones
+    verificables con una heurística local: cifras, fechas, atribuciones a
+    fuentes, comparaciones y relaciones causales suben el puntaje; preguntas y
+    opiniones en primera persona lo bajan.
+    """
+
+    MIN_WORDS = 5
+    MAX_CHARS = 300  # Las consultas a Google se recortan a este largo
+
+    # Fin de oración: puntuación seguida de espacio y un inicio de oración
+    _BOUNDARY_RE = re.compile(r'([.!?…]+["”»)\]]*)\s+(?=[¿¡"“«(\[]?[A-ZÁÉÍÓÚÑ0-9])')
+    _LAST_WORD_RE = re.compile(r'(\S+)$')
+    _ABBREVIATIONS = {
+        'sr.', 'sra.', 'srta.', 'dr.', 'dra.', 'lic.', 'ing.', 'prof.', 'gral.', 'etc.',
+        'ee.uu.', 'p.ej.', 'núm.', 'mr.', 'mrs.', 'ms.', 'st.', 'vs.', 'u.s.', 'e.g.', 'i.e.',
+    }
+    # Abreviaturas que también son palabras: solo cuentan antes de un número ("No. 5")
+    _NUMBER_ABBREVIATIONS = {'no.'}
+
+    _NUMBER_RE = re.compile(r'\d+(?:[.,]\d+)*\s*(?:%|por ciento|percent|millones|millions?|mil\b|billion)?', re.IGNORECASE)
+    _YEAR_RE = re.compile(r'\b(?:19|20)\d{2}\b')
+    _ENTITY_RE = re.compile(r'(?<=\s)[A-ZÁÉÍÓÚÑ][a-záéíóúñ]+')
+
+    ATTRIBUTION_WORDS = [
+        'según', 'afirmó', 'aseguró', 'declaró', 'anunció', 'informó', 'reveló', 'confirmó',
+        'dijo', 'sostuvo', 'de acuerdo con', 'datos de', 'informe', 'estudio',
+        'according to', 'said', 'stated', 'announced', 'reported', 'claimed', 'confirmed',
+        'report', 'study', 'data from',
+    ]
+    COMPARISON_WORDS = [
+        'más que', 'menos que', 'mayor', 'menor', 'récord', 'el primero', 'la primera',
+        'nunca', 'siempre', 'todos', 'ningún', 'aumentó', 'disminuyó', 'duplicó', 'triplicó',
+        'more than', 'less than', 'largest', 'highest', 'lowest', 'record', 'never', 'always',
+        'increased', 'decreased', 'doubled', 'tripled',
+    ]
+    CAUSAL_WORDS = [
+        'causa', 'provoca', 'cura', 'previene', 'produce', 'genera', 'mata',
+        'causes', 'cures', 'prevents', 'leads to', 'kills',
+    ]
+    OPINION_WORDS = [
+        'creo que', 'pienso que', 'opino', 'en mi opinión', 'me parece', 'ojalá', 'debería',
+        'i think', 'i believe', 'in my opinion', 'i feel', 'should',
+    ]
+
+    def __init__(self):
+        self._attribution_re = self._word_list_re(self.ATTRIBUTION_WORDS)
+        self._comparison_re = self._word_list_re(self.COMPARISON_WORDS)
+        self._causal_re = self._word_list_re(self.CAUSAL_WORDS)
+        self._opinion_re = self._word_list_re(self.OPINION_WORDS)
+
+    @staticmethod
+    def _word_list_re(words: List[str]) -> re.Pattern:
+        return re.compile(r'\b(?:' + '|'.join(re.escape(word) for word in words) + r')\b')
+
+    def split_sentences(self, text: str) -> List[str]:
+        """Divide el texto en oraciones, sin cortar en abreviaturas comunes"""
+        sentences: List[str] = []
+        start = 0
+        for match in self._BOUNDARY_RE.finditer(text):
+            end = match.end(1)
+            last_word = self._LAST_WORD_RE.search(text[start:end])
+            if last_word:
+                word = last_word.group(1).lower()
+                if word in self._ABBREVIATIONS:
+                    continue
+                if word in self._NUMBER_ABBREVIATIONS and text[match.end()].isdigit():
+                    continue
+            sentence = " ".join(text[start:end].split())
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+        tail = " ".join(text[start:].split())
+        if tail:
+            sentences.append(tail)
+        return sentences
+
+    def heuristic_score(self, sentence: str) -> float:
+        """Puntaje de verificabilidad 0-1 de una oración"""
+        words = sentence.split()
+        if len(words) < self.MIN_WORDS:
+            return 0.0
+        lower = sentence.lower()
+
+        score = 0.1
+        if self._NUMBER_RE.search(sentence):
+            score += 0.3
+        if self._YEAR_RE.search(sentence):
+            score += 0.1
+        if self._attribution_re.search(lower):
+            score += 0.15
+        if self._comparison_re.search(lower):
+            score += 0.15
+        if self._causal_re.search(lower):
+            score += 0.1
+        score += min(0.2, 0.05 * len(self._ENTITY_RE.findall(sentence)))
+
+        if sentence.rstrip().endswith('?') or sentence.lstrip().startswith('¿'):
+            score -= 0.3
+        if self._opinion_re.search(lower):
+            score -= 0.3
+        return round(max(0.0, min(1.0, score)), 4)
+
+    def score(self, sentences: Iterable[str]) -> List[ScoredSentence]:
+        return [
+            ScoredSentence(index=index, text=sentence, score=self.heuristic_score(sentence))
+            for index, sentence in enumerate(sentences)
+        ]
+
+    def top_k(self, scored: Iterable[ScoredSentence], k: int, min_score: float) -> List[ScoredSentence]:
+        """Las k oraciones más verificables con puntaje >= min_score (sin repetidas)"""
+        seen = set()
+        selected = []
+        for sentence in sorted(scored, key=lambda s: (-s.score, s.index)):
+            key = sentence.text.lower()
+            if sentence.score < min_score or key in seen:
+                continue
+            seen.add(key)
+            selected.append(sentence)
+            if len(selected) >= k:
+                break
+        return selected
+
+
+# Instancia global
+claim_selector = ClaimSelector()
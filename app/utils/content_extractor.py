@@ -8,10 +8,10 @@ except ImportError:
 
 from bs4 import BeautifulSoup
 import re
-import asyncio
 import aiohttp
 from typing import Optional, Tuple
 from app.config import settings
+from app.utils.worker_pool import worker_pool
 import logging
 
 logger = logging.getLogger(__name__)
@@ -62,14 +62,10 @@ class ContentExtractor:
             if not NEWSPAPER_AVAILABLE:
                 return None, False
             
-            # Usar asyncio.to_thread para evitar problemas de event loop en serverless
-            try:
-                article = await asyncio.to_thread(self._newspaper_extract_sync, url)
-            except AttributeError:
-                # Fallback para Python < 3.9 o ambientes sin to_thread
-                # En serverless de Vercel, mejor no usar newspaper
-                logger.warning("asyncio.to_thread no disponible, saltando newspaper")
-                return None, False
+            # newspaper3k es bloqueante: corre en el pool de hilos acotado
+            article = await worker_pool.run_blocking(
+                "newspaper", self._newspaper_extract_sync, url, timeout=self.timeout
+            )
             
             if article and article.text:
                 # Limpiar y truncar contenido
@@ -105,25 +101,34 @@ class ContentExtractor:
                         return None, False
                     
                     html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Remover scripts, styles y otros elementos no deseados
-                    for script in soup(["script", "style", "nav", "header", "footer", "aside"]):
-                        script.decompose()
-                    
-                    # Buscar contenido en orden de prioridad
-                    content = self._extract_article_content(soup)
-                    
-                    if content:
-                        content = self._clean_content(content)
-                        return content, True
-                    
-                    return None, False
+            
+            # El parseo es CPU-bound: corre en el pool de workers
+            content = await worker_pool.run("html_parse", extract_article_text, html)
+            if content:
+                return content, True
+            
+            return None, False
                     
         except Exception as e:
             logger.error(f"Error extrayendo con BeautifulSoup: {e}")
             return None, False
     
+    def parse_html(self, html: str) -> Optional[str]:
+        """Parsea el HTML y devuelve el contenido del artículo ya limpio"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Remover scripts, styles y otros elementos no deseados
+        for script in soup(["script", "style", "nav", "header", "footer", "aside"]):
+            script.decompose()
+        
+        # Buscar contenido en orden de prioridad
+        content = self._extract_article_content(soup)
+        
+        if content:
+            return self._clean_content(content)
+        
+        return None
+    
     def _extract_article_content(self, soup: BeautifulSoup) -> Optional[str]:
         """Extrae el contenido del artículo usando selectores comunes"""
         
@@ -225,4 +230,9 @@ class ContentExtractor:
         return True
 
 # Instancia global del extractor
-content_extractor = ContentExtractor()
\ No newline at end of file
+content_extractor = ContentExtractor()
+
+
+def extract_article_text(html: str) -> Optional[str]:
+    """Punto de entrada serializable de parse_html para el pool de procesos"""
+    return content_extractor.parse_html(html)
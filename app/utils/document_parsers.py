@@ -0,0 +1,179 @@
+"""
+Parsers de documentos subidos (PDF, DOCX y RTF).
+
+Cada parser es un generador que produce el texto de a una página (PDF) o
+párrafo (DOCX, RTF), para que quien lo consume pueda cortar apenas junta
+MAX_CONTENT_LENGTH caracteres sin procesar el resto del documento. Corren en
+el sandbox de worker_pool.stream(), así que deben ser funciones de módulo.
+"""
+import codecs
+import re
+import zipfile
+from typing import Iterator, List, Optional
+from xml.etree import ElementTree
+
+try:
+    from pypdf import PdfReader
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+
+class UnsupportedDocument(Exception):
+    """Formato sin parser disponible"""
+
+
+def iter_pdf_pages(path: str) -> Iterator[str]:
+    """Texto de cada página del PDF"""
+    if not PYPDF_AVAILABLE:
+        raise UnsupportedDocument("Soporte de PDF no disponible (instalar pypdf)")
+    reader = PdfReader(path)
+    if reader.is_encrypted:
+        # Muchos PDFs vienen cifrados con contraseña de usuario vacía
+        reader.decrypt("")
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def iter_docx_paragraphs(path: str) -> Iterator[str]:
+    """Texto de cada párrafo de word/document.xml, leído con iterparse"""
+    with zipfile.ZipFile(path) as archive:
+        with archive.open("word/document.xml") as document:
+            parts: List[str] = []
+            for event, element in ElementTree.iterparse(document, events=("end",)):
+                tag = element.tag
+                if tag == f"{_W}t":
+                    parts.append(element.text or "")
+                elif tag == f"{_W}tab":
+                    parts.append("\t")
+                elif tag in (f"{_W}br", f"{_W}cr"):
+                    parts.append("\n")
+                elif tag == f"{_W}p":
+                    yield "".join(parts)
+                    parts = []
+                    # Los párrafos ya leídos no se necesitan más
+                    element.clear()
+            if parts:
+                yield "".join(parts)
+
+
+# Destinos RTF que no son texto del documento
+_RTF_SKIP_DESTINATIONS = {
+    "fonttbl", "colortbl", "stylesheet", "info", "pict", "object", "themedata",
+    "colorschememapping", "datastore", "latentstyles", "listtable", "listoverridetable",
+    "rsidtbl", "generator", "header", "headerl", "headerr", "headerf",
+    "footer", "footerl", "footerr", "footerf", "fldinst", "xmlnstbl", "filetbl",
+}
+_RTF_SYMBOLS = {
+    "tab": "\t", "line": "\n", "emdash": "\u2014", "endash": "\u2013",
+    "lquote": "\u2018", "rquote": "\u2019", "ldblquote": "\u201c", "rdblquote": "\u201d",
+    "bullet": "\u2022", "emspace": " ", "enspace": " ", "qmspace": " ",
+}
+_RTF_TOKEN_RE = re.compile(
+    r"\\([a-zA-Z]+)(-?\d+)? ?"  # palabra de control con parámetro opcional
+    r"|\\'([0-9a-fA-F]{2})"     # byte en la página de códigos del documento
+    r"|\\([^a-zA-Z])"           # símbolo de control
+    r"|([{}])"
+    r"|([^\\{}\r\n]+)"
+    r"|[\r\n]+"
+)
+
+
+def iter_rtf_paragraphs(path: str) -> Iterator[str]:
+    """Texto de cada párrafo (\\par) de un RTF"""
+    with open(path, "rb") as f:
+        data = f.read().decode("latin-1")
+
+    encoding = "cp1252"
+    stack = []
+    ignorable = False
+    uc_skip = 1  # Caracteres de reemplazo después de cada \uN
+    pending_skip = 0
+    parts: List[str] = []
+
+    def emit(text: str):
+        nonlocal pending_skip
+        if ignorable:
+            return
+        if pending_skip:
+            dropped = min(pending_skip, len(text))
+            pending_skip -= dropped
+            text = text[dropped:]
+        if text:
+            parts.append(text)
+
+    for match in _RTF_TOKEN_RE.finditer(data):
+        word, param, hex_byte, symbol, brace, text = match.groups()
+        if brace == "{":
+            stack.append((ignorable, uc_skip))
+        elif brace == "}":
+            if stack:
+                ignorable, uc_skip = stack.pop()
+        elif word is not None:
+            if word in _RTF_SKIP_DESTINATIONS:
+                ignorable = True
+            elif ignorable:
+                continue
+            elif word in ("par", "sect", "page"):
+                yield "".join(parts)
+                parts = []
+                pending_skip = 0
+            elif word in _RTF_SYMBOLS:
+                emit(_RTF_SYMBOLS[word])
+            elif word == "ansicpg" and param:
+                encoding = _rtf_encoding(param) or encoding
+            elif word == "uc" and param:
+                uc_skip = int(param)
+            elif word == "u" and param:
+                code = int(param)
+                emit(chr(code + 65536 if code < 0 else code))
+                pending_skip = uc_skip
+        elif hex_byte is not None:
+            if pending_skip and not ignorable:
+                pending_skip -= 1
+            else:
+                emit(bytes([int(hex_byte, 16)]).decode(encoding, errors="replace"))
+        elif symbol is not None:
+            if symbol == "*":
+                ignorable = True
+            elif symbol == "~":
+                emit("\u00a0")
+            elif symbol == "_":
+                emit("-")
+            elif symbol in "\\{}":
+                emit(symbol)
+        elif text is not None:
+            emit(text)
+    if parts:
+        yield "".join(parts)
+
+
+def _rtf_encoding(codepage: str) -> Optional[str]:
+    try:
+        return codecs.lookup(f"cp{codepage}").name
+    except LookupError:
+        return None
+
+
+PARSERS = {
+    ".pdf": iter_pdf_pages,
+    ".docx": iter_docx_paragraphs,
+    ".rtf": iter_rtf_paragraphs,
+}
+
+
+def ensure_supported(extension: str):
+    """Falla antes de leer el archivo si no hay parser para la extensión"""
+    if extension not in PARSERS:
+        raise UnsupportedDocument(f"Formato {extension} no soportado")
+    if extension == ".pdf" and not PYPDF_AVAILABLE:
+        raise UnsupportedDocument("Soporte de PDF no disponible (instalar pypdf)")
+
+
+def iter_document(path: str, extension: str) -> Iterator[str]:
+    """Texto del documento por página o párrafo según su extensión"""
+    ensure_supported(extension)
+    return PARSERS[extension](path)
@@ -0,0 +1,49 @@
+"""
+Normalización de dominios de fuentes de noticias
+"""
+import ipaddress
+from typing import Optional
+from urllib.parse import urlsplit
+
+
+# Sufijos públicos de dos niveles frecuentes entre los medios que analizamos.
+# Para ellos el dominio registrable tiene tres etiquetas (p. ej. 'bbc.co.uk').
+_MULTI_LABEL_SUFFIXES = {
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "me.uk",
+    "com.ar", "gob.ar", "org.ar", "net.ar", "edu.ar",
+    "com.mx", "gob.mx", "org.mx", "edu.mx",
+    "com.br", "gov.br", "org.br",
+    "com.co", "gov.co", "org.co",
+    "com.pe", "gob.pe", "com.ve", "gob.ve", "com.uy", "gub.uy",
+    "com.ec", "gob.ec", "com.py", "com.bo", "gob.bo",
+    "com.gt", "com.do", "com.pa", "com.sv", "com.hn", "com.ni", "co.cr", "go.cr", "com.cu",
+    "gob.cl", "gob.es", "com.es", "org.es", "nom.es",
+    "com.au", "net.au", "org.au", "co.nz", "co.jp", "co.in", "co.za",
+}
+
+
+def registrable_domain(value: str) -> Optional[str]:
+    """
+    Dominio registrable de una URL o host: 'https://www.bbc.co.uk/news' ->
+    'bbc.co.uk', 'edition.cnn.com' -> 'cnn.com'. None si no hay host válido.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    host = urlsplit(value if "//" in value else f"//{value}").hostname
+    if not host:
+        return None
+    host = host.rstrip(".").lower()
+
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+
+    labels = [label for label in host.split(".") if label]
+    if len(labels) < 2:
+        return None
+    if ".".join(labels[-2:]) in _MULTI_LABEL_SUFFIXES and len(labels) >= 3:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
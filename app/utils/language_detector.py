@@ -0,0 +1,101 @@
+"""
+Identificación de idioma en proceso con perfiles de n-gramas de caracteres
+"""
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+# Trigramas más frecuentes de cada idioma, en orden de frecuencia. Los
+# espacios marcan inicio y fin de palabra.
+_PROFILES: Dict[str, List[str]] = {
+    "es": [
+        " de", "de ", " la", "la ", "que", " qu", "ue ", " el", "el ", " en",
+        "en ", "os ", "es ", "as ", " co", " se", "ión", "ón ", "ent", "ció",
+        " lo", "los", "del", "con", " pr", "ado", "do ", "ra ", " po", "por",
+        "or ", "nte", " es", "ar ", " un", "una", "na ", "est", "to ", "ta ",
+        "las", " a ", "aci", " re", "ero", "par", " pa", "ara", "ien", "ici",
+        " su", "te ", "mie", "nto", "ame", "men", "ues", "o d", "a d", "s d",
+        "e l", "o e", "a e", "s e", "io ", "ia ", "ida", "ist", "cia", "com",
+        " ha", "ndo", "sta", "tra", "per", "ado", " ma", "dos", "ant", " mu",
+        "más", "ás ", "ños", "año", " tr", " ca", "ero", "res", "ali", " al",
+    ],
+    "en": [
+        " th", "the", "he ", " an", "and", "nd ", "ing", "ng ", " of", "of ",
+        " to", "ed ", " in", "in ", "er ", "es ", " a ", "ion", "tio", "re ",
+        "is ", " is", "at ", "on ", "ent", " wa", "was", "as ", "hat", "tha",
+        " fo", "for", "or ", " be", " ha", "ly ", "his", "ter", " it", "it ",
+        "ere", "her", " wh", "wit", "ith", "th ", "ve ", "al ", "ati", "ate",
+        "ons", "st ", "nt ", "s a", "e t", " re", "ers", " co", "d t", "e a",
+        "s t", "n t", " he", "hen", "thi", "ted", " st", "ll ", " on", "ou ",
+        " yo", "you", "ave", "hav", " sa", "ay ", "are", " ar", "ich", "whi",
+        "ome", " so", "ts ", "ear", "ny ", "ill", "wil", " wi", "ey ", "hey",
+    ],
+}
+
+# Caracteres que solo aparecen en uno de los idiomas soportados
+_MARKERS: Dict[str, str] = {
+    "es": "ñáéíóú¿¡",
+}
+
+
+class LanguageDetector:
+    """
+    Detecta el idioma (es/en) comparando los trigramas del texto contra
+    perfiles compactos embebidos. Sin red ni modelos externos: analiza solo
+    los primeros MAX_CHARS caracteres (decenas de microsegundos por texto).
+    """
+
+    MAX_CHARS = 300
+    MARKER_WEIGHT = 3.0
+    MIN_EVIDENCE = 4.0  # Puntaje mínimo total para arriesgar un idioma
+
+    _NON_LETTER_RE = re.compile(r"[\W\d_]+", re.UNICODE)
+
+    def __init__(self):
+        self.languages = list(_PROFILES)
+        # trigrama -> vector de pesos por idioma; el peso decrece con el rango
+        weights: Dict[str, List[float]] = {}
+        for index, language in enumerate(self.languages):
+            grams = list(dict.fromkeys(_PROFILES[language]))
+            top = math.log(len(grams) + 1)
+            for rank, gram in enumerate(grams):
+                vector = weights.setdefault(gram, [0.0] * len(self.languages))
+                vector[index] = top - math.log(rank + 1) + 1.0
+        self._weights: Dict[str, Tuple[float, ...]] = {
+            gram: tuple(vector) for gram, vector in weights.items()
+        }
+        self._markers = [
+            (self.languages.index(language), chars) for language, chars in _MARKERS.items()
+        ]
+
+    def detect(self, text: str) -> Tuple[Optional[str], float]:
+        """
+        Devuelve (idioma, confianza). El idioma es None si el texto no tiene
+        evidencia suficiente; la confianza es la fracción del puntaje total
+        que obtuvo el idioma elegido.
+        """
+        if not text:
+            return None, 0.0
+
+        sample = " " + self._NON_LETTER_RE.sub(" ", text[:self.MAX_CHARS].lower()) + " "
+        lookup = self._weights.get
+        vectors = [
+            vector for vector in map(lookup, [sample[i:i + 3] for i in range(len(sample) - 2)])
+            if vector is not None
+        ]
+        scores = [sum(column) for column in zip(*vectors)] if vectors else [0.0] * len(self.languages)
+
+        for index, chars in self._markers:
+            scores[index] += self.MARKER_WEIGHT * sum(sample.count(char) for char in chars)
+
+        total = sum(scores)
+        if total < self.MIN_EVIDENCE:
+            return None, 0.0
+
+        best = max(range(len(scores)), key=scores.__getitem__)
+        return self.languages[best], scores[best] / total
+
+
+# Instancia global
+language_detector = LanguageDetector()
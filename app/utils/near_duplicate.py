@@ -0,0 +1,110 @@
+"""
+Firmas MinHash para detectar textos casi duplicados
+"""
+import hashlib
+import re
+import sys
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+
+class MinHasher:
+    """
+    Calcula firmas MinHash con "one permutation hashing": cada shingle se
+    hashea una sola vez y se reparte en NUM_PERM bins, guardando el mínimo de
+    cada bin. Los bins vacíos se rellenan por rotación (densificación) para
+    que dos textos cortos sigan siendo comparables.
+
+    Las firmas se guardan en la base de datos, así que NUM_PERM, BANDS y
+    SHINGLE_SIZE no deben cambiarse sin reconstruir el índice.
+    """
+
+    NUM_PERM = 64
+    BANDS = 16
+    ROWS_PER_BAND = NUM_PERM // BANDS
+    SHINGLE_SIZE = 5  # Palabras por shingle
+
+    _MAX_HASH = (1 << 64) - 1
+    _WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+    def _shingles(self, text: str) -> set:
+        words = self._WORD_RE.findall(text.lower())
+        if len(words) < self.SHINGLE_SIZE:
+            return set(words)
+        return {
+            " ".join(words[i:i + self.SHINGLE_SIZE])
+            for i in range(len(words) - self.SHINGLE_SIZE + 1)
+        }
+
+    @staticmethod
+    def _hash64(value: str) -> int:
+        return int.from_bytes(
+            hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        """
+        Firma MinHash del texto (NUM_PERM enteros de 64 bits).
+
+        None si el texto no tiene palabras: la firma quedaría en _MAX_HASH
+        y cualquier par de textos sin palabras tendría similitud 1.0.
+        """
+        shingles = self._shingles(text)
+        if not shingles:
+            return None
+        bins = [self._MAX_HASH] * self.NUM_PERM
+        for shingle in shingles:
+            h = self._hash64(shingle)
+            index = h % self.NUM_PERM
+            value = h // self.NUM_PERM
+            if value < bins[index]:
+                bins[index] = value
+
+        # Densificación: cada bin vacío toma el valor del siguiente bin lleno
+        # (circularmente) más un offset que depende de la distancia
+        offset_unit = self._MAX_HASH // self.NUM_PERM // (self.NUM_PERM + 1)
+        dense = list(bins)
+        for i, value in enumerate(bins):
+            if value != self._MAX_HASH:
+                continue
+            distance = 1
+            while bins[(i + distance) % self.NUM_PERM] == self._MAX_HASH:
+                distance += 1
+            dense[i] = bins[(i + distance) % self.NUM_PERM] + distance * offset_unit
+        return tuple(dense)
+
+    def similarity(self, sig_a: Sequence[int], sig_b: Sequence[int]) -> float:
+        """Estimación de similitud de Jaccard entre dos firmas"""
+        if not sig_a or len(sig_a) != len(sig_b):
+            return 0.0
+        equal = sum(1 for a, b in zip(sig_a, sig_b) if a == b)
+        return equal / len(sig_a)
+
+    def band_hashes(self, signature: Sequence[int]) -> List[int]:
+        """Hash de cada banda LSH (63 bits, cabe en un BIGINT con signo)"""
+        hashes = []
+        for band in range(self.BANDS):
+            rows = signature[band * self.ROWS_PER_BAND:(band + 1) * self.ROWS_PER_BAND]
+            digest = hashlib.blake2b(self.to_bytes(rows), digest_size=8).digest()
+            hashes.append(int.from_bytes(digest, "big") & 0x7FFF_FFFF_FFFF_FFFF)
+        return hashes
+
+    @staticmethod
+    def to_bytes(signature: Sequence[int]) -> bytes:
+        """Serializa la firma como uint64 little-endian"""
+        data = array("Q", signature)
+        if sys.byteorder == "big":
+            data.byteswap()
+        return data.tobytes()
+
+    @staticmethod
+    def from_bytes(data: bytes) -> Tuple[int, ...]:
+        values = array("Q")
+        values.frombytes(data)
+        if sys.byteorder == "big":
+            values.byteswap()
+        return tuple(values)
+
+
+# Instancia global
+min_hasher = MinHasher()
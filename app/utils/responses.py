@@ -0,0 +1,65 @@
+"""
+Respuestas JSON sin el paso por jsonable_encoder.
+
+Con response_model, FastAPI vuelve a validar el objeto que devuelve la ruta,
+lo convierte a tipos JSON y recién entonces JSONResponse lo serializa con
+json.dumps. Para los modelos grandes (el detalle de un análisis con hasta
+50 KB de texto, las series temporales de 365 puntos) ese camino cuesta más
+que el resto de la respuesta.
+
+FastJSONResponse serializa un modelo Pydantic ya construido directo a bytes
+con pydantic-core, y cualquier otro contenido con orjson (o json si no está
+instalado). Las rutas siguen declarando response_model para la documentación
+OpenAPI: FastAPI no re-serializa cuando la ruta devuelve una Response.
+
+etag_for / etag_matches implementan los ETag fuertes y el If-None-Match de
+los recursos que no cambian (el detalle de un análisis).
+"""
+import hashlib
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse que serializa modelos con pydantic-core y el resto con orjson"""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            # Mismo JSON que model_dump_json(), pero en bytes y sin pasar por str
+            return content.__pydantic_serializer__.to_json(content)
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return super().render(content)
+
+
+def etag_for(body: bytes) -> str:
+    """ETag fuerte: hash del cuerpo exacto de la respuesta"""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Si el If-None-Match de la request coincide con `etag`.
+
+    Para If-None-Match se usa la comparación débil (RFC 9110): se ignora el
+    prefijo W/ que agregan algunos proxies al comprimir.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -1,30 +1,57 @@
 import bleach
 import re
-from typing import Optional
+from typing import List, Optional
 from app.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Caracteres de control que se eliminan al final de la sanitización
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+
+# Lo que bleach.clean(tags=[], strip=True) le hace a un texto sin '<' ni '&':
+# elimina NUL, reemplaza los caracteres invisibles por '?' y escapa '>'.
+# Los espacios HTML de los extremos (incluido \x0c) no se reemplazan
+_HTML_SPACE_EDGES = " \t\n\r\x0c\x00"
+_INVISIBLE_CHARS_RE = re.compile(r'[\x01-\x08\x0b\x0c\x0e-\x1f]')
+
+
 class SecurityUtils:
     """Utilidades de seguridad y sanitización"""
     
     @staticmethod
-    def sanitize_text(text: str) -> str:
-        """Sanitiza texto para prevenir ataques"""
+    def sanitize_text(text: str, control_chars_removed: bool = False) -> str:
+        """
+        Sanitiza texto para prevenir ataques.
+        
+        El texto sin marcado ('<' o '&') se normaliza en una sola pasada sin
+        invocar el parser HTML de bleach; el resultado es idéntico.
+        
+        Args:
+            text: Texto a sanitizar
+            control_chars_removed: El texto ya pasó por ContentExtractor._clean_content
+                (sin caracteres de control), así que se omite esa pasada
+        """
         if not text:
             return ""
         
+        if "<" not in text and "&" not in text:
+            if control_chars_removed:
+                return " ".join(text.replace(">", "&gt;").split())
+            text = text.strip(_HTML_SPACE_EDGES).replace("\x00", "")
+            text = _INVISIBLE_CHARS_RE.sub("?", text).replace(">", "&gt;")
+            return SecurityUtils._normalize(text)
+        
         # Remover HTML/XML tags
         text = bleach.clean(text, tags=[], strip=True)
         
-        # Normalizar espacios en blanco
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remover caracteres de control
-        text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', text)
-        
-        return text.strip()
+        return SecurityUtils._normalize(text)
+    
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Normaliza espacios en blanco y remueve caracteres de control"""
+        text = " ".join(text.split())
+        return _CONTROL_CHARS_RE.sub('', text).strip()
     
     @staticmethod
     def validate_file_size(file_size: int) -> bool:
@@ -74,13 +101,70 @@ class SecurityUtils:
         extension = '.' + filename.rsplit('.', 1)[1].lower()
         return extension in allowed_extensions
 
+class StreamingSanitizer:
+    """
+    sanitize_text incremental: recibe el texto en pedazos (p. ej. mientras se
+    decodifica un upload). El texto sin marcado se normaliza por tramos de
+    palabras completas, sin armar la lista de palabras de todo el texto; si
+    aparece '<' o '&' el resultado sale de sanitize_text sobre el texto
+    completo. En ambos casos es el mismo que sanitize_text.
+    """
+    
+    # Solo se corta en espacios que el camino rápido no reemplaza por '?'
+    _CUT_CHARS = (" ", "\t", "\n", "\r")
+    
+    def __init__(self):
+        self._raw: List[str] = []  # Texto recibido (por si aparece marcado)
+        self._parts: List[str] = []  # Tramos ya normalizados
+        self._pending = ""  # Palabra incompleta y espacios del final
+        self._started = False  # Ya se pasaron los espacios del comienzo
+        self._markup = False
+    
+    def feed(self, text: str):
+        self._raw.append(text)
+        if self._markup:
+            return
+        if "<" in text or "&" in text:
+            self._markup = True
+            self._parts = []
+            return
+        
+        buffer = self._pending + text
+        if not self._started:
+            buffer = buffer.lstrip(_HTML_SPACE_EDGES)
+            if not buffer:
+                self._pending = ""
+                return
+            self._started = True
+        
+        # Los espacios del final se guardan: si el texto termina ahí se descartan
+        end = len(buffer.rstrip(_HTML_SPACE_EDGES))
+        cut = max(buffer.rfind(char, 0, end) for char in self._CUT_CHARS) + 1
+        self._process(buffer[:cut])
+        self._pending = buffer[cut:]
+    
+    def finish(self) -> str:
+        if self._markup:
+            return SecurityUtils.sanitize_text("".join(self._raw))
+        self._process(self._pending.rstrip(_HTML_SPACE_EDGES))
+        text = " ".join(self._parts)
+        return _CONTROL_CHARS_RE.sub('', text).strip()
+    
+    def _process(self, segment: str):
+        if not segment:
+            return
+        segment = _INVISIBLE_CHARS_RE.sub("?", segment.replace("\x00", "")).replace(">", "&gt;")
+        words = " ".join(segment.split())
+        if words:
+            self._parts.append(words)
+
 class RateLimiter:
     """Rate limiter simple en memoria"""
     
     def __init__(self):
         self.requests = {}  # IP -> [timestamps]
-        self.max_requests_per_minute = 60
-        self.max_requests_per_hour = 500
+        self.max_requests_per_minute = settings.REQUESTS_PER_MINUTE
+        self.max_requests_per_hour = settings.REQUESTS_PER_HOUR
     
     def is_allowed(self, client_ip: str) -> bool:
         """Verifica si la IP puede hacer más requests"""
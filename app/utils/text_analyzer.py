@@ -250,3 +250,8 @@ class TextAnalyzer:
 
 # Instancia global
 text_analyzer = TextAnalyzer()
+
+
+def analyze_text(text: str) -> TextFeatures:
+    """Punto de entrada serializable de analyze para el pool de procesos"""
+    return text_analyzer.analyze(text)
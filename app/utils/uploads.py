@@ -0,0 +1,121 @@
+"""
+Lectura de archivos subidos por bloques, con límite de tamaño
+"""
+import codecs
+import os
+import tempfile
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Optional
+
+from app.config import settings
+from app.utils.document_parsers import ensure_supported, iter_document
+from app.utils.security import StreamingSanitizer
+from app.utils.worker_pool import worker_pool
+
+if TYPE_CHECKING:
+    from fastapi import UploadFile
+
+
+class UploadTooLarge(Exception):
+    """El archivo supera MAX_FILE_SIZE_MB"""
+
+
+def max_upload_bytes() -> int:
+    return settings.MAX_FILE_SIZE_MB * 1024 * 1024
+
+
+def bulk_max_upload_bytes() -> int:
+    return settings.BULK_MAX_UPLOAD_MB * 1024 * 1024
+
+
+async def read_text_upload(file: "UploadFile", max_bytes: Optional[int] = None) -> str:
+    """
+    Lee un upload de texto UTF-8 por bloques y devuelve el texto sanitizado.
+
+    El límite se controla a medida que se lee (y antes de leer, si el parser
+    multipart ya conoce el tamaño), así que un archivo grande se rechaza sin
+    cargarlo entero en memoria. Cada bloque se decodifica y pasa al
+    sanitizador sin armar los bytes completos; los bytes UTF-8 inválidos se
+    ignoran, como en decode(errors='ignore').
+
+    Raises:
+        UploadTooLarge: si el archivo supera max_bytes
+    """
+    max_bytes = max_upload_bytes() if max_bytes is None else max_bytes
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLarge(file.size)
+
+    chunk_size = settings.UPLOAD_CHUNK_SIZE_KB * 1024
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    sanitizer = StreamingSanitizer()
+    total = 0
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_bytes:
+            raise UploadTooLarge(total)
+        sanitizer.feed(decoder.decode(chunk))
+    sanitizer.feed(decoder.decode(b"", final=True))
+    return sanitizer.finish()
+
+
+async def spool_upload(file: "UploadFile", max_bytes: int, suffix: str) -> str:
+    """Copia el upload por bloques a un archivo temporal y devuelve su ruta (el llamador lo borra)"""
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLarge(file.size)
+
+    chunk_size = settings.UPLOAD_CHUNK_SIZE_KB * 1024
+    total = 0
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as spooled:
+        try:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                total += len(chunk)
+                if total > max_bytes:
+                    raise UploadTooLarge(total)
+                spooled.write(chunk)
+        except BaseException:
+            spooled.close()
+            os.unlink(spooled.name)
+            raise
+    return spooled.name
+
+
+async def read_document_upload(file: "UploadFile", extension: str, max_bytes: Optional[int] = None) -> str:
+    """
+    Extrae el texto de un PDF, DOCX o RTF subido y lo devuelve sanitizado.
+
+    El parser corre en el sandbox de documentos de worker_pool (proceso propio
+    con límites de memoria y tiempo) y entrega el texto página por página; al
+    juntar MAX_CONTENT_LENGTH caracteres se deja de leer y el proceso se mata,
+    así un PDF de 200 páginas no ocupa al worker más de lo necesario.
+
+    Raises:
+        UploadTooLarge: si el archivo supera max_bytes
+        UnsupportedDocument: si no hay parser para la extensión
+        WorkerPoolError: si el parser falla, excede el timeout o el pool está lleno
+    """
+    ensure_supported(extension)
+    max_bytes = max_upload_bytes() if max_bytes is None else max_bytes
+    path = await spool_upload(file, max_bytes, extension)
+    try:
+        sanitizer = StreamingSanitizer()
+        remaining = settings.MAX_CONTENT_LENGTH
+        async with aclosing(worker_pool.stream("parse_document", iter_document, path, extension)) as pages:
+            async for page in pages:
+                if not page:
+                    continue
+                # El separador también cuenta: con muchos párrafos cortos suma miles de caracteres
+                page = (page + "\n")[:remaining]
+                sanitizer.feed(page)
+                remaining -= len(page)
+                if remaining <= 0:
+                    break
+        # El escape de '>' o del marcado puede alargar el texto sanitizado
+        return sanitizer.finish()[:settings.MAX_CONTENT_LENGTH].rstrip()
+    finally:
+        os.unlink(path)
@@ -0,0 +1,538 @@
+"""
+Pools de workers para las etapas que bloquean el event loop.
+
+- run(): etapas CPU-bound (parseo de HTML, extracción de características) en
+  un ProcessPoolExecutor, para que un solo worker de uvicorn use varios
+  núcleos. WORKER_POOL_MODE=thread usa hilos (p. ej. en serverless) e
+  inline ejecuta en el mismo hilo.
+- run_blocking(): llamadas bloqueantes de I/O (newspaper3k) en un
+  ThreadPoolExecutor propio y acotado, en lugar del executor por defecto.
+- stream(): parsers de documentos no confiables (PDF, DOCX, RTF). Cada tarea
+  corre en un proceso propio con límites de memoria y CPU que se mata al
+  vencer el timeout o cuando el llamador deja de consumir; los resultados
+  parciales (páginas) llegan a medida que se generan.
+
+Cada pool tiene una cola acotada: si no hay lugar en WORKER_POOL_QUEUE_TIMEOUT
+segundos se lanza WorkerPoolFull. Cada tarea tiene timeout propio
+(WorkerTaskTimeout). Las funciones enviadas al pool de procesos deben estar
+definidas a nivel de módulo para poder serializarse.
+
+Una tarea que excede el timeout sigue ocupando su lugar en la cola mientras
+corre. En modo process el pool se recicla: las tareas nuevas van a procesos
+nuevos y los del pool anterior se matan cuando solo quedan en él tareas
+vencidas. Un hilo no se puede matar, así que en modo thread el lugar se libera
+recién cuando la tarea termina.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerPoolError(Exception):
+    """Error base de los pools de workers"""
+
+
+class WorkerPoolFull(WorkerPoolError):
+    """La cola del pool está llena"""
+
+
+class WorkerTaskTimeout(WorkerPoolError):
+    """La tarea excedió su timeout"""
+
+
+class WorkerTaskFailed(WorkerPoolError):
+    """La tarea del sandbox falló o su proceso murió (p. ej. por el límite de memoria)"""
+
+
+def _timed_call(fn: Callable, args: Tuple) -> Tuple[Any, float, float]:
+    """Ejecuta fn en el worker y devuelve (resultado, inicio, duración)"""
+    started = time.time()
+    result = fn(*args)
+    return result, started, time.time() - started
+
+
+def _sandbox_main(conn, fn: Callable[..., Iterator[Any]], args: Tuple, memory_mb: int, cpu_seconds: int):
+    """Proceso del sandbox: aplica los límites y envía cada elemento que genera fn"""
+    try:
+        import resource
+        if memory_mb:
+            limit = memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        if cpu_seconds:
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    except (ImportError, ValueError, OSError):
+        pass
+
+    try:
+        for item in fn(*args):
+            conn.send(("item", item))
+        conn.send(("done", None))
+    except MemoryError:
+        conn.send(("error", f"Memoria insuficiente (límite {memory_mb} MB)"))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+class _StageStats:
+    """Contadores de una etapa"""
+
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+        self.max_run_seconds = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        finished = max(self.completed, 1)
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.wait_seconds / finished * 1000, 2),
+            "avg_run_ms": round(self.run_seconds / finished * 1000, 2),
+            "max_run_ms": round(self.max_run_seconds * 1000, 2),
+        }
+
+
+class _BoundedExecutor:
+    """Executor con cola acotada, timeouts y métricas de utilización"""
+
+    def __init__(self, name: str, mode: str, workers: int, max_queue: int, start_method: str = "spawn"):
+        self.name = name
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.start_method = start_method
+
+        self._executor: Optional[Executor] = None
+        self._slots = asyncio.Semaphore(self.workers + self.max_queue)
+        self._in_flight = 0
+        # Tareas sin terminar por executor, y pools de procesos reciclados:
+        # executor -> (sus procesos, tareas vencidas)
+        self._pending: Dict[Executor, Set[Future]] = defaultdict(set)
+        self._retired: Dict[Executor, Tuple[List[multiprocessing.Process], Set[Future]]] = {}
+        self.recycled = 0
+        self._busy_seconds = 0.0
+        self._started_at = time.monotonic()
+        self._stages: Dict[str, _StageStats] = defaultdict(_StageStats)
+
+    def _ensure_executor(self) -> Optional[Executor]:
+        if self._executor is not None or self.mode == "inline":
+            return self._executor
+
+        if self.mode == "process":
+            try:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                )
+                return self._executor
+            except (OSError, NotImplementedError, ValueError) as e:
+                logger.warning(f"Pool de procesos '{self.name}' no disponible ({e}); usando hilos")
+                self.mode = "thread"
+
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"pool-{self.name}")
+        return self._executor
+
+    def start(self):
+        self._ensure_executor()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        for processes, _ in self._retired.values():
+            self._kill(processes)
+        self._retired.clear()
+
+    def _recycle(self, executor: Executor, future: Future):
+        """
+        Saca de servicio el pool de procesos donde quedó colgada `future`.
+
+        Las tareas nuevas van a un pool nuevo. ProcessPoolExecutor no permite
+        matar un solo worker: los procesos del pool viejo se matan cuando ya
+        no tiene tareas en curso salvo las vencidas, así no se interrumpen
+        las de otros llamadores.
+        """
+        if executor in self._retired:
+            self._retired[executor][1].add(future)
+        else:
+            # shutdown() descarta la lista de procesos: se toma antes
+            processes = list((getattr(executor, "_processes", None) or {}).values())
+            self._retired[executor] = (processes, {future})
+            if self._executor is executor:
+                self._executor = None
+            executor.shutdown(wait=False)
+            self.recycled += 1
+            logger.warning(f"Pool de procesos '{self.name}' reciclado por una tarea colgada")
+        self._reap(executor)
+
+    def _reap(self, executor: Executor):
+        """Mata los procesos de un pool reciclado si ya solo corre tareas vencidas"""
+        retired = self._retired.get(executor)
+        if retired is None:
+            return
+        processes, stuck = retired
+        if self._pending[executor] <= stuck:
+            # Las tareas vencidas terminan con BrokenProcessPool y liberan su lugar
+            self._kill(processes)
+            del self._retired[executor]
+
+    @staticmethod
+    def _kill(processes: List[multiprocessing.Process]):
+        for process in processes:
+            if process.is_alive():
+                process.kill()
+
+    async def run(self, stage: str, fn: Callable, *args, timeout: Optional[float] = None) -> Any:
+        stats = self._stages[stage]
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=settings.WORKER_POOL_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            stats.rejected += 1
+            raise WorkerPoolFull(f"Cola del pool '{self.name}' llena ({self.workers + self.max_queue} tareas)")
+
+        stats.submitted += 1
+        submitted = time.time()
+
+        executor = self._ensure_executor()
+        if executor is None:
+            # Modo inline: sin timeout, útil para tests y depuración
+            try:
+                result, started, duration = _timed_call(fn, args)
+            except Exception:
+                stats.failed += 1
+                raise
+            finally:
+                self._slots.release()
+            self._record(stats, submitted, started, duration)
+            return result
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = executor.submit(_timed_call, fn, args)
+        except Exception:
+            self._slots.release()
+            stats.failed += 1
+            raise
+
+        # El lugar en la cola se libera cuando el worker termina de verdad,
+        # aunque el llamador ya haya abandonado la tarea por timeout
+        self._in_flight += 1
+        self._pending[executor].add(future)
+        future.add_done_callback(lambda _: self._notify_done(loop, executor, future))
+
+        try:
+            result, started, duration = await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=timeout or settings.WORKER_POOL_TASK_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            # Si todavía no arrancó alcanza con cancelarla; si ya corre, solo matando su proceso
+            if not future.cancel() and not future.done() and self.mode == "process":
+                self._recycle(executor, future)
+            raise WorkerTaskTimeout(f"Tarea '{stage}' excedió el timeout en el pool '{self.name}'")
+        except BrokenProcessPool as e:
+            stats.failed += 1
+            logger.error(f"Pool de procesos '{self.name}' roto; se recreará")
+            if self._executor is executor:
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+            raise WorkerTaskFailed(f"El proceso de '{stage}' murió en el pool '{self.name}'") from e
+        except Exception:
+            stats.failed += 1
+            raise
+
+        self._record(stats, submitted, started, duration)
+        return result
+
+    def _notify_done(self, loop: asyncio.AbstractEventLoop, executor: Executor, future: Future):
+        try:
+            loop.call_soon_threadsafe(self._task_done, executor, future)
+        except RuntimeError:
+            # El loop ya se cerró (apagado de la aplicación)
+            pass
+
+    def _task_done(self, executor: Executor, future: Future):
+        self._in_flight -= 1
+        self._slots.release()
+        pending = self._pending[executor]
+        pending.discard(future)
+        if not pending:
+            del self._pending[executor]
+        self._reap(executor)
+
+    def _record(self, stats: _StageStats, submitted: float, started: float, duration: float):
+        stats.completed += 1
+        stats.wait_seconds += max(0.0, started - submitted)
+        stats.run_seconds += duration
+        stats.max_run_seconds = max(stats.max_run_seconds, duration)
+        self._busy_seconds += duration
+
+    def stats(self) -> Dict[str, Any]:
+        uptime = max(time.monotonic() - self._started_at, 1e-9)
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "queued": max(0, self._in_flight - self.workers),
+            "recycled": self.recycled,
+            "utilization": round(min(1.0, self._busy_seconds / (uptime * self.workers)), 4),
+            "stages": {name: stage.to_dict() for name, stage in self._stages.items()},
+        }
+
+
+class _SandboxExecutor:
+    """
+    Un proceso por tarea, con RLIMIT_AS/RLIMIT_CPU y timeout de reloj, y
+    como mucho `workers` a la vez. En modo thread/inline (sin procesos) el
+    generador corre en un hilo o en el mismo hilo, sin límites de memoria.
+    """
+
+    def __init__(
+        self, name: str, mode: str, workers: int, max_queue: int,
+        start_method: str, memory_mb: int, timeout: float
+    ):
+        self.name = name
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.start_method = start_method
+        self.memory_mb = memory_mb
+        self.timeout = timeout
+
+        self._slots = asyncio.Semaphore(self.workers + self.max_queue)
+        self._running = asyncio.Semaphore(self.workers)
+        self._thread_executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+        self._busy_seconds = 0.0
+        self._started_at = time.monotonic()
+        self._stages: Dict[str, _StageStats] = defaultdict(_StageStats)
+
+    def _context(self):
+        try:
+            return multiprocessing.get_context(self.start_method)
+        except ValueError:
+            return multiprocessing.get_context("spawn")
+
+    def shutdown(self):
+        if self._thread_executor is not None:
+            self._thread_executor.shutdown(wait=False, cancel_futures=True)
+            self._thread_executor = None
+
+    async def stream(self, stage: str, fn: Callable[..., Iterator[Any]], *args, timeout: Optional[float] = None) -> AsyncIterator[Any]:
+        """
+        Elementos que genera fn(*args), a medida que llegan. Si el llamador deja
+        de iterar (o cierra el generador) el proceso se mata sin terminar.
+        """
+        stats = self._stages[stage]
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=settings.WORKER_POOL_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            stats.rejected += 1
+            raise WorkerPoolFull(f"Cola del pool '{self.name}' llena ({self.workers + self.max_queue} tareas)")
+
+        stats.submitted += 1
+        submitted = time.time()
+        self._in_flight += 1
+        started = None
+        try:
+            async with self._running:
+                started = time.time()
+                deadline = asyncio.get_running_loop().time() + (timeout or self.timeout)
+                if self.mode == "process":
+                    items = self._stream_process(stage, fn, args, deadline, timeout or self.timeout)
+                else:
+                    items = self._stream_local(stage, fn, args, deadline)
+                try:
+                    async for item in items:
+                        yield item
+                finally:
+                    await items.aclose()
+            stats.completed += 1
+        except WorkerTaskTimeout:
+            stats.timeouts += 1
+            raise
+        except GeneratorExit:
+            # El llamador cortó antes del final (p. ej. ya tiene el texto que necesita)
+            stats.completed += 1
+            raise
+        except Exception:
+            stats.failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._slots.release()
+            if started is not None:
+                duration = time.time() - started
+                stats.wait_seconds += max(0.0, started - submitted)
+                stats.run_seconds += duration
+                stats.max_run_seconds = max(stats.max_run_seconds, duration)
+                self._busy_seconds += duration
+
+    async def _stream_process(self, stage: str, fn: Callable, args: Tuple, deadline: float, timeout: float) -> AsyncIterator[Any]:
+        context = self._context()
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(
+            target=_sandbox_main,
+            args=(sender, fn, args, self.memory_mb, int(timeout) + 1),
+            name=f"{self.name}-{stage}",
+            daemon=True,
+        )
+        process.start()
+        sender.close()
+        try:
+            while True:
+                message = await self._receive(receiver, deadline, stage)
+                if message is None:
+                    process.join(1)
+                    raise WorkerTaskFailed(
+                        f"El proceso de '{stage}' terminó sin responder (código {process.exitcode})"
+                    )
+                kind, value = message
+                if kind == "done":
+                    return
+                if kind == "error":
+                    raise WorkerTaskFailed(value)
+                yield value
+        finally:
+            if process.is_alive():
+                process.kill()
+            process.join(1)
+            receiver.close()
+
+    async def _receive(self, receiver, deadline: float, stage: str) -> Optional[Tuple[str, Any]]:
+        """Siguiente mensaje del proceso sin bloquear el event loop; None si cerró el pipe"""
+        loop = asyncio.get_running_loop()
+        if not receiver.poll():
+            readable = loop.create_future()
+            loop.add_reader(receiver.fileno(), lambda: readable.done() or readable.set_result(None))
+            try:
+                await asyncio.wait_for(readable, timeout=max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                raise WorkerTaskTimeout(f"Tarea '{stage}' excedió el timeout en el pool '{self.name}'")
+            finally:
+                loop.remove_reader(receiver.fileno())
+        try:
+            return receiver.recv()
+        except EOFError:
+            return None
+
+    async def _stream_local(self, stage: str, fn: Callable, args: Tuple, deadline: float) -> AsyncIterator[Any]:
+        done = object()
+        loop = asyncio.get_running_loop()
+        if self.mode == "thread" and self._thread_executor is None:
+            self._thread_executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"pool-{self.name}")
+        try:
+            iterator = iter(fn(*args))
+            while True:
+                if self.mode == "inline":
+                    item = next(iterator, done)
+                else:
+                    try:
+                        item = await asyncio.wait_for(
+                            loop.run_in_executor(self._thread_executor, next, iterator, done),
+                            timeout=max(0.0, deadline - loop.time())
+                        )
+                    except asyncio.TimeoutError:
+                        raise WorkerTaskTimeout(f"Tarea '{stage}' excedió el timeout en el pool '{self.name}'")
+                if item is done:
+                    return
+                yield item
+        except (WorkerPoolError, GeneratorExit):
+            raise
+        except Exception as e:
+            # Mismo error que en modo process, donde la excepción queda en el hijo
+            raise WorkerTaskFailed(f"{type(e).__name__}: {e}") from e
+
+    def stats(self) -> Dict[str, Any]:
+        uptime = max(time.monotonic() - self._started_at, 1e-9)
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "memory_limit_mb": self.memory_mb,
+            "timeout_seconds": self.timeout,
+            "in_flight": self._in_flight,
+            "queued": max(0, self._in_flight - self.workers),
+            "utilization": round(min(1.0, self._busy_seconds / (uptime * self.workers)), 4),
+            "stages": {name: stage.to_dict() for name, stage in self._stages.items()},
+        }
+
+
+class WorkerPool:
+    """Pools de CPU, de I/O bloqueante y de documentos compartidos por la aplicación"""
+
+    def __init__(self):
+        cpu_workers = settings.WORKER_POOL_SIZE or os.cpu_count() or 1
+        self.cpu = _BoundedExecutor(
+            "cpu",
+            settings.WORKER_POOL_MODE,
+            cpu_workers,
+            settings.WORKER_POOL_MAX_QUEUE,
+            settings.WORKER_POOL_START_METHOD,
+        )
+        self.blocking = _BoundedExecutor(
+            "blocking",
+            "inline" if settings.WORKER_POOL_MODE == "inline" else "thread",
+            settings.BLOCKING_POOL_SIZE,
+            settings.WORKER_POOL_MAX_QUEUE,
+        )
+        self.documents = _SandboxExecutor(
+            "documents",
+            settings.WORKER_POOL_MODE,
+            settings.DOCUMENT_POOL_SIZE,
+            settings.DOCUMENT_POOL_MAX_QUEUE,
+            settings.DOCUMENT_SANDBOX_START_METHOD,
+            settings.DOCUMENT_MAX_MEMORY_MB,
+            settings.DOCUMENT_PARSE_TIMEOUT,
+        )
+
+    def start(self):
+        """Crea los executors por adelantado (si no, se crean en el primer uso)"""
+        self.cpu.start()
+        self.blocking.start()
+
+    def shutdown(self):
+        self.cpu.shutdown()
+        self.blocking.shutdown()
+        self.documents.shutdown()
+
+    async def run(self, stage: str, fn: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """Ejecuta una etapa CPU-bound; fn debe ser una función de módulo"""
+        return await self.cpu.run(stage, fn, *args, timeout=timeout)
+
+    async def run_blocking(self, stage: str, fn: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """Ejecuta una llamada bloqueante de I/O en el pool de hilos acotado"""
+        return await self.blocking.run(stage, fn, *args, timeout=timeout)
+
+    def stream(self, stage: str, fn: Callable[..., Iterator[Any]], *args, timeout: Optional[float] = None) -> AsyncIterator[Any]:
+        """Itera en el sandbox de documentos lo que genera fn; fn debe ser una función de módulo"""
+        return self.documents.stream(stage, fn, *args, timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"cpu": self.cpu.stats(), "blocking": self.blocking.stats(), "documents": self.documents.stats()}
+
+
+# Instancia global
+worker_pool = WorkerPool()
@@ -0,0 +1 @@
+# Benchmarks reproducibles de rendimiento (no forman parte de la aplicación)
@@ -0,0 +1,90 @@
+"""
+Corpus fijo para los benchmarks.
+
+Los textos se generan de forma determinística (semilla fija) para que los
+resultados sean comparables entre ejecuciones y máquinas.
+"""
+import random
+from typing import Dict
+
+SIZES = {
+    "short": 280,       # Tweet / titular
+    "medium": 4_000,    # Nota corta
+    "long": 50_000,     # Límite MAX_CONTENT_LENGTH
+}
+
+_SENTENCES = {
+    "en": [
+        "The government confirmed the new budget on Tuesday according to official sources.",
+        "Scientists at the university published a study in 2023 with data from 1,200 patients.",
+        "You won't believe what happened next in this SHOCKING revelation!",
+        "Sources say the secret report was hidden from the public for years.",
+        "Experts warn that the claims are unverifiable and allegedly fabricated.",
+        "The minister said inflation fell to 3.4% in the last quarter.",
+        "Doctors hate this one trick that cures everything overnight!!!",
+        "Aliens and a ghost were reportedly seen near the old factory.",
+    ],
+    "es": [
+        "El gobierno confirmó el nuevo presupuesto el martes según fuentes oficiales.",
+        "Científicos de la universidad publicaron un estudio en 2023 con datos de 1.200 pacientes.",
+        "¡No vas a creer lo que pasó después en esta revelación IMPACTANTE!",
+        "Según fuentes, el informe secreto estuvo oculto al público durante años.",
+        "Expertos advierten que las afirmaciones son supuestamente inventadas.",
+        "El ministro dijo que la inflación bajó al 3,4% en el último trimestre.",
+        "¡¡¡Los médicos odian este truco milagro que lo cura todo!!!",
+        "Se rumorea que vieron extraterrestres y un fantasma cerca de la fábrica.",
+    ],
+}
+
+
+def build_text(language: str, size: int, seed: int = 1234) -> str:
+    """Texto de ~size caracteres armado con oraciones del idioma"""
+    rng = random.Random(f"{language}-{size}-{seed}")
+    sentences = _SENTENCES[language]
+    parts = []
+    length = 0
+    while length < size:
+        sentence = rng.choice(sentences)
+        parts.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(parts)[:size]
+
+
+def build_html(text: str, title: str = "Noticia") -> str:
+    """Página HTML típica de un sitio de noticias que envuelve el texto"""
+    paragraphs = []
+    words = text.split(" ")
+    for i in range(0, len(words), 60):
+        paragraphs.append(f"<p>{' '.join(words[i:i + 60])}</p>")
+    return (
+        "<!DOCTYPE html><html><head>"
+        f"<title>{title}</title>"
+        "<style>body { font-family: sans-serif; }</style>"
+        "<script>window.dataLayer = window.dataLayer || []; function track() {}</script>"
+        "</head><body>"
+        "<header><nav><a href='/'>Inicio</a> <a href='/politica'>Política</a></nav></header>"
+        "<aside><h3>Lo más leído</h3><ul><li>Otra nota</li><li>Y otra más</li></ul></aside>"
+        f"<main><article class='article-body'><h1>{title}</h1>{''.join(paragraphs)}</article></main>"
+        "<footer>© Diario de ejemplo</footer>"
+        "</body></html>"
+    )
+
+
+def build_corpus() -> Dict[str, str]:
+    """Claves del tipo 'en_short', 'es_long'"""
+    return {
+        f"{language}_{name}": build_text(language, size)
+        for language in _SENTENCES
+        for name, size in SIZES.items()
+    }
+
+
+# Respuestas típicas de la Inference API de Hugging Face
+HF_RESPONSES = {
+    "fake_news_model": [[{"label": "LABEL_0", "score": 0.91}, {"label": "LABEL_1", "score": 0.09}]],
+    "sentiment_model": [[
+        {"label": "negative", "score": 0.12},
+        {"label": "neutral", "score": 0.33},
+        {"label": "positive", "score": 0.55},
+    ]],
+}
@@ -0,0 +1,172 @@
+"""
+Microbenchmarks de los caminos calientes por request.
+
+Mide TextAnalyzer.analyze, TextAnalyzer.get_recommendation,
+LanguageDetector.detect, SecurityUtils.sanitize_text,
+ContentExtractor._clean_content,
+ContentExtractor._extract_article_content (sobre HTML guardado) y
+AIAnalyzer._process_result sobre el corpus fijo de benchmarks/corpus.py,
+y emite los resultados en JSON para poder seguir regresiones.
+
+Uso:
+    python -m benchmarks.hot_paths
+    python -m benchmarks.hot_paths --output bench.json --filter sanitize
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from app.services.ai_analyzer import ai_analyzer  # noqa: E402
+from app.utils.content_extractor import content_extractor  # noqa: E402
+from app.utils.language_detector import language_detector  # noqa: E402
+from app.utils.security import security_utils  # noqa: E402
+from app.utils.text_analyzer import text_analyzer  # noqa: E402
+from benchmarks.corpus import HF_RESPONSES, build_corpus, build_html  # noqa: E402
+
+
+def _parsed_soup(html: str) -> BeautifulSoup:
+    """Mismo preprocesamiento que ContentExtractor._extract_with_beautifulsoup"""
+    soup = BeautifulSoup(html, "html.parser")
+    for element in soup(["script", "style", "nav", "header", "footer", "aside"]):
+        element.decompose()
+    return soup
+
+
+def build_cases() -> List[Tuple[str, Callable[[], object]]]:
+    """Lista de (nombre, función sin argumentos a medir)"""
+    corpus = build_corpus()
+    cases = []
+
+    for key, text in corpus.items():
+        features = text_analyzer.analyze(text)
+        html = build_html(text)
+        soup = _parsed_soup(html)
+
+        cases.append((f"text_analyzer.analyze[{key}]", lambda t=text: text_analyzer.analyze(t)))
+        cases.append((
+            f"text_analyzer.get_recommendation[{key}]",
+            lambda f=features: text_analyzer.get_recommendation(f, 0.42)
+        ))
+        cases.append((f"language_detector.detect[{key}]", lambda t=text: language_detector.detect(t)))
+        cases.append((f"security.sanitize_text[{key}]", lambda t=text: security_utils.sanitize_text(t)))
+        cases.append((
+            f"security.sanitize_text_extracted[{key}]",
+            lambda c=content_extractor._clean_content(text): security_utils.sanitize_text(
+                c, control_chars_removed=True
+            )
+        ))
+        cases.append((
+            f"security.sanitize_text_html[{key}]",
+            lambda h=html: security_utils.sanitize_text(h)
+        ))
+        cases.append((
+            f"content_extractor._clean_content[{key}]",
+            lambda t=text: content_extractor._clean_content(t)
+        ))
+        cases.append((
+            f"content_extractor._extract_article_content[{key}]",
+            lambda s=soup: content_extractor._extract_article_content(s)
+        ))
+        cases.append((
+            f"content_extractor.parse_and_extract[{key}]",
+            lambda h=html: content_extractor._extract_article_content(_parsed_soup(h))
+        ))
+
+    for name, response in HF_RESPONSES.items():
+        cases.append((
+            f"ai_analyzer._process_result[{name}]",
+            lambda r=response: ai_analyzer._process_result(r)
+        ))
+
+    return cases
+
+
+def measure(func: Callable[[], object], repeats: int, min_time: float) -> Dict[str, float]:
+    """
+    Calibra la cantidad de iteraciones para que cada repetición dure al menos
+    min_time segundos y devuelve estadísticas por llamada en microsegundos.
+    """
+    func()  # warmup
+
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+    per_call = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        per_call.append((time.perf_counter() - start) / loops * 1_000_000)
+
+    return {
+        "loops": loops,
+        "repeats": repeats,
+        "min_us": round(min(per_call), 3),
+        "median_us": round(statistics.median(per_call), 3),
+        "mean_us": round(statistics.mean(per_call), 3),
+        "stdev_us": round(statistics.stdev(per_call), 3) if len(per_call) > 1 else 0.0,
+        "ops_per_sec": round(1_000_000 / statistics.median(per_call), 1),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks de caminos calientes")
+    parser.add_argument("--repeats", type=int, default=7, help="Repeticiones por caso")
+    parser.add_argument("--min-time", type=float, default=0.1, help="Segundos mínimos por repetición")
+    parser.add_argument("--filter", default=None, help="Solo casos cuyo nombre contenga este texto")
+    parser.add_argument("--output", default=None, help="Archivo JSON de salida (por defecto stdout)")
+    args = parser.parse_args()
+
+    results = {}
+    for name, func in build_cases():
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = measure(func, args.repeats, args.min_time)
+        print(f"{name}: {results[name]['median_us']} µs", file=sys.stderr)
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Generador de carga para /analyze/ y /fact-check/multi-check.
+
+Pensado para correr contra la aplicación apuntada a los servidores
+sustitutos (benchmarks/stub_servers.py) y no contra los proveedores reales.
+Reporta p50/p95/p99, throughput y conteo por status en JSON.
+
+Uso:
+    python -m benchmarks.load_test --base-url http://127.0.0.1:8000 \\
+        --endpoint analyze --concurrency 32 --requests 2000
+    python -m benchmarks.load_test --endpoint multi-check --duration 60
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+import aiohttp
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.corpus import SIZES, build_text  # noqa: E402
+
+
+def build_payload(endpoint: str, index: int, size: str) -> Dict:
+    """Payload distinto por request (semilla = índice) para no medir cachés"""
+    language = "es" if index % 2 == 0 else "en"
+    text = build_text(language, SIZES[size], seed=index)
+    if endpoint == "analyze":
+        return {"text": text}
+    return {
+        "text": text,
+        "url": f"https://noticias{index % 50}.example.com/nota/{index}",
+        "apis": ["all"],
+    }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_load(
+    base_url: str,
+    endpoint: str,
+    concurrency: int,
+    total_requests: Optional[int],
+    duration: Optional[float],
+    size: str,
+    timeout: float,
+) -> Dict:
+    path = "/analyze/" if endpoint == "analyze" else "/fact-check/multi-check"
+    url = base_url.rstrip("/") + path
+
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    next_index = 0
+    deadline = time.perf_counter() + duration if duration else None
+
+    def take_index() -> Optional[int]:
+        nonlocal next_index
+        if total_requests is not None and next_index >= total_requests:
+            return None
+        if deadline is not None and time.perf_counter() >= deadline:
+            return None
+        index = next_index
+        next_index += 1
+        return index
+
+    async def worker(session: aiohttp.ClientSession):
+        while True:
+            index = take_index()
+            if index is None:
+                return
+            payload = build_payload(endpoint, index, size)
+            start = time.perf_counter()
+            try:
+                async with session.post(url, json=payload) as response:
+                    await response.read()
+                    statuses[str(response.status)] += 1
+            except asyncio.TimeoutError:
+                statuses["timeout"] += 1
+            except aiohttp.ClientError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    started = time.perf_counter()
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    completed = len(latencies)
+    successful = sum(count for status, count in statuses.items() if status.startswith("2"))
+    return {
+        "endpoint": path,
+        "concurrency": concurrency,
+        "payload_size": size,
+        "requests": completed,
+        "successful": successful,
+        "elapsed_seconds": round(elapsed, 2),
+        "throughput_rps": round(completed / elapsed, 2) if elapsed else 0.0,
+        "success_rps": round(successful / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(statistics.median(latencies), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(max(latencies), 2),
+            "mean": round(statistics.mean(latencies), 2),
+        } if latencies else {},
+        "status_counts": dict(statuses),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", choices=["analyze", "multi-check"], default="analyze")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=None, help="Total de requests (por defecto 1000 si no hay --duration)")
+    parser.add_argument("--duration", type=float, default=None, help="Duración de la prueba en segundos")
+    parser.add_argument("--size", choices=list(SIZES), default="medium", help="Tamaño del texto enviado")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Timeout por request en segundos")
+    parser.add_argument("--output", default=None, help="Archivo JSON de salida (por defecto stdout)")
+    args = parser.parse_args()
+
+    total_requests = args.requests
+    if total_requests is None and args.duration is None:
+        total_requests = 1000
+
+    report = asyncio.run(run_load(
+        args.base_url, args.endpoint, args.concurrency, total_requests,
+        args.duration, args.size, args.timeout
+    ))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Costo de serializar las respuestas de análisis.
+
+Compara, para AnalysisResult, DetailedAnalysisResult (con 50 KB de texto) y
+TimeseriesResponse (365 puntos), tres caminos:
+
+- fastapi: el de una ruta con response_model (serialize_response, que vuelve
+  a validar y pasa a tipos JSON, y luego JSONResponse con json.dumps)
+- fastapi_orjson: el mismo, pero renderizando con FastJSONResponse (orjson)
+- direct: la ruta devuelve FastJSONResponse(modelo) y pydantic-core serializa
+  el modelo directo a bytes
+
+Con --check termina con código 1 si algún camino produce un JSON distinto o
+si direct no es más rápido que fastapi.
+
+Uso:
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --check --output serialization.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, Type
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+from pydantic import BaseModel  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.schemas.news import (  # noqa: E402
+    AnalysisLabel, AnalysisResult, DetailedAnalysisResult, SourceType,
+    TimeseriesDataPoint, TimeseriesResponse,
+)
+from app.utils.responses import ORJSON_AVAILABLE, FastJSONResponse  # noqa: E402
+from benchmarks.corpus import build_text  # noqa: E402
+from benchmarks.hot_paths import measure  # noqa: E402
+
+
+def _analysis_fields() -> Dict[str, object]:
+    """Campos de un AnalysisResult como los arma POST /analyze"""
+    return {
+        "id": 123456,
+        "score": 0.3125,
+        "label": AnalysisLabel.FAKE,
+        "confidence": 0.875,
+        "model_version": "mrm8488/bert-tiny-finetuned-fake-news-detection",
+        "analysis_time_ms": 842,
+        "content_length": 4210,
+        "source_type": SourceType.URL,
+        "created_at": datetime(2025, 10, 1, 12, 30, tzinfo=timezone.utc),
+        "combined_score": 0.3125,
+        "feature_analysis": {
+            "ai_score": 0.41,
+            "feature_score": 0.22,
+            "explanation": "Lenguaje sensacionalista y ausencia de fuentes",
+            "sensational_words": ["increíble", "urgente", "escándalo"],
+            "clickbait_patterns": ["no vas a creer"],
+            "caps_ratio": 0.12,
+            "exclamation_ratio": 0.05,
+            "has_sources": False,
+            "has_dates": True,
+        },
+        "warnings": ["Texto con muchas mayúsculas"],
+        "inference": {
+            "mode": "cascade",
+            "models": [{"model": "bert-tiny", "score": 0.41, "latency_ms": 310}],
+        },
+        "source_reputation": {"domain": "ejemplo.com", "bias": "right", "credibility": "low"},
+    }
+
+
+def build_models() -> Dict[str, BaseModel]:
+    content = build_text("es", settings.MAX_CONTENT_LENGTH)
+    detailed = DetailedAnalysisResult(
+        **_analysis_fields(),
+        content=content,
+        source_url="https://ejemplo.com/noticia",
+        file_name=None,
+        metrics={
+            "word_count": len(content.split()),
+            "sentence_count": content.count("."),
+            "readability_score": 61.4,
+            "extraction_success": True,
+            "extraction_method": "beautifulsoup",
+        },
+    )
+    start = date(2025, 1, 1)
+    points = [
+        TimeseriesDataPoint(
+            date=(start + timedelta(days=i)).isoformat(),
+            total_analyses=100 + i,
+            fake_count=30 + i % 7,
+            real_count=60 + i % 5,
+            uncertain_count=10 + i % 3,
+            avg_score=round(0.5 + (i % 10) / 50, 3),
+            avg_confidence=round(0.7 + (i % 8) / 40, 3),
+        )
+        for i in range(365)
+    ]
+    return {
+        "analysis_result": AnalysisResult(**_analysis_fields()),
+        "detailed_analysis_result": detailed,
+        "timeseries_response": TimeseriesResponse(data=points, period_days=365, total_points=365),
+    }
+
+
+def build_paths(model: BaseModel) -> Dict[str, Callable[[], bytes]]:
+    field = create_model_field(name="Response", type_=type(model), mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def through_route(response_class: Type[JSONResponse]) -> Callable[[], bytes]:
+        def run() -> bytes:
+            content = loop.run_until_complete(serialize_response(field=field, response_content=model))
+            return response_class(content).body
+        return run
+
+    paths = {"fastapi": through_route(JSONResponse)}
+    if ORJSON_AVAILABLE:
+        paths["fastapi_orjson"] = through_route(FastJSONResponse)
+    paths["direct"] = lambda: FastJSONResponse(model).body
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Costo de serializar las respuestas de análisis")
+    parser.add_argument("--repeats", type=int, default=7, help="Repeticiones por caso")
+    parser.add_argument("--min-time", type=float, default=0.1, help="Segundos mínimos por repetición")
+    parser.add_argument("--check", action="store_true", help="Código de salida 1 si direct no gana o difiere")
+    parser.add_argument("--output", default=None, help="Archivo JSON de salida (por defecto stdout)")
+    args = parser.parse_args()
+
+    results = {}
+    failures = []
+    for name, model in build_models().items():
+        paths = build_paths(model)
+        bodies = {path: func() for path, func in paths.items()}
+        expected = json.loads(bodies["fastapi"])
+        for path, body in bodies.items():
+            if json.loads(body) != expected:
+                failures.append(f"{name}: {path} produce un JSON distinto de fastapi")
+
+        case = {"bytes": len(bodies["direct"])}
+        for path, func in paths.items():
+            case[path] = measure(func, args.repeats, args.min_time)
+        case["speedup"] = round(case["fastapi"]["median_us"] / case["direct"]["median_us"], 2)
+        results[name] = case
+        summary = ", ".join(f"{path} {case[path]['median_us']} µs" for path in paths)
+        print(f"{name}: {summary} (x{case['speedup']})", file=sys.stderr)
+
+        if case["direct"]["median_us"] >= case["fastapi"]["median_us"]:
+            failures.append(f"{name}: direct no es más rápido que fastapi")
+
+    output = json.dumps({"orjson": ORJSON_AVAILABLE, "results": results}, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+    if failures:
+        print("\n".join(failures), file=sys.stderr)
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
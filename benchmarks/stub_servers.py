@@ -0,0 +1,264 @@
+"""
+Servidores sustitutos locales para pruebas de carga.
+
+Emula la Inference API de Hugging Face y las respuestas de Google Fact Check,
+ClaimBuster, WordLift, MBFC y RapidAPI con las formas que usa
+app/services/external_apis.py, con latencia, tasa de error y comportamiento
+503 "model loading" configurables. Todos los proveedores se sirven desde un
+mismo puerto bajo un prefijo por proveedor.
+
+Uso:
+    python -m benchmarks.stub_servers --port 9000 --latency-ms 150 --error-rate 0.02 \\
+        --loading-seconds 20 --provider-latency-ms hf=400
+    python -m benchmarks.stub_servers --port 9000 --print-env   # variables para la app
+"""
+import argparse
+import asyncio
+import hashlib
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from aiohttp import web
+
+PROVIDERS = ("hf", "google", "claimbuster", "wordlift", "mbfc", "rapidapi")
+
+
+@dataclass
+class ProviderBehavior:
+    latency_ms: float = 100.0
+    jitter_ms: float = 20.0
+    error_rate: float = 0.0
+
+
+@dataclass
+class StubConfig:
+    default: ProviderBehavior = field(default_factory=ProviderBehavior)
+    overrides: Dict[str, ProviderBehavior] = field(default_factory=dict)
+    loading_seconds: float = 0.0   # Ventana inicial en la que HF responde 503 loading
+    loading_rate: float = 0.0      # Probabilidad de 503 loading fuera de esa ventana
+    estimated_time: float = 20.0   # estimated_time reportado en los 503
+    seed: Optional[int] = None
+
+    def behavior(self, provider: str) -> ProviderBehavior:
+        return self.overrides.get(provider, self.default)
+
+
+class StubServers:
+    """Aplicación aiohttp con un handler por proveedor"""
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self.started_at = time.monotonic()
+        self.rng = random.Random(config.seed)
+        self.requests: Dict[str, int] = {provider: 0 for provider in PROVIDERS}
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.add_routes([
+            web.post("/hf/models/{model:.+}", self.hf_inference),
+            web.get("/google/claims:search", self.google_claims),
+            web.post("/claimbuster/score/text/", self.claimbuster_score),
+            web.post("/wordlift/fact-check", self.wordlift_check),
+            web.get("/mbfc/source", self.mbfc_source),
+            web.post("/rapidapi/text", self.rapidapi_detect),
+            web.get("/_stats", self.stats),
+        ])
+        return app
+
+    async def _simulate(self, provider: str) -> Optional[web.Response]:
+        """Aplica latencia y error aleatorio; devuelve una respuesta de error o None"""
+        self.requests[provider] += 1
+        behavior = self.config.behavior(provider)
+        delay = max(0.0, self.rng.gauss(behavior.latency_ms, behavior.jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+        if self.rng.random() < behavior.error_rate:
+            status = self.rng.choice([500, 502, 429])
+            return web.json_response({"error": f"stub error {status}"}, status=status)
+        return None
+
+    @staticmethod
+    def _score(value: str) -> float:
+        """Score determinístico en [0, 1) a partir del texto"""
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=4).digest()
+        return int.from_bytes(digest, "big") / 2 ** 32
+
+    async def hf_inference(self, request: web.Request) -> web.Response:
+        model = request.match_info["model"]
+        elapsed = time.monotonic() - self.started_at
+        loading = elapsed < self.config.loading_seconds or self.rng.random() < self.config.loading_rate
+        if loading:
+            self.requests["hf"] += 1
+            remaining = max(self.config.loading_seconds - elapsed, 0) or self.config.estimated_time
+            return web.json_response(
+                {"error": f"Model {model} is currently loading", "estimated_time": round(remaining, 1)},
+                status=503
+            )
+
+        error = await self._simulate("hf")
+        if error:
+            return error
+
+        payload = await request.json()
+        inputs = payload.get("inputs", "")
+        texts = inputs if isinstance(inputs, list) else [inputs]
+        results = []
+        for text in texts:
+            fake = self._score(f"{model}:{text}")
+            results.append([
+                {"label": "LABEL_0", "score": round(fake, 4)},
+                {"label": "LABEL_1", "score": round(1 - fake, 4)},
+            ])
+        return web.json_response(results)
+
+    async def google_claims(self, request: web.Request) -> web.Response:
+        error = await self._simulate("google")
+        if error:
+            return error
+        query = request.query.get("query", "")
+        language = request.query.get("languageCode", "en")
+        claims = []
+        if self._score(query) > 0.3:
+            claims.append({
+                "text": query[:200],
+                "claimant": "Redes sociales",
+                "claimDate": "2025-01-15T00:00:00Z",
+                "claimReview": [{
+                    "publisher": {"name": "Stub Fact Check", "site": "stub.example"},
+                    "url": "https://stub.example/check/1",
+                    "title": "Verificación de ejemplo",
+                    "reviewDate": "2025-01-16T00:00:00Z",
+                    "textualRating": "Falso",
+                    "languageCode": language,
+                }],
+            })
+        return web.json_response({"claims": claims})
+
+    async def claimbuster_score(self, request: web.Request) -> web.Response:
+        error = await self._simulate("claimbuster")
+        if error:
+            return error
+        payload = await request.json()
+        text = payload.get("input_text", "")
+        sentences = [s.strip() for s in text.replace("!", ".").replace("?", ".").split(".") if s.strip()]
+        results = [
+            {"text": sentence, "index": index, "score": round(self._score(sentence), 4)}
+            for index, sentence in enumerate(sentences or [text])
+        ]
+        return web.json_response({
+            "version": "2",
+            "score": max(result["score"] for result in results),
+            "results": results,
+        })
+
+    async def wordlift_check(self, request: web.Request) -> web.Response:
+        error = await self._simulate("wordlift")
+        if error:
+            return error
+        payload = await request.json()
+        text = payload.get("text", "")
+        return web.json_response({
+            "claims": [{"text": text[:200], "verdict": "unverified", "confidence": round(self._score(text), 4)}],
+            "entities": [],
+        })
+
+    async def mbfc_source(self, request: web.Request) -> web.Response:
+        error = await self._simulate("mbfc")
+        if error:
+            return error
+        domain = urlparse(request.query.get("url", "")).netloc or "unknown"
+        score = self._score(domain)
+        return web.json_response({
+            "name": domain,
+            "domain": domain,
+            "bias": ["left", "left-center", "least biased", "right-center", "right"][int(score * 5)],
+            "credibility": "high" if score > 0.5 else "medium",
+            "factual_reporting": "high" if score > 0.4 else "mixed",
+        })
+
+    async def rapidapi_detect(self, request: web.Request) -> web.Response:
+        error = await self._simulate("rapidapi")
+        if error:
+            return error
+        body = await request.text()
+        score = self._score(body)
+        return web.json_response({"prediction": "FAKE" if score > 0.5 else "REAL", "confidence": round(score, 4)})
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            "uptime_seconds": round(time.monotonic() - self.started_at, 1),
+            "requests": self.requests,
+        })
+
+
+def app_environment(host: str, port: int) -> Dict[str, str]:
+    """Variables de entorno para apuntar la aplicación a los sustitutos"""
+    base = f"http://{host}:{port}"
+    return {
+        "HF_API_URL": f"{base}/hf/models/",
+        "GOOGLE_FACT_CHECK_URL": f"{base}/google/claims:search",
+        "GOOGLE_FACT_CHECK_API_KEY": "stub",
+        "CLAIMBUSTER_URL": f"{base}/claimbuster/score/text/",
+        "CLAIMBUSTER_API_KEY": "stub",
+        "WORDLIFT_URL": f"{base}/wordlift/fact-check",
+        "WORDLIFT_API_KEY": "stub",
+        "MBFC_URL": f"{base}/mbfc",
+        "MBFC_API_KEY": "stub",
+        "RAPIDAPI_URL": f"{base}/rapidapi/text",
+        "RAPIDAPI_KEY": "stub",
+        # El rate limiter por IP cortaría la prueba de carga
+        "REQUESTS_PER_MINUTE": "1000000",
+        "REQUESTS_PER_HOUR": "1000000",
+    }
+
+
+def _parse_overrides(values, attribute: str, overrides: Dict[str, ProviderBehavior], default: ProviderBehavior):
+    for value in values or []:
+        provider, _, number = value.partition("=")
+        if provider not in PROVIDERS:
+            raise SystemExit(f"Proveedor desconocido: {provider}. Opciones: {', '.join(PROVIDERS)}")
+        behavior = overrides.setdefault(provider, ProviderBehavior(**vars(default)))
+        setattr(behavior, attribute, float(number))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidores sustitutos de HF y APIs de fact-checking")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Latencia media de todos los proveedores")
+    parser.add_argument("--jitter-ms", type=float, default=20.0, help="Desvío estándar de la latencia")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probabilidad de 5xx/429")
+    parser.add_argument("--provider-latency-ms", action="append", metavar="PROVEEDOR=MS")
+    parser.add_argument("--provider-error-rate", action="append", metavar="PROVEEDOR=TASA")
+    parser.add_argument("--loading-seconds", type=float, default=0.0, help="HF responde 503 loading durante los primeros N segundos")
+    parser.add_argument("--loading-rate", type=float, default=0.0, help="Probabilidad de 503 loading después de la ventana inicial")
+    parser.add_argument("--estimated-time", type=float, default=20.0, help="estimated_time reportado en los 503")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--print-env", action="store_true", help="Imprimir variables de entorno para la app y salir")
+    args = parser.parse_args()
+
+    if args.print_env:
+        for key, value in app_environment(args.host, args.port).items():
+            print(f"export {key}={value}")
+        return
+
+    default = ProviderBehavior(args.latency_ms, args.jitter_ms, args.error_rate)
+    overrides: Dict[str, ProviderBehavior] = {}
+    _parse_overrides(args.provider_latency_ms, "latency_ms", overrides, default)
+    _parse_overrides(args.provider_error_rate, "error_rate", overrides, default)
+
+    config = StubConfig(
+        default=default,
+        overrides=overrides,
+        loading_seconds=args.loading_seconds,
+        loading_rate=args.loading_rate,
+        estimated_time=args.estimated_time,
+        seed=args.seed,
+    )
+    web.run_app(StubServers(config).build_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
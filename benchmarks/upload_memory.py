@@ -0,0 +1,123 @@
+"""
+Memoria pico de la lectura de uploads de /analyze.
+
+Compara, para archivos de distintos tamaños, la lectura anterior (file.read()
+completo, decode y sanitize_text) con read_text_upload (bloques, límite
+incremental y sanitización en streaming), midiendo el pico con tracemalloc.
+Con --check termina con código 1 si el pico de la lectura por bloques supera
+LIMIT_FACTOR veces el tamaño del archivo (o de MAX_FILE_SIZE_MB, para los
+que se rechazan).
+
+Uso:
+    python -m benchmarks.upload_memory
+    python -m benchmarks.upload_memory --check --max-file-size-mb 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Awaitable, Callable, Dict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from starlette.datastructures import UploadFile  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.utils.security import security_utils  # noqa: E402
+from app.utils.uploads import UploadTooLarge, max_upload_bytes, read_text_upload  # noqa: E402
+from benchmarks.corpus import build_text  # noqa: E402
+
+# Pico aceptable para un archivo dentro del límite, en múltiplos de su tamaño
+LIMIT_FACTOR = 4.0
+
+
+def _upload(path: str, known_size: bool) -> UploadFile:
+    """UploadFile como lo arma el parser multipart (que completa size), o sin size"""
+    size = os.path.getsize(path) if known_size else None
+    return UploadFile(file=open(path, "rb"), size=size, filename=os.path.basename(path))
+
+
+async def _legacy_read(file: UploadFile) -> str:
+    """Lectura previa de _process_file"""
+    data = await file.read()
+    if not security_utils.validate_file_size(len(data)):
+        raise UploadTooLarge(len(data))
+    return security_utils.sanitize_text(data.decode("utf-8", errors="ignore"))
+
+
+def _measure(reader: Callable[[UploadFile], Awaitable[str]], path: str, known_size: bool) -> Dict[str, object]:
+    upload = _upload(path, known_size)
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        text = asyncio.run(reader(upload))
+        outcome = f"ok ({len(text)} caracteres)"
+    except UploadTooLarge:
+        outcome = "rechazado"
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    upload.file.close()
+    return {"outcome": outcome, "peak_mb": round(peak / 1024 / 1024, 2), "seconds": round(elapsed, 3)}
+
+
+def _write_file(directory: str, size_bytes: int) -> str:
+    path = os.path.join(directory, f"upload_{size_bytes}.txt")
+    block = (build_text("es", 200) + "\n").encode("utf-8")
+    with open(path, "wb") as f:
+        written = 0
+        while written < size_bytes:
+            f.write(block)
+            written += len(block)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memoria pico de la lectura de uploads")
+    parser.add_argument("--max-file-size-mb", type=int, default=settings.MAX_FILE_SIZE_MB)
+    parser.add_argument("--check", action="store_true", help="Código de salida 1 si se supera el límite")
+    parser.add_argument("--skip-legacy", action="store_true", help="No medir la lectura anterior")
+    args = parser.parse_args()
+
+    settings.MAX_FILE_SIZE_MB = args.max_file_size_mb
+    limit = max_upload_bytes()
+    chunk = settings.UPLOAD_CHUNK_SIZE_KB * 1024
+    # (tamaño, size conocido de antemano)
+    cases = {
+        "1mb": (1024 * 1024, True),
+        "limit": (limit - chunk, True),
+        "4x_limit": (4 * limit, True),
+        "4x_limit_unknown_size": (4 * limit, False),
+    }
+
+    results = {}
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (size, known_size) in cases.items():
+            path = _write_file(directory, size)
+            actual = os.path.getsize(path)
+            case = {"size_mb": round(actual / 1024 / 1024, 2)}
+            case["streaming"] = _measure(read_text_upload, path, known_size)
+            if not args.skip_legacy:
+                case["legacy"] = _measure(_legacy_read, path, known_size)
+            results[name] = case
+            print(f"{name}: {json.dumps(case, ensure_ascii=False)}", file=sys.stderr)
+
+            peak = case["streaming"]["peak_mb"] * 1024 * 1024
+            bound = LIMIT_FACTOR * actual if actual <= limit else LIMIT_FACTOR * limit
+            if peak > bound:
+                failures.append(f"{name}: pico {case['streaming']['peak_mb']} MB > {bound / 1024 / 1024:.2f} MB")
+
+    print(json.dumps({"max_file_size_mb": args.max_file_size_mb, "results": results}, indent=2, ensure_ascii=False))
+    if failures:
+        print("\n".join(failures), file=sys.stderr)
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
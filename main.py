@@ -11,6 +11,16 @@ import time
 # Importar routers
 from app.routers import analysis, metrics, health, auth, fact_check_apis, models
 from app.services.ai_analyzer import ai_analyzer
+from app.services.domain_reputation import domain_reputation
+from app.services.bulk_ingestion import bulk_ingestion
+from app.services.fact_check_enrichment import fact_check_enrichment
+from app.services.health_monitor import health_monitor
+from app.services.model_performance import model_performance
+from app.services.provider_quota import provider_quotas
+from app.services.provider_transport import provider_transports
+from app.utils.responses import FastJSONResponse
+from app.utils.uploads import bulk_max_upload_bytes, max_upload_bytes
+from app.utils.worker_pool import worker_pool
 from app.config import settings
 
 # Configurar logging
@@ -48,7 +58,9 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    # orjson para el resto de las respuestas JSON
+    default_response_class=FastJSONResponse
 )
 
 # Configurar CORS
@@ -68,9 +80,47 @@ async def startup_event():
         logger.info("🚀 Iniciando Fake News Detector API v2.0.0")
         await ai_analyzer.initialize()
         logger.info("✅ IA inicializada correctamente")
+        await health_monitor.start()
+        logger.info("✅ Health checks en background iniciados")
+        await model_performance.start()
+        await provider_quotas.start()
+        logger.info(f"✅ Reputación de dominios en memoria: {await domain_reputation.warm()}")
+        worker_pool.start()
+        logger.info(f"✅ Pool de workers iniciado ({worker_pool.cpu.mode}, {worker_pool.cpu.workers} workers)")
     except Exception as e:
         logger.error(f"❌ Error en startup: {e}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Liberación de recursos al apagar la aplicación"""
+    await health_monitor.stop()
+    await model_performance.stop()
+    await bulk_ingestion.stop()
+    await ai_analyzer.cleanup()
+    await fact_check_enrichment.stop()
+    await provider_transports.close()
+    await provider_quotas.stop()
+    worker_pool.shutdown()
+
+# Uploads: se rechazan por Content-Length antes de que se lea el body
+_MULTIPART_OVERHEAD = 64 * 1024  # Encabezados de las partes y campos del formulario
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    if request.method == "POST" and request.headers.get("content-type", "").startswith("multipart/form-data"):
+        length = request.headers.get("content-length", "")
+        bulk = request.url.path.rstrip("/") == "/analyze/bulk"
+        limit = bulk_max_upload_bytes() if bulk else max_upload_bytes()
+        if length.isdigit() and int(length) > limit + _MULTIPART_OVERHEAD:
+            return JSONResponse(
+                status_code=413,
+                content={
+                    "detail": f"Archivo muy grande. Máximo {settings.BULK_MAX_UPLOAD_MB if bulk else settings.MAX_FILE_SIZE_MB} MB.",
+                    "path": str(request.url.path)
+                }
+            )
+    return await call_next(request)
+
 # Middleware de logging
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -0,0 +1,46 @@
+"""
+Fixtures compartidas: base SQLite en memoria con el esquema de la aplicación.
+
+Los tests async usan el plugin de pytest de anyio (@pytest.mark.anyio).
+"""
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  (registra las tablas en Base.metadata)
+from app.database import Base
+from app.models.news import NewsAnalysis
+from app.services.content_store import content_store
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def session_factory():
+    """sessionmaker sobre una base en memoria nueva por test"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def add_analysis(db: AsyncSession, content: str, **fields) -> NewsAnalysis:
+    """Guarda un análisis con su contenido, como /analyze (sin commit)"""
+    values = {
+        "source_type": "text",
+        "score": 0.5,
+        "label": "UNCERTAIN",
+        "confidence": 0.5,
+        "model_version": "test",
+        "content_length": len(content),
+        **fields,
+    }
+    analysis = NewsAnalysis(content_hash=await content_store.store(db, content), **values)
+    db.add(analysis)
+    await db.flush()
+    return analysis
@@ -0,0 +1,26 @@
+"""
+División en oraciones de claim_selector.
+"""
+from app.utils.claim_selector import claim_selector
+
+
+def test_splits_after_sentence_ending_no():
+    text = (
+        "Creo que no. Según el INDEC, la pobreza llegó a 40,1 por ciento en 2023. "
+        "El gobierno no lo desmintió."
+    )
+
+    assert claim_selector.split_sentences(text) == [
+        "Creo que no.",
+        "Según el INDEC, la pobreza llegó a 40,1 por ciento en 2023.",
+        "El gobierno no lo desmintió.",
+    ]
+
+
+def test_keeps_abbreviations_inside_sentence():
+    text = "El Dr. Pérez firmó la resolución No. 5 de EE.UU. ayer. Nadie la objetó."
+
+    assert claim_selector.split_sentences(text) == [
+        "El Dr. Pérez firmó la resolución No. 5 de EE.UU. ayer.",
+        "Nadie la objetó.",
+    ]
@@ -0,0 +1,67 @@
+"""
+Parsers de documentos (DOCX, RTF) y lectura de uploads con read_document_upload.
+"""
+import asyncio
+import zipfile
+
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.config import settings
+from app.utils.document_parsers import iter_docx_paragraphs, iter_rtf_paragraphs
+from app.utils.uploads import read_document_upload
+
+_PARAGRAPHS = ["Primer párrafo del informe.", "Según el INDEC, la pobreza llegó a 40,1%."]
+
+
+def _write_docx(path, paragraphs):
+    body = "".join(f"<w:p><w:r><w:t>{paragraph}</w:t></w:r></w:p>" for paragraph in paragraphs)
+    document = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", document)
+
+
+def _write_rtf(path, paragraphs):
+    # \uN con su carácter de reemplazo, como lo escriben los procesadores de texto
+    encoded = [
+        "".join(char if ord(char) < 128 else f"\\u{ord(char)}?" for char in paragraph)
+        for paragraph in paragraphs
+    ]
+    path.write_text("{\\rtf1\\ansi\\ansicpg1252 " + "\\par ".join(encoded) + "\\par}", encoding="ascii")
+
+
+def _read(path, extension):
+    upload = UploadFile(file=open(path, "rb"), filename=path.name)
+    try:
+        return asyncio.run(read_document_upload(upload, extension))
+    finally:
+        upload.file.close()
+
+
+@pytest.mark.parametrize("extension, write, iterate", [
+    (".docx", _write_docx, iter_docx_paragraphs),
+    (".rtf", _write_rtf, iter_rtf_paragraphs),
+])
+def test_round_trip(tmp_path, extension, write, iterate):
+    path = tmp_path / f"doc{extension}"
+    write(path, _PARAGRAPHS)
+
+    assert [paragraph for paragraph in iterate(str(path)) if paragraph] == _PARAGRAPHS
+    assert _read(path, extension) == " ".join(_PARAGRAPHS)
+
+
+def test_many_short_paragraphs_respect_content_limit(tmp_path):
+    # Párrafos cortos: los separadores entre párrafos pesan en el total
+    paragraphs = [f"Dato número {i}." for i in range(2 * settings.MAX_CONTENT_LENGTH // 15)]
+    path = tmp_path / "long.docx"
+    _write_docx(path, paragraphs)
+
+    text = _read(path, ".docx")
+
+    assert len(text) <= settings.MAX_CONTENT_LENGTH
+    assert len(text) > settings.MAX_CONTENT_LENGTH - 20
+    assert text.startswith("Dato número 0. Dato número 1.")
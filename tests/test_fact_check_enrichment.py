@@ -0,0 +1,66 @@
+"""
+Reutilización de resultados de fact-checking guardados (FACT_CHECK_RESULTS_TTL_HOURS).
+"""
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.config_apis import api_config
+from app.models.news import FactCheckResult
+from app.services.content_store import content_store
+from app.services.fact_check_enrichment import fact_check_enrichment
+from tests.conftest import add_analysis
+
+pytestmark = pytest.mark.anyio
+
+TEXT = "El ministerio informó que la inflación de octubre fue del 2,7% según el índice oficial."
+TTL_HOURS = 72
+
+
+@pytest.fixture(autouse=True)
+def ttl(monkeypatch):
+    monkeypatch.setattr(api_config, "RESULTS_TTL_HOURS", TTL_HOURS)
+
+
+def _hours_ago(hours: float) -> datetime:
+    # Mismo formato que CURRENT_TIMESTAMP en SQLite: UTC sin zona
+    return (datetime.now(timezone.utc) - timedelta(hours=hours)).replace(tzinfo=None)
+
+
+def _result(analysis_id: int, created_at: datetime, reused_from=None) -> FactCheckResult:
+    return FactCheckResult(
+        analysis_id=analysis_id,
+        provider="claimbuster",
+        success=True,
+        result=json.dumps({"provider": "claimbuster", "success": True, "score": 0.8}),
+        latency_ms=120,
+        late=False,
+        reused_from=reused_from,
+        created_at=created_at,
+    )
+
+
+async def test_reuses_fresh_original_result(session_factory):
+    async with session_factory() as db:
+        origin = await add_analysis(db, TEXT)
+        db.add(_result(origin.id, _hours_ago(1)))
+        await db.commit()
+
+        stored = await fact_check_enrichment.stored_results(db, content_store.hash_content(TEXT))
+
+    assert stored["claimbuster"].analysis_id == origin.id
+
+
+async def test_copy_of_expired_result_is_not_reused(session_factory):
+    async with session_factory() as db:
+        origin = await add_analysis(db, TEXT)
+        db.add(_result(origin.id, _hours_ago(TTL_HOURS + 1)))
+        # Un análisis reciente reutilizó el resultado cuando todavía estaba vigente
+        copy = await add_analysis(db, TEXT)
+        db.add(_result(copy.id, _hours_ago(1), reused_from=origin.id))
+        await db.commit()
+
+        stored = await fact_check_enrichment.stored_results(db, content_store.hash_content(TEXT))
+
+    assert stored == {}
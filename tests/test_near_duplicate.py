@@ -0,0 +1,40 @@
+"""Firmas MinHash e índice LSH de casi duplicados"""
+import pytest
+
+from app.services.near_duplicate_index import NearDuplicateIndex
+from app.utils.near_duplicate import min_hasher
+from tests.conftest import add_analysis
+
+pytestmark = pytest.mark.anyio
+
+TEXT = "el ministerio de economía anunció hoy un plan de empleo para todo el país " * 3
+
+
+@pytest.mark.parametrize("text", ["!!!! ???? ....", "*** ### @@@ %%% ^^^ &&&", ""])
+def test_no_signature_without_words(text):
+    assert min_hasher.signature(text) is None
+
+
+def test_similarity_of_near_copies():
+    words = [f"palabra{i}" for i in range(200)]
+    original = min_hasher.signature(" ".join(words))
+    edited = min_hasher.signature(" ".join(words[:-1] + ["cambiada"]))
+    unrelated = min_hasher.signature("la selección ganó el partido con dos goles en el segundo tiempo")
+    assert min_hasher.similarity(original, edited) > 0.7
+    assert min_hasher.similarity(min_hasher.signature(TEXT), unrelated) < 0.2
+
+
+async def test_find_similar_sees_signatures_saved_by_another_instance(session_factory):
+    reader, writer = NearDuplicateIndex(), NearDuplicateIndex()
+    signature = min_hasher.signature(TEXT)
+
+    async with session_factory() as db:
+        assert await reader.find_similar(db, signature) is None
+
+    async with session_factory() as db:
+        analysis = await add_analysis(db, TEXT)
+        await writer.add(db, analysis.id, signature)
+        await db.commit()
+
+    async with session_factory() as db:
+        assert await reader.find_similar(db, signature) == (analysis.id, 1.0)
@@ -0,0 +1,84 @@
+"""
+Búsqueda full-text (GET /analyze/search) sobre SQLite en memoria (FTS5).
+"""
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert
+
+from app.models.news import AnalysisContent
+from app.routers.analysis import search_analyses
+from app.services.content_store import content_store
+from tests.conftest import add_analysis
+
+pytestmark = pytest.mark.anyio
+
+_FILLER = "el informe oficial del ministerio publicó datos sobre la economía del país"
+
+
+async def _search(db, q, limit=20, offset=0):
+    return await search_analyses(q=q, language=None, limit=limit, offset=offset, db=db)
+
+
+async def test_ranks_by_relevance(session_factory):
+    async with session_factory() as db:
+        weak = await add_analysis(db, f"{_FILLER}. Se habló una vez de la vacuna. {_FILLER}")
+        strong = await add_analysis(db, "La vacuna contiene microchips: la vacuna, la vacuna.")
+        medium = await add_analysis(db, f"La vacuna y otra vacuna. {_FILLER}")
+        await add_analysis(db, f"{_FILLER}, sin relación con el tema.")
+        await db.commit()
+
+        response = await _search(db, "vacuna")
+
+    assert [item.id for item in response.items] == [strong.id, medium.id, weak.id]
+    ranks = [item.rank for item in response.items]
+    assert ranks == sorted(ranks, reverse=True)
+
+
+async def test_pagination_is_disjoint_and_stable(session_factory):
+    async with session_factory() as db:
+        for i in range(7):
+            await add_analysis(db, f"Fraude en las elecciones, denuncia número {i}. " + "fraude " * (i % 3))
+        await db.commit()
+
+        full = await _search(db, "fraude elecciones", limit=10)
+        pages = [await _search(db, "fraude elecciones", limit=3, offset=offset) for offset in (0, 3, 6)]
+
+    assert len(full.items) == 7
+    paged_ids = [item.id for page in pages for item in page.items]
+    assert [len(page.items) for page in pages] == [3, 3, 1]
+    assert paged_ids == [item.id for item in full.items]
+    assert pages[1].offset == 3 and pages[1].limit == 3
+
+
+async def test_backfills_contents_stored_before_fts_table(session_factory):
+    text = "El agua con limón cura el cáncer, según una cadena viral."
+    async with session_factory() as db:
+        # Contenido guardado sin pasar por content_store (base anterior a la tabla FTS5)
+        content_hash = content_store.hash_content(text)
+        await db.execute(insert(AnalysisContent).values(
+            content_hash=content_hash,
+            compression=content_store.COMPRESSION,
+            data=content_store.compress(text),
+            original_length=len(text),
+        ))
+        await db.commit()
+
+        analysis = await add_analysis(db, text)
+        other = await add_analysis(db, "El limón no cura el cáncer.")
+        await db.commit()
+
+        response = await _search(db, "limón cáncer")
+
+    # Cada contenido aparece una sola vez: el backfill no duplica el que se guardó después
+    assert sorted(item.id for item in response.items) == sorted([analysis.id, other.id])
+
+
+async def test_unsupported_backend_maps_to_501():
+    db = SimpleNamespace(bind=SimpleNamespace(dialect=SimpleNamespace(name="mysql")))
+
+    with pytest.raises(HTTPException) as error:
+        await _search(db, "vacuna")
+
+    assert error.value.status_code == 501
@@ -0,0 +1,108 @@
+"""
+Lectura de uploads por bloques: memoria pico acotada y rechazo temprano.
+
+Mide con tracemalloc el pico de read_text_upload para un archivo al borde del
+límite y para uno mucho más grande, con el tamaño conocido de antemano (como lo
+completa el parser multipart) y sin él.
+"""
+import asyncio
+import tracemalloc
+
+import pytest
+from fastapi import HTTPException
+from starlette.datastructures import UploadFile
+
+from app.config import settings
+from app.utils.uploads import UploadTooLarge, max_upload_bytes, read_text_upload
+
+MAX_FILE_SIZE_MB = 2
+# Pico aceptable en múltiplos del tamaño leído (mismo criterio que benchmarks/upload_memory.py)
+LIMIT_FACTOR = 4.0
+
+_LINE = "El ministerio informó que la inflación de octubre fue del 2,7% según el índice oficial.\n"
+
+
+@pytest.fixture(autouse=True)
+def small_limit(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE_MB", MAX_FILE_SIZE_MB)
+
+
+def _write(path, size: int) -> int:
+    block = (_LINE * 200).encode("utf-8")
+    written = 0
+    with open(path, "wb") as f:
+        while written < size:
+            f.write(block)
+            written += len(block)
+    return written
+
+
+def _read_traced(path, size, known_size: bool):
+    """Lee el archivo con read_text_upload; devuelve (texto o excepción, pico, bytes leídos)"""
+    upload = UploadFile(file=open(path, "rb"), size=size if known_size else None, filename=path.name)
+    tracemalloc.start()
+    try:
+        try:
+            outcome = asyncio.run(read_text_upload(upload))
+        except UploadTooLarge as e:
+            outcome = e
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    consumed = upload.file.tell()
+    upload.file.close()
+    return outcome, peak, consumed
+
+
+@pytest.mark.parametrize("known_size", [True, False], ids=["known_size", "unknown_size"])
+def test_peak_memory_bounded_at_limit(tmp_path, known_size):
+    limit = max_upload_bytes()
+    chunk = settings.UPLOAD_CHUNK_SIZE_KB * 1024
+    path = tmp_path / "limit.txt"
+    size = _write(path, limit - 2 * chunk)
+    assert size <= limit
+
+    text, peak, _ = _read_traced(path, size, known_size)
+
+    assert isinstance(text, str) and text.startswith("El ministerio")
+    assert peak <= LIMIT_FACTOR * size
+
+
+def test_oversized_rejected_before_reading_when_size_known(tmp_path):
+    limit = max_upload_bytes()
+    path = tmp_path / "big.txt"
+    size = _write(path, 8 * limit)
+
+    outcome, peak, consumed = _read_traced(path, size, known_size=True)
+
+    assert isinstance(outcome, UploadTooLarge)
+    assert consumed == 0
+    assert peak < settings.UPLOAD_CHUNK_SIZE_KB * 1024
+
+
+def test_oversized_rejected_at_limit_when_size_unknown(tmp_path):
+    limit = max_upload_bytes()
+    chunk = settings.UPLOAD_CHUNK_SIZE_KB * 1024
+    path = tmp_path / "big.txt"
+    size = _write(path, 8 * limit)
+
+    outcome, peak, consumed = _read_traced(path, size, known_size=False)
+
+    assert isinstance(outcome, UploadTooLarge)
+    # Corta en el primer bloque que supera el límite, sin leer el resto
+    assert consumed <= limit + chunk
+    assert peak <= LIMIT_FACTOR * limit
+
+
+def test_oversized_file_maps_to_413(tmp_path):
+    from app.routers.analysis import _process_file
+
+    path = tmp_path / "big.txt"
+    size = _write(path, 2 * max_upload_bytes())
+    upload = UploadFile(file=open(path, "rb"), size=None, filename="big.txt")
+    try:
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(_process_file(upload))
+    finally:
+        upload.file.close()
+    assert error.value.status_code == 413
@@ -0,0 +1,40 @@
+"""
+Pool de procesos de worker_pool: tareas colgadas y procesos que mueren.
+"""
+import os
+import time
+
+import pytest
+
+from app.config import settings
+from app.utils.worker_pool import WorkerTaskFailed, WorkerTaskTimeout, _BoundedExecutor
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def pool(monkeypatch):
+    # Un solo lugar: la siguiente tarea solo entra si la anterior lo liberó
+    monkeypatch.setattr(settings, "WORKER_POOL_QUEUE_TIMEOUT", 10)
+    pool = _BoundedExecutor("test", "process", workers=1, max_queue=0)
+    yield pool
+    pool.shutdown()
+
+
+async def test_stuck_task_recycles_pool_and_frees_its_slot(pool):
+    with pytest.raises(WorkerTaskTimeout):
+        await pool.run("stuck", time.sleep, 60, timeout=1)
+
+    started = time.monotonic()
+    assert await pool.run("next", pow, 2, 10, timeout=10) == 1024
+    assert time.monotonic() - started < 10
+    assert pool.stats()["recycled"] == 1
+    assert pool.stats()["in_flight"] == 0
+
+
+async def test_dead_worker_maps_to_task_failed(pool):
+    with pytest.raises(WorkerTaskFailed):
+        await pool.run("crash", os._exit, 1, timeout=10)
+
+    # El pool roto se reemplaza en la siguiente tarea
+    assert await pool.run("next", pow, 2, 10, timeout=10) == 1024